@@ -1,64 +1,57 @@
 import os
 import sys
-import logging
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 # Add the project root directory to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-# Import all scrapers
-from scrapers.citizen import CitizenScraper
-from scrapers.daily_nations import DailyNationsScraper
-from scrapers.standardmedia import StandardMediaScraper
-from scrapers.star import StarScraper
-from scrapers.tuko_new import TukoScraper
+# Scraper modules (and Selenium, BeautifulSoup, etc.) are imported only for the sources being run
+from scrapers.registry import available_sources, get_scraper_class
+from config.settings import BUDGET_SETTINGS, ENTITY_SETTINGS, PIPELINE_SETTINGS, SENTIMENT_SETTINGS
+from utils.logger import setup_logger, stop_listeners
+from utils.profiler import profile_call
 
 
-def setup_main_logger():
-    """Set up the main logger."""
-    # Ensure logs directory exists
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger('main')
-    logger.setLevel(logging.INFO)
-    
-    # Remove existing handlers if any
-    if logger.handlers:
-        logger.handlers = []
-    
-    # Create log filename with timestamp
+def main_log_file():
+    """Path of a new main log file, named after the current time."""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    log_file = f"logs/main_{timestamp}.log"
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Create formatter and add to handlers
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    return f"logs/main_{timestamp}.log"
+
+
+def setup_main_logger(log_file):
+    """Set up the main logger writing to this run's log file."""
+    return setup_logger('main', log_file)
+
 
+def run_scraper(scraper_class, logger, profile_dir=None, max_articles=None):
+    """
+    Run one scraper, optionally under the profiler.
 
-def run_scraper(scraper_class, logger):
+    Args:
+        scraper_class (type): Scraper to run
+        logger (logging.Logger): Logger for progress messages
+        profile_dir (str): Write profile files for this run here (optional)
+        max_articles (int): Article budget replacing the scraper's default (optional)
+
+    Returns:
+        bool: True if the scraper succeeded
+    """
     scraper_name = scraper_class.__name__
     try:
         logger.info(f"Starting {scraper_name}")
         scraper = scraper_class()
-        success = scraper.run()
+        if max_articles:
+            scraper.max_articles = max_articles
+        if profile_dir:
+            # One set of files per source; in parallel mode each worker runs its own source
+            name = f"{scraper.source_name}_{os.getpid()}"
+            success, report = profile_call(scraper.run, name, profile_dir)
+            logger.info(f"{report}\nProfile files written to {os.path.join(profile_dir, name)}.*")
+        else:
+            success = scraper.run()
         status = "successful" if success else "failed"
         logger.info(f"{scraper_name} completed: {status}")
         return success
@@ -67,48 +60,101 @@ def run_scraper(scraper_class, logger):
         return False
 
 
+def run_source_worker(name, log_file, profile_dir=None, max_articles=None):
+    """Run one source's scraper in a worker process for parallel mode, logging to the run's main log file."""
+    logger = setup_main_logger(log_file)
+    try:
+        return run_scraper(get_scraper_class(name), logger, profile_dir, max_articles)
+    finally:
+        stop_listeners()
+
+
+def run_enrichment(source, logger):
+    """Run the post-scrape enrichment stages on articles saved for a source."""
+    if SENTIMENT_SETTINGS.get('enabled'):
+        from enrichment.sentiment import score_pending_articles
+        score_pending_articles([source], logger=logger)
+    if ENTITY_SETTINGS.get('enabled'):
+        from enrichment.entities import tag_pending_articles
+        tag_pending_articles([source], logger=logger)
+
+
 def main():
     """Main function to run all scrapers."""
-    logger = setup_main_logger()
+    log_file = main_log_file()
+    logger = setup_main_logger(log_file)
     logger.info("Starting Kenya News scraping process")
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Run Kenya News scrapers')
     parser.add_argument('--sources', nargs='+', help='Specific sources to scrape')
+    parser.add_argument('--parallel', type=int, default=1, metavar='N',
+                        help='Run up to N scrapers at once in separate processes')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile each scraper and write per-source profile files')
+    parser.add_argument('--profile-dir', default='profiles', help='Directory for profile files')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Fetch, parse and save articles in concurrent stages (see PIPELINE_SETTINGS)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and crawl each category on its own adaptive interval')
     args = parser.parse_args()
     
-    # Map of available scrapers
-    scrapers = {
-        'citizen': CitizenScraper,
-        'daily_nations': DailyNationsScraper,
-        'standardmedia': StandardMediaScraper,
-        'star': StarScraper,
-        'tuko': TukoScraper
-    }
+    profile_dir = None
+    if args.profile:
+        profile_dir = os.path.join(args.profile_dir, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        logger.info(f"Profiling enabled, writing to {profile_dir}")
     
     # Determine which scrapers to run
     scrapers_to_run = {}
-    if args.sources:
-        # Run only specified sources
-        for source in args.sources:
-            if source in scrapers:
-                scrapers_to_run[source] = scrapers[source]
-            else:
-                logger.warning(f"Unknown source: {source}")
-    else:
-        # Run all scrapers
-        scrapers_to_run = scrapers
+    for source in args.sources or available_sources():
+        try:
+            scrapers_to_run[source] = get_scraper_class(source)
+        except KeyError:
+            logger.warning(f"Unknown source: {source}")
     
     if not scrapers_to_run:
         logger.error("No valid scrapers to run")
         return False
     
+    if args.pipeline:
+        for source in scrapers_to_run:
+            PIPELINE_SETTINGS['enabled'][source] = True
+    
+    if args.daemon:
+        from scrapers.scheduler import CrawlScheduler
+        scheduler = CrawlScheduler(scrapers_to_run, logger,
+                                   on_articles_saved=lambda source: run_enrichment(source, logger))
+        return scheduler.run()
+    
+    # Split a shared article budget across sources by their recent yield
+    budgets = {}
+    if BUDGET_SETTINGS.get('total_articles'):
+        from scrapers.budget import source_budgets
+        budgets = source_budgets(list(scrapers_to_run), BUDGET_SETTINGS['total_articles'])
+        logger.info("Article budgets: " + ', '.join(f"{name} {budget}" for name, budget in budgets.items()))
+    
     # Run each scraper
     results = {}
-    for name, scraper_class in scrapers_to_run.items():
-        logger.info(f"Running {name} scraper")
-        success = run_scraper(scraper_class, logger)
-        results[name] = success
+    if args.parallel > 1:
+        with ProcessPoolExecutor(max_workers=args.parallel) as executor:
+            futures = {}
+            for name in scrapers_to_run:
+                logger.info(f"Running {name} scraper")
+                futures[executor.submit(run_source_worker, name, log_file, profile_dir, budgets.get(name))] = name
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Worker for {name} failed: {e}")
+                    results[name] = False
+                run_enrichment(name, logger)
+    else:
+        for name, scraper_class in scrapers_to_run.items():
+            logger.info(f"Running {name} scraper")
+            success = run_scraper(scraper_class, logger, profile_dir, budgets.get(name))
+            results[name] = success
+            run_enrichment(name, logger)
     
     # Log summary
     logger.info("Scraping process completed")
@@ -0,0 +1,174 @@
+"""
+Article queries behind the read API of the Kenya news scraping project.
+
+Every listing is paginated by keyset: the response carries an opaque cursor
+holding the sort key of its last row, and the next page continues with
+``WHERE (key) < (cursor)`` on an index instead of skipping rows with OFFSET.
+Callers choose the columns they need; ``content`` is only read (and
+decompressed) when asked for. Authors and categories are read as ids and
+named from the process's dimension cache, without a join.
+"""
+import os
+import sys
+import json
+import base64
+from datetime import date, datetime
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.settings import NEWS_SOURCES
+from database.operations import DIMENSIONS, decode_content, dimension_select, get_dimension_id, resolve_dimensions
+
+
+FIELDS = ('id', 'url', 'title', 'publication_date', 'author', 'category',
+          'content', 'created_at', 'last_updated', 'sentiment_score')
+DEFAULT_FIELDS = ('id', 'url', 'title', 'publication_date', 'author', 'category')
+
+
+class QueryError(ValueError):
+    """Invalid request parameters; reported to the client as HTTP 400."""
+
+
+def parse_fields(value):
+    """
+    Validate a comma-separated field list.
+
+    Returns:
+        list: Requested fields in request order, or the default fields
+    """
+    if not value:
+        return list(DEFAULT_FIELDS)
+    fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown:
+        raise QueryError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def check_source(source):
+    if source not in NEWS_SOURCES:
+        raise QueryError(f"Unknown source: {source}")
+    return source
+
+
+def parse_date_param(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise QueryError(f"{name} must be a date like 2025-04-05")
+
+
+def encode_cursor(values):
+    """Opaque cursor for a row's sort key."""
+    text = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """Sort key from a cursor made by ``encode_cursor``; every value must be a number or string."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeDecodeError):
+        raise QueryError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != length:
+        raise QueryError("Invalid cursor")
+    if not all(isinstance(value, (int, float, str)) and not isinstance(value, bool) for value in values):
+        raise QueryError("Invalid cursor")
+    return values
+
+
+def _serialize(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+def _select(connection, source, fields, where, params, order_by, limit, key_columns):
+    """Run one keyset page query and shape the response."""
+    columns = list(dict.fromkeys(list(key_columns) + fields))
+    select = dimension_select([column for column in columns if column != 'content'])
+    if 'content' in fields:
+        select += ['content', 'content_compressed']
+
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        f"SELECT {', '.join(select)} FROM {source}_articles WHERE {where} ORDER BY {order_by} LIMIT %s",
+        (*params, limit + 1)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    articles = []
+    for row in rows:
+        if 'content' in fields:
+            row['content'] = decode_content(connection, source, row['content'], row.pop('content_compressed'))
+        resolve_dimensions(connection, row)
+        articles.append({field: _serialize(row[field]) for field in fields})
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor([rows[-1][column] for column in key_columns])
+    return {'source': source, 'articles': articles, 'next_cursor': next_cursor}
+
+
+def latest(connection, source, fields, limit, cursor=None):
+    """Newest stored articles of a source, newest first."""
+    where, params = "1 = 1", ()
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        where, params = "id < %s", (last_id,)
+    return _select(connection, source, fields, where, params, "id DESC", limit, ('id',))
+
+
+def by_category(connection, source, category, fields, limit, cursor=None):
+    """Newest stored articles of one category, newest first (uses idx_category_id)."""
+    category_id = get_dimension_id(connection, DIMENSIONS['category'][1], category, create=False)
+    if category_id is None:
+        return {'source': source, 'articles': [], 'next_cursor': None}
+    where, params = "category_id = %s", (category_id,)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        where, params = "category_id = %s AND id < %s", (category_id, last_id)
+    return _select(connection, source, fields, where, params, "id DESC", limit, ('id',))
+
+
+def date_range(connection, source, start, end, fields, limit, cursor=None):
+    """
+    Articles published from ``start`` up to but excluding ``end``, oldest first.
+
+    Paginated on ``(publication_date, id)``, which idx_publication_date covers.
+    """
+    where = "publication_date >= %s AND publication_date < %s"
+    params = (start, end)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, 2)
+        try:
+            last_date = datetime.fromisoformat(last_date)
+        except (TypeError, ValueError):
+            raise QueryError("Invalid cursor")
+        where += " AND (publication_date > %s OR (publication_date = %s AND id > %s))"
+        params += (last_date, last_date, last_id)
+    return _select(connection, source, fields, where, params, "publication_date, id", limit,
+                   ('publication_date', 'id'))
+
+
+def source_versions(connection):
+    """
+    Write counters per source, which change whenever articles are added, updated or revised.
+
+    Returns:
+        dict: ``(articles_added, articles_updated, revision)`` per source
+    """
+    cursor = connection.cursor()
+    cursor.execute("SELECT source, articles_added, articles_updated, revision FROM scraper_metadata")
+    versions = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+    cursor.close()
+    return versions
@@ -0,0 +1,340 @@
+"""
+Read-only HTTP API over the stored articles of the Kenya news scraping project.
+
+Endpoints (JSON unless noted):
+    GET /articles/<source>/latest
+    GET /articles/<source>/category/<category>
+    GET /articles/<source>/range?from=2025-04-01&to=2025-04-08
+    GET /stats          request counts, p50/p99 latency and cache hit rate
+    GET /metrics        the same in the Prometheus text format
+
+Article endpoints take ``limit``, ``fields`` (comma-separated, e.g.
+``fields=url,title``; ``content`` only when listed) and ``cursor`` (the
+``next_cursor`` of the previous page). Responses are cached in memory; a
+source's cached pages are dropped as soon as its write counters in
+``scraper_metadata`` move (batch jobs such as sentiment scoring bump its
+``revision``), so changes show up without waiting for the TTL. A response
+whose query started before an invalidation is not cached.
+
+The server runs on asyncio; MySQL queries run on a small thread pool with one
+connection per thread.
+
+Usage:
+    python -m api.server [--host 127.0.0.1] [--port 8081]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from api import queries
+from config.database import get_connection
+from config.settings import API_SETTINGS
+from utils.logger import setup_logger
+from utils.metrics import REGISTRY
+
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'api_request_seconds', 'Time to answer API requests',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+REQUESTS = REGISTRY.counter('api_requests_total', 'API requests by endpoint and status')
+CACHE_RESULTS = REGISTRY.counter('api_cache_total', 'Response cache lookups by result')
+LATENCY = REGISTRY.gauge('api_latency_seconds', 'Recent request latency quantiles per endpoint')
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ResponseCache:
+    """LRU cache of response bodies with a time-to-live, grouped by source for invalidation."""
+
+    def __init__(self, size, ttl, clock=time.monotonic):
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        # Invalidations per source, so a response computed before one is not cached after it
+        self.generations = {}
+
+    def generation(self, source):
+        """Current generation of a source; pass it to ``put`` for a response computed from here on."""
+        return self.generations.get(source, 0)
+
+    def get(self, key):
+        """Cached body for a key, or None if missing or expired."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires, source, body = entry
+        if expires <= self.clock():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return body
+
+    def put(self, key, source, body, generation=None):
+        """Cache a body, unless the source was invalidated since ``generation`` was taken."""
+        if generation is not None and generation != self.generation(source):
+            return
+        self.entries[key] = (self.clock() + self.ttl, source, body)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, source):
+        """
+        Drop every cached response of a source.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        self.generations[source] = self.generation(source) + 1
+        keys = [key for key, entry in self.entries.items() if entry[1] == source]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+
+
+class LatencyWindow:
+    """Latencies of the most recent requests per endpoint, for exact quantiles."""
+
+    def __init__(self, size):
+        self.size = size
+        self.samples = {}
+
+    def add(self, endpoint, seconds):
+        self.samples.setdefault(endpoint, deque(maxlen=self.size)).append(seconds)
+
+    def quantile(self, endpoint, q):
+        """Latency below which a fraction ``q`` of the recent requests finished, or None."""
+        samples = sorted(self.samples.get(endpoint, ()))
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class ApiServer:
+    """Routes requests, runs queries on the thread pool and caches responses."""
+
+    def __init__(self, logger, settings=API_SETTINGS):
+        self.logger = logger
+        self.settings = settings
+        self.executor = ThreadPoolExecutor(max_workers=settings['db_threads'], thread_name_prefix='api-db')
+        self.local = threading.local()
+        self.cache = ResponseCache(settings['cache_size'], settings['cache_ttl'])
+        self.latency = LatencyWindow(settings['latency_window'])
+        self.versions = None
+
+    def connection(self):
+        """This thread's database connection, reconnecting if it was lost."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None or not connection.is_connected():
+            connection = self.local.connection = get_connection()
+            if connection is None:
+                raise ConnectionError("Failed to connect to database")
+            # Every query should see rows committed since the previous one
+            connection.autocommit = True
+        return connection
+
+    async def run_query(self, func, *args):
+        """Run a query function with a pooled connection as its first argument."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(self.connection(), *args))
+
+    async def watch_writes(self):
+        """Invalidate a source's cached responses whenever its articles change."""
+        while True:
+            try:
+                versions = await self.run_query(queries.source_versions)
+                if self.versions is not None:
+                    for source, version in versions.items():
+                        if self.versions.get(source) != version:
+                            dropped = self.cache.invalidate(source)
+                            self.logger.debug(f"New writes for {source}, dropped {dropped} cached responses")
+                self.versions = versions
+            except Exception as e:
+                self.logger.error(f"Error checking for new articles: {e}")
+            await asyncio.sleep(self.settings['invalidation_interval'])
+
+    def page_params(self, params):
+        """Limit, fields and cursor from the query string."""
+        try:
+            limit = int(params.get('limit', self.settings['default_limit']))
+        except ValueError:
+            raise queries.QueryError("limit must be a number")
+        if not 1 <= limit <= self.settings['max_limit']:
+            raise queries.QueryError(f"limit must be between 1 and {self.settings['max_limit']}")
+        return queries.parse_fields(params.get('fields')), limit, params.get('cursor')
+
+    async def articles(self, parts, params):
+        """
+        Answer an ``/articles/...`` request.
+
+        Returns:
+            tuple: Endpoint name, source and JSON-ready response
+        """
+        source = queries.check_source(parts[1])
+        fields, limit, cursor = self.page_params(params)
+
+        if parts[2:] == ['latest']:
+            return 'latest', source, await self.run_query(queries.latest, source, fields, limit, cursor)
+        if len(parts) == 4 and parts[2] == 'category':
+            return 'category', source, await self.run_query(
+                queries.by_category, source, parts[3], fields, limit, cursor)
+        if parts[2:] == ['range']:
+            start = queries.parse_date_param(params.get('from'), 'from')
+            end = queries.parse_date_param(params.get('to'), 'to')
+            return 'range', source, await self.run_query(
+                queries.date_range, source, start, end, fields, limit, cursor)
+        raise LookupError(f"No such endpoint: /{'/'.join(parts)}")
+
+    def stats(self):
+        """Request counts, latency quantiles and cache hit rate per endpoint."""
+        endpoints = {}
+        for endpoint in sorted(self.latency.samples):
+            p50 = self.latency.quantile(endpoint, 0.5)
+            p99 = self.latency.quantile(endpoint, 0.99)
+            LATENCY.set(p50, endpoint=endpoint, quantile='0.5')
+            LATENCY.set(p99, endpoint=endpoint, quantile='0.99')
+            endpoints[endpoint] = {
+                'requests': REQUEST_SECONDS.summary(endpoint=endpoint)[0],
+                'p50_ms': round(p50 * 1000, 3),
+                'p99_ms': round(p99 * 1000, 3),
+            }
+        hits, misses = CACHE_RESULTS.value(result='hit'), CACHE_RESULTS.value(result='miss')
+        return {
+            'endpoints': endpoints,
+            'cache': {'entries': len(self.cache.entries), 'hits': hits, 'misses': misses,
+                      'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None},
+        }
+
+    async def respond(self, method, target):
+        """
+        Build the response to one request.
+
+        Returns:
+            tuple: Endpoint name, status, content type and body bytes
+        """
+        if method != 'GET':
+            return 'other', 405, 'application/json', b'{"error": "Only GET is supported"}'
+
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts == ['metrics']:
+            self.stats()
+            return 'metrics', 200, 'text/plain; version=0.0.4; charset=utf-8', REGISTRY.render().encode('utf-8')
+        if parts == ['stats']:
+            return 'stats', 200, 'application/json', json.dumps(self.stats()).encode('utf-8')
+        if len(parts) < 3 or parts[0] != 'articles':
+            return 'other', 404, 'application/json', b'{"error": "Not found"}'
+
+        # Same parameters in any order share a cache entry
+        key = url.path + '?' + '&'.join(f"{k}={params[k]}" for k in sorted(params))
+        body = self.cache.get(key)
+        if body is not None:
+            CACHE_RESULTS.inc(result='hit')
+            endpoint = parts[2] if parts[2] in ('latest', 'category', 'range') else 'other'
+            return endpoint, 200, 'application/json', body
+
+        CACHE_RESULTS.inc(result='miss')
+        generation = self.cache.generation(parts[1])
+        try:
+            endpoint, source, result = await self.articles(parts, params)
+        except queries.QueryError as e:
+            return 'other', 400, 'application/json', json.dumps({'error': str(e)}).encode('utf-8')
+        except LookupError as e:
+            return 'other', 404, 'application/json', json.dumps({'error': str(e)}).encode('utf-8')
+        except Exception as e:
+            self.logger.error(f"Error answering {target}: {e}")
+            return 'other', 503, 'application/json', b'{"error": "Database unavailable"}'
+
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self.cache.put(key, source, body, generation)
+        return endpoint, 200, 'application/json', body
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), timeout=30)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip().lower()
+
+                endpoint, status, content_type, body = await self.respond(method, target)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection') != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+
+                elapsed = time.perf_counter() - start
+                REQUEST_SECONDS.observe(elapsed, endpoint=endpoint)
+                REQUESTS.inc(endpoint=endpoint, status=str(status))
+                self.latency.add(endpoint, elapsed)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        watcher = asyncio.create_task(self.watch_writes())
+        self.logger.info(f"API listening on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stored articles over HTTP')
+    parser.add_argument('--host', default=API_SETTINGS['host'], help='Address to listen on')
+    parser.add_argument('--port', type=int, default=API_SETTINGS['port'], help='Port to listen on')
+    args = parser.parse_args()
+
+    logger = setup_logger('api', f"logs/api_{time.strftime('%Y%m%d')}.log")
+    try:
+        asyncio.run(ApiServer(logger).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("API stopped")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
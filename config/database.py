@@ -16,16 +16,19 @@ sys.path.append(parent_dir)
 # Import settings from the config module
 from config.settings import DB_SETTINGS
 
-def get_connection():
+def get_connection(**options):
     """
     Create and return a connection to the MySQL database using the settings from settings.py
     
+    Args:
+        **options: Extra connector options, e.g. allow_local_infile=True
+    
     Returns:
         mysql.connector.connection.MySQLConnection: Database connection object if successful
         None: If connection fails
     """
     try:
-        connection = mysql.connector.connect(**DB_SETTINGS)
+        connection = mysql.connector.connect(**DB_SETTINGS, **options)
         if connection.is_connected():
             return connection
     except Error as e:
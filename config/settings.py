@@ -5,3 +5,278 @@ DB_SETTINGS = {
     'database': 'Kenya_news',   
     'port': 3306
 }
+
+
+# News sources, each stored in its own `<source>_articles` table
+NEWS_SOURCES = [
+    'citizen',
+    'daily_nations',
+    'standardmedia',
+    'star',
+    'tuko'
+]
+
+
+# Paragraphs seen in more than `threshold` articles of a source are treated
+# as boilerplate (newsletter prompts, "Follow us on..." lines, teasers)
+BOILERPLATE_SETTINGS = {
+    'enabled': True,
+    'threshold': 5,
+    'width': 65536,
+    'depth': 4,
+    'state_dir': 'cache/boilerplate'
+}
+
+
+# Trending terms: saved articles are counted per source into `buckets` time
+# buckets of `bucket_minutes`, each a width x depth count-min sketch plus the
+# `candidates` most mentioned terms. Up to `pending_terms` distinct terms are
+# counted exactly before being flushed into the sketch. State is saved every
+# `save_every` articles
+TRENDING_SETTINGS = {
+    'enabled': True,
+    'bucket_minutes': 60,
+    'buckets': 48,
+    'width': 16384,
+    'depth': 4,
+    'candidates': 500,
+    'pending_terms': 20000,
+    'save_every': 50,
+    'state_dir': 'cache/trending'
+}
+
+
+# Offline sentiment scoring of stored articles; workers=None uses every CPU
+SENTIMENT_SETTINGS = {
+    'enabled': True,
+    'workers': None,
+    'chunk_size': 1000
+}
+
+
+# Gazetteer entity tagging of stored articles; workers=None uses every CPU.
+# insert_batch is the number of article_entities rows per INSERT
+ENTITY_SETTINGS = {
+    'enabled': True,
+    'workers': None,
+    'chunk_size': 1000,
+    'insert_batch': 1000
+}
+
+
+# Store article bodies compressed in `content_compressed` instead of `content`.
+# codec is 'zstd' (needs the zstandard package) or 'zlib'
+STORAGE_SETTINGS = {
+    'compress_content': False,
+    'codec': 'zlib',
+    'level': 6,
+    'dictionary_size': 32768,
+    'training_samples': 2000
+}
+
+
+# Prometheus metrics: serve /metrics on http_port (None to disable) and/or
+# write scraper_<source>.prom files for node_exporter's textfile collector
+METRICS_SETTINGS = {
+    'http_port': None,
+    'textfile_dir': 'metrics'
+}
+
+
+# Scraper logging. json writes logs/<source>_<date>.jsonl as JSON lines;
+# debug_rate caps debug records per call site as (records, seconds)
+LOGGING_SETTINGS = {
+    'level': 'INFO',
+    'json': False,
+    'debug_rate': (10, 60)
+}
+
+
+# Browser used by the scrapers. Sources marked lean skip images, web fonts
+# and media, load pages with the given page load strategy and block requests
+# to blocked_domains (and their subdomains)
+BROWSER_SETTINGS = {
+    'lean': {
+        'citizen': True,
+        'daily_nations': True,
+        'standardmedia': True,
+        'star': True,
+        'tuko': True
+    },
+    'page_load_strategy': 'eager',
+    'block_images': True,
+    'block_fonts': True,
+    'block_media': True,
+    'blocked_domains': [
+        'doubleclick.net',
+        'googlesyndication.com',
+        'googletagmanager.com',
+        'googletagservices.com',
+        'google-analytics.com',
+        'adservice.google.com',
+        'amazon-adsystem.com',
+        'facebook.net',
+        'scorecardresearch.com',
+        'chartbeat.com',
+        'chartbeat.net',
+        'taboola.com',
+        'outbrain.com',
+        'hotjar.com',
+        'criteo.com',
+        'quantserve.com',
+        'onesignal.com'
+    ],
+    # Running bytes/load-time totals per source and mode, for the savings report
+    'stats_file': 'cache/page_weight.json',
+    # Resolved geckodriver path; delete the file to look it up again
+    'geckodriver_cache': 'cache/geckodriver.json',
+    # Restart the browser between pages once its process tree uses more than
+    # max_memory_mb or it has served max_pages pages (None to disable either)
+    'max_memory_mb': 1500,
+    'max_pages': 300
+}
+
+
+# Job queue for `python -m scrapers.queue_worker`. A claimed job is leased for
+# lease_seconds; failures are retried after retry_delay seconds, doubling each
+# attempt, and dead-lettered after max_attempts. host_interval is the minimum
+# number of seconds between page loads on one host across all workers
+QUEUE_SETTINGS = {
+    'lease_seconds': 300,
+    'max_attempts': 4,
+    'retry_delay': 60,
+    'host_interval': 2.0,
+    'hosts_per_claim': 5,
+    'poll_interval': 5
+}
+
+
+# Daemon mode (`python main.py --daemon`). Each source/category is crawled on
+# its own interval, chosen so that about target_new_articles new articles
+# appear between crawls. The new-article rate is an exponentially weighted
+# average (weight `smoothing` for the latest crawl); intervals stay within
+# min_interval..max_interval seconds. Browsers not needed within
+# idle_browser_timeout seconds are closed until their next crawl
+SCHEDULE_SETTINGS = {
+    'initial_interval': 1800,
+    'min_interval': 300,
+    'max_interval': 6 * 3600,
+    'target_new_articles': 3,
+    'smoothing': 0.3,
+    'articles_per_run': 10,
+    'idle_browser_timeout': 900
+}
+
+
+# Lightweight article variants. Sources enabled here first try an article's AMP
+# page over plain HTTP, without the browser, and load the full page only when
+# the variant is missing or lacks a title, date or min_content_chars of text.
+# url_templates gives a variant URL per source, with {path} standing for the
+# article path; other sources learn it from <link rel="amphtml"> on full pages.
+# After max_misses unusable variants in a row a source stops trying for the run
+VARIANT_SETTINGS = {
+    'enabled': {
+        'citizen': True,
+        'daily_nations': True,
+        'standardmedia': True,
+        'star': True,
+        'tuko': True
+    },
+    'url_templates': {},
+    'rules_file': 'cache/variant_rules.json',
+    'min_content_chars': 300,
+    'timeout': 15,
+    'max_misses': 5
+}
+
+
+# Pipeline mode: article pages are fetched by `fetch_workers` threads with a
+# browser each, parsed in `parse_workers` processes (None: one per CPU) and
+# saved by one writer in batches of up to `write_batch`, or after
+# `flush_seconds`. At most `fetch_queue` links wait for a fetcher and
+# `parse_queue` pages for the parser or writer. Each fetcher pauses
+# `article_delay` seconds between pages
+PIPELINE_SETTINGS = {
+    'enabled': {
+        'citizen': False,
+        'daily_nations': False,
+        'standardmedia': False,
+        'star': False,
+        'tuko': False
+    },
+    'fetch_workers': 3,
+    'parse_workers': None,
+    'fetch_queue': 12,
+    'parse_queue': 8,
+    'write_batch': 20,
+    'flush_seconds': 5.0,
+    'article_delay': 2
+}
+
+
+# Page fetch retries and per-source circuit breaker. A failed page load is
+# retried up to max_attempts times in all, waiting a random delay of up to
+# base_delay * 2^n seconds (at most max_delay) between attempts. After
+# failure_threshold pages in a row could not be loaded, the source's breaker
+# opens: the run is marked failed and no page is requested for cooldown
+# seconds. page_load_timeout bounds each driver.get()
+RETRY_SETTINGS = {
+    'max_attempts': 3,
+    'base_delay': 2,
+    'max_delay': 30,
+    'failure_threshold': 5,
+    'cooldown': 600,
+    'page_load_timeout': 45
+}
+
+
+# Article budget per run. Categories (and, when total_articles is set, sources)
+# get shares of the budget by Thompson sampling of their historical yield: new
+# articles saved per page fetched. Observations are stored in stats_file and
+# older runs count decay times less at each update. A source stops starting
+# new categories once run_seconds have passed (None for no time limit). A
+# category loads at most page_load_factor pages per article it may save;
+# links already stored are skipped without counting
+BUDGET_SETTINGS = {
+    'stats_file': 'cache/category_yield.json',
+    'decay': 0.8,
+    'run_seconds': 1800,
+    'total_articles': None,
+    'page_load_factor': 3
+}
+
+
+# Dashboard rollup tables (see database/rollups.py), updated in the same
+# transaction as every article insert, update and sentiment score. Off until
+# the tables exist and hold the stored articles: run `python setup.py` and
+# `python -m database.rollups rebuild` first, or writes fail and counts drift
+ROLLUP_SETTINGS = {
+    'enabled': False
+}
+
+
+# Read API (`python -m api.server`). Responses are cached for cache_ttl seconds
+# in an LRU of cache_size entries; a source's entries are dropped as soon as
+# scraper_metadata shows new or updated articles, checked every
+# invalidation_interval seconds. Queries run on db_threads connections
+API_SETTINGS = {
+    'host': '127.0.0.1',
+    'port': 8081,
+    'db_threads': 4,
+    'default_limit': 20,
+    'max_limit': 100,
+    'cache_size': 1024,
+    'cache_ttl': 60,
+    'invalidation_interval': 1.0,
+    'latency_window': 10000
+}
+
+
+# Bulk ingest of article archives (`python -m database.ingest`). method is
+# 'insert' (multi-row INSERTs) or 'load_data' (LOAD DATA LOCAL INFILE, needs
+# local_infile enabled on the server); rows are normalized and staged in
+# chunks of chunk_size
+INGEST_SETTINGS = {
+    'method': 'insert',
+    'chunk_size': 5000
+}
@@ -0,0 +1,216 @@
+"""
+Compressed article storage: dictionary training, migration and reporting.
+
+Usage:
+    python -m database.compression train   [--sources star tuko]
+    python -m database.compression migrate [--sources star tuko] [--decompress]
+    python -m database.compression report  [--sources star tuko]
+
+``train`` builds a per-source dictionary from stored bodies, ``migrate``
+moves existing rows into ``content_compressed`` (or back with
+``--decompress``), and ``report`` compares stored and plain sizes along with
+encode/decode cost. Enable ``STORAGE_SETTINGS['compress_content']`` so new
+articles are written compressed too.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import NEWS_SOURCES, STORAGE_SETTINGS
+from database.operations import bump_revision, get_content_codec, iter_article_rows, update_column_batch
+from utils.compression import codec_available, train_dictionary
+
+
+def train_source_dictionary(connection, source, codec=None):
+    """
+    Train and store a new compression dictionary for a source.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        codec (str): Codec the dictionary is for (defaults to STORAGE_SETTINGS)
+
+    Returns:
+        int: Id of the stored dictionary, or 0 if there was not enough content
+    """
+    codec = codec or STORAGE_SETTINGS['codec']
+    if not codec_available(codec):
+        logging.warning(f"Codec {codec} not available, training a zlib dictionary instead")
+        codec = 'zlib'
+
+    # Sample the most recent bodies; they best match what will be written next
+    cursor = connection.cursor()
+    cursor.execute(
+        f"SELECT id FROM {source}_articles ORDER BY id DESC LIMIT 1 OFFSET %s",
+        (STORAGE_SETTINGS['training_samples'],)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    start_after = row[0] if row else 0
+
+    samples = []
+    for rows in iter_article_rows(connection, f"{source}_articles", ['content'], start_after=start_after):
+        samples.extend(content for _, content in rows if content)
+
+    data = train_dictionary(samples, codec, STORAGE_SETTINGS['dictionary_size'])
+    if not data:
+        return 0
+
+    cursor = connection.cursor()
+    cursor.execute(
+        "INSERT INTO compression_dictionaries (source, codec, data) VALUES (%s, %s, %s)",
+        (source, codec, data)
+    )
+    dict_id = cursor.lastrowid
+    connection.commit()
+    cursor.close()
+
+    get_content_codec(connection, source, refresh=True)
+    logging.info(f"{source}: trained {codec} dictionary {dict_id} ({len(data)} bytes, {len(samples)} samples)")
+    return dict_id
+
+
+def migrate_source(connection, source, decompress=False, chunk_size=500):
+    """
+    Convert stored bodies of a source to compressed storage, or back to plain text.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        decompress (bool): Move compressed bodies back into ``content``
+        chunk_size (int): Rows converted per batch
+
+    Returns:
+        dict: Conversion statistics (rows, bytes and encode/decode seconds)
+    """
+    table_name = f"{source}_articles"
+    codec = get_content_codec(connection, source)
+    stats = {'rows': 0, 'plain_bytes': 0, 'stored_bytes': 0, 'encode_seconds': 0.0, 'decode_seconds': 0.0}
+
+    if decompress:
+        where = "content_compressed IS NOT NULL"
+    else:
+        where = "content_compressed IS NULL AND content <> ''"
+
+    for rows in iter_article_rows(connection, table_name, ['content', 'content_compressed'],
+                                  where=where, chunk_size=chunk_size, decode=False):
+        texts = {}
+        blobs = {}
+        for row_id, content, content_compressed in rows:
+            if decompress:
+                start = time.perf_counter()
+                content = codec.decode(content_compressed)
+                stats['decode_seconds'] += time.perf_counter() - start
+                texts[row_id], blobs[row_id] = content, None
+                stored = len(content.encode('utf-8'))
+            else:
+                start = time.perf_counter()
+                blob = codec.encode(content)
+                stats['encode_seconds'] += time.perf_counter() - start
+                start = time.perf_counter()
+                codec.decode(blob)
+                stats['decode_seconds'] += time.perf_counter() - start
+                texts[row_id], blobs[row_id] = '', blob
+                stored = len(blob)
+
+            stats['rows'] += 1
+            stats['plain_bytes'] += len(content.encode('utf-8'))
+            stats['stored_bytes'] += stored
+
+        update_column_batch(connection, table_name, 'content_compressed', blobs)
+        update_column_batch(connection, table_name, 'content', texts)
+        cursor = connection.cursor()
+        bump_revision(cursor, source)
+        cursor.close()
+        connection.commit()
+
+    return stats
+
+
+def report_source(connection, source, chunk_size=500):
+    """
+    Measure how much compression saves for a source without changing any rows.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        chunk_size (int): Rows read per batch
+
+    Returns:
+        dict: Rows, plain and compressed bytes, and encode/decode seconds
+    """
+    codec = get_content_codec(connection, source)
+    stats = {'rows': 0, 'plain_bytes': 0, 'stored_bytes': 0, 'encode_seconds': 0.0, 'decode_seconds': 0.0}
+
+    for rows in iter_article_rows(connection, f"{source}_articles", ['content'], chunk_size=chunk_size):
+        for _, content in rows:
+            if not content:
+                continue
+            start = time.perf_counter()
+            blob = codec.encode(content)
+            stats['encode_seconds'] += time.perf_counter() - start
+            start = time.perf_counter()
+            codec.decode(blob)
+            stats['decode_seconds'] += time.perf_counter() - start
+
+            stats['rows'] += 1
+            stats['plain_bytes'] += len(content.encode('utf-8'))
+            stats['stored_bytes'] += len(blob)
+
+    return stats
+
+
+def format_stats(source, stats):
+    """Format conversion statistics as one log line."""
+    rows = stats['rows'] or 1
+    ratio = stats['stored_bytes'] / stats['plain_bytes'] if stats['plain_bytes'] else 1.0
+    return (
+        f"{source}: {stats['rows']} rows, {stats['plain_bytes']} -> {stats['stored_bytes']} bytes "
+        f"({(1 - ratio) * 100:.1f}% saved), encode {stats['encode_seconds'] / rows * 1e6:.0f} us/row, "
+        f"decode {stats['decode_seconds'] / rows * 1e6:.0f} us/row"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage compressed article storage')
+    parser.add_argument('command', choices=['train', 'migrate', 'report'])
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, help='Sources to process')
+    parser.add_argument('--decompress', action='store_true', help='With migrate: restore plain content')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Rows per batch')
+    args = parser.parse_args()
+
+    connection = get_connection()
+    if not connection:
+        logging.error("Failed to connect to database.")
+        return False
+
+    try:
+        for source in args.sources:
+            if args.command == 'train':
+                train_source_dictionary(connection, source)
+            elif args.command == 'migrate':
+                stats = migrate_source(connection, source, args.decompress, args.chunk_size)
+                logging.info(format_stats(source, stats))
+            else:
+                logging.info(format_stats(source, report_source(connection, source, args.chunk_size)))
+    except Exception as e:
+        connection.rollback()
+        logging.error(f"Error during compression {args.command}: {e}")
+        return False
+    finally:
+        connection.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,205 @@
+"""
+Author and category dimension tables: migration and size report.
+
+Usage:
+    python -m database.dimensions migrate [--sources star tuko] [--keep-columns]
+    python -m database.dimensions report  [--sources star tuko]
+
+The article tables store ``author_id`` and ``category_id``, ids into the
+``authors`` and ``categories`` tables, instead of repeating the names on
+every row. ``migrate`` converts tables created before that (run
+``python setup.py`` first to add the id columns): it adds every distinct name
+to its dimension table, fills in the ids a chunk of rows at a time and then
+drops the ``author`` and ``category`` columns, unless ``--keep-columns`` is
+given. It can be run again at any time. ``report`` shows the size of each
+article table and its indexes and times a GROUP BY on category.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import NEWS_SOURCES
+from database.operations import DIMENSIONS
+
+
+def table_columns(connection, table_name):
+    """
+    Names of a table's columns.
+
+    Args:
+        connection: Open MySQL connection
+        table_name (str): Table to inspect
+
+    Returns:
+        set: Column names
+    """
+    cursor = connection.cursor()
+    cursor.execute("""
+    SELECT COLUMN_NAME FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table_name,))
+    columns = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return columns
+
+
+def migrate_source(connection, source, chunk_size=5000, keep_columns=False):
+    """
+    Move a source's author and category names into the dimension tables.
+
+    Rows that already have an id (such as articles written since the id
+    columns were added) keep it. The rollups are keyed by name, so they stay
+    as they are.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        chunk_size (int): Rows updated per transaction
+        keep_columns (bool): Keep the ``author`` and ``category`` columns after filling in the ids
+
+    Returns:
+        dict: Rows updated, names added per dimension table and whether the name columns were dropped
+    """
+    table_name = f"{source}_articles"
+    columns = table_columns(connection, table_name)
+    named = {column: DIMENSIONS[column] for column in DIMENSIONS if column in columns}
+    stats = {'rows': 0, 'authors': 0, 'categories': 0, 'dropped': False}
+    if not named:
+        return stats
+
+    cursor = connection.cursor()
+    try:
+        for column, (id_column, table) in named.items():
+            cursor.execute(
+                f"INSERT IGNORE INTO {table} (name) "
+                f"SELECT DISTINCT {column} FROM {table_name} WHERE {column} <> '' AND {id_column} IS NULL"
+            )
+            stats[table] = cursor.rowcount
+        connection.commit()
+
+        joins = ' '.join(f"LEFT JOIN {table} d_{column} ON d_{column}.name = a.{column}"
+                         for column, (_, table) in named.items())
+        assignments = ', '.join(f"a.{id_column} = COALESCE(a.{id_column}, d_{column}.id)"
+                                for column, (id_column, _) in named.items())
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}")
+        max_id = cursor.fetchone()[0]
+        for start in range(0, max_id, chunk_size):
+            cursor.execute(
+                f"UPDATE {table_name} a {joins} SET {assignments} WHERE a.id > %s AND a.id <= %s",
+                (start, start + chunk_size)
+            )
+            stats['rows'] += cursor.rowcount
+            connection.commit()
+
+        if keep_columns:
+            return stats
+
+        missing = ' OR '.join(f"({column} <> '' AND {id_column} IS NULL)"
+                              for column, (id_column, _) in named.items())
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {missing}")
+        unresolved = cursor.fetchone()[0]
+        if unresolved:
+            logging.warning(f"{source}: {unresolved} rows have a name without an id, keeping the name columns")
+            return stats
+
+        # INPLACE rebuilds the table, so the space is given back (an INSTANT drop would keep it);
+        # idx_category goes with its column
+        drops = ', '.join(f"DROP COLUMN {column}" for column in named)
+        cursor.execute(f"ALTER TABLE {table_name} {drops}, ALGORITHM=INPLACE, LOCK=NONE")
+        stats['dropped'] = True
+        return stats
+    finally:
+        cursor.close()
+
+
+def report_source(connection, source):
+    """
+    Measure a source's article table without changing it.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+
+    Returns:
+        dict: Rows, data and index bytes, and seconds of a GROUP BY on each
+        category column the table has
+    """
+    table_name = f"{source}_articles"
+    cursor = connection.cursor()
+    # Refresh the statistics information_schema reports
+    cursor.execute(f"ANALYZE TABLE {table_name}")
+    cursor.fetchall()
+    cursor.execute("""
+    SELECT TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table_name,))
+    rows, data_bytes, index_bytes = cursor.fetchone()
+    stats = {'rows': rows, 'data_bytes': data_bytes, 'index_bytes': index_bytes, 'group_seconds': {}}
+
+    columns = table_columns(connection, table_name)
+    for column in ('category', 'category_id'):
+        if column in columns:
+            start = time.perf_counter()
+            cursor.execute(f"SELECT {column}, COUNT(*) FROM {table_name} GROUP BY {column}")
+            cursor.fetchall()
+            stats['group_seconds'][column] = time.perf_counter() - start
+    cursor.close()
+    return stats
+
+
+def format_stats(source, stats):
+    """Format migration or report statistics as one log line."""
+    if 'data_bytes' in stats:
+        timings = ', '.join(f"{column} {seconds:.2f}s" for column, seconds in stats['group_seconds'].items())
+        return (
+            f"{source}: {stats['rows']} rows, data {stats['data_bytes'] / 2 ** 20:.1f} MB, "
+            f"indexes {stats['index_bytes'] / 2 ** 20:.1f} MB; GROUP BY {timings or '-'}"
+        )
+    return (
+        f"{source}: {stats['rows']} rows given ids, {stats['authors']} new authors, "
+        f"{stats['categories']} new categories, name columns {'dropped' if stats['dropped'] else 'kept'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the author and category dimension tables')
+    parser.add_argument('command', choices=['migrate', 'report'])
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, help='Sources to process')
+    parser.add_argument('--keep-columns', action='store_true',
+                        help='With migrate: keep the author and category name columns')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per batch')
+    args = parser.parse_args()
+
+    connection = get_connection()
+    if not connection:
+        logging.error("Failed to connect to database.")
+        return False
+
+    try:
+        for source in args.sources:
+            if args.command == 'migrate':
+                stats = migrate_source(connection, source, args.chunk_size, args.keep_columns)
+            else:
+                stats = report_source(connection, source)
+            logging.info(format_stats(source, stats))
+    except Exception as e:
+        connection.rollback()
+        logging.error(f"Error during dimension {args.command}: {e}")
+        return False
+    finally:
+        connection.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(0 if main() else 1)
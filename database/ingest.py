@@ -0,0 +1,410 @@
+"""
+Bulk ingest of article archives into the article tables.
+
+Reads CSV or JSON-lines files (such as those written by ``ArticleCsvWriter``
+and ``ArticleJsonWriter``, or other teams' dumps with the same columns) in
+chunks. Each chunk is normalized column by column (``clean_texts`` and the
+source's date parser, each called once per column), then written to a
+temporary staging table with one multi-row INSERT or ``LOAD DATA LOCAL
+INFILE``. Once the files are staged, each source is merged into its article
+table with a single ``INSERT ... SELECT ... ON DUPLICATE KEY UPDATE``,
+together with new author and category names, the rollups and
+``scraper_metadata`` counters, in one transaction.
+
+Usage:
+    python -m database.ingest archive/tuko_articles.csv --source tuko
+    python -m database.ingest dumps/*.jsonl --method load_data --chunk-size 20000
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import logging
+import tempfile
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import INGEST_SETTINGS, NEWS_SOURCES
+from database.models import Article
+from database.operations import encode_content
+from database.rollups import apply_articles, rollups_enabled
+from utils.date_parser import parse_date, parse_dates
+from utils.text_cleaner import clean_texts
+
+
+STAGING_COLUMNS = ('url', 'title', 'publication_date', 'author', 'content', 'content_compressed', 'category')
+
+# Column sizes of the article tables
+MAX_URL = 255
+MAX_TITLE = 255
+MAX_AUTHOR = 100
+MAX_CATEGORY = 100
+
+# Article bodies are far longer than csv's default field limit
+csv.field_size_limit(2 ** 31 - 1)
+
+
+def read_rows(path, file_format=None):
+    """
+    Stream the records of an archive file as dicts.
+
+    Args:
+        path (str): CSV or JSON-lines file
+        file_format (str): 'csv' or 'jsonl'; guessed from the extension if omitted
+
+    Yields:
+        dict: One record per row or line
+    """
+    file_format = file_format or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, newline='' if file_format == 'csv' else None, encoding='utf-8') as f:
+        if file_format == 'csv':
+            yield from csv.DictReader(f)
+            return
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logging.warning(f"{path}:{line_number}: not valid JSON, skipped")
+                yield {}
+
+
+def chunked(rows, size):
+    """Group an iterable into lists of at most ``size`` items."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def clean_contents(contents):
+    """Clean each paragraph of a batch of article bodies, keeping the blank lines between them."""
+    bodies = [[p for p in str(content or '').split('\n\n') if p.strip()] for content in contents]
+    paragraphs = iter(clean_texts([p for body in bodies for p in body]))
+    return ['\n\n'.join(p for p in (next(paragraphs) for _ in body) if p) for body in bodies]
+
+
+def parse_date_column(rows, source):
+    """
+    Parse the ``publication_date`` of a group of records from one source.
+
+    A date that cannot be parsed becomes None and its record is logged, so
+    one bad value never stops the load.
+
+    Args:
+        rows (list): Record dicts
+        source (str): Source of the records
+
+    Returns:
+        list: Parsed datetimes, None where parsing failed
+    """
+    texts = [str(row.get('publication_date') or '') for row in rows]
+    selector = 'ingest:publication_date'
+    try:
+        # One call per column, so the source's date format is found once and reused
+        return parse_dates(texts, source=source, selector=selector)
+    except Exception:
+        # A bad value fails the whole column: parse it row by row to find and skip it
+        pass
+
+    dates = []
+    for row, text in zip(rows, texts):
+        try:
+            dates.append(parse_date(text, source=source, selector=selector))
+        except Exception as e:
+            logging.warning(f"{row.get('url')}: publication date {text!r} not parsed ({e}), stored without one")
+            dates.append(None)
+    return dates
+
+
+def normalize_chunk(rows, source=None):
+    """
+    Turn raw records into articles, one column at a time.
+
+    Args:
+        rows (list): Record dicts
+        source (str): Source of every record; otherwise each record's ``source`` field
+
+    Returns:
+        tuple: Dict of source to its list of ``Article`` and the number of rejected records
+    """
+    groups = {}
+    rejected = 0
+    for row in rows:
+        row_source = source or str(row.get('source') or '').strip()
+        url = str(row.get('url') or '').strip()
+        if row_source not in NEWS_SOURCES or not url or len(url) > MAX_URL or not row.get('title'):
+            rejected += 1
+            continue
+        groups.setdefault(row_source, []).append(row)
+
+    articles = {}
+    for row_source, group in groups.items():
+        titles = [title[:MAX_TITLE] for title in clean_texts([str(row['title']) for row in group])]
+        authors = [author[:MAX_AUTHOR] for author in clean_texts([str(row.get('author') or '') for row in group])]
+        categories = [category[:MAX_CATEGORY]
+                      for category in clean_texts([str(row.get('category') or '') for row in group])]
+        contents = clean_contents([row.get('content') for row in group])
+        dates = parse_date_column(group, row_source)
+        articles[row_source] = [
+            Article(url=str(row['url']), title=title, publication_date=date, author=author,
+                    content=content, category=category, source=row_source)
+            for row, title, author, category, content, date in zip(group, titles, authors, categories, contents, dates)
+            if title
+        ]
+        rejected += len(group) - len(articles[row_source])
+    return articles, rejected
+
+
+def staging_table(source):
+    return f"{source}_articles_staging"
+
+
+def create_staging(connection, source):
+    """Create the session's temporary staging table for a source."""
+    cursor = connection.cursor()
+    cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging_table(source)}")
+    cursor.execute(f"""
+    CREATE TEMPORARY TABLE {staging_table(source)} (
+        url VARCHAR(255) NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        publication_date DATETIME,
+        author VARCHAR(100),
+        content TEXT NOT NULL,
+        content_compressed MEDIUMBLOB NULL,
+        category VARCHAR(100),
+        INDEX idx_url (url)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    cursor.close()
+
+
+def staging_values(connection, source, articles):
+    """Column values of articles for the staging table, compressing content if configured."""
+    values = []
+    for article in articles:
+        url, title, publication_date, author, content, category = article.db_values()
+        content, content_compressed = encode_content(connection, source, content)
+        values.append((url, title, publication_date, author, content, content_compressed, category))
+    return values
+
+
+def stage_insert(connection, source, values):
+    """Write a chunk to the staging table as one multi-row INSERT."""
+    cursor = connection.cursor()
+    cursor.executemany(
+        f"INSERT INTO {staging_table(source)} ({', '.join(STAGING_COLUMNS)}) "
+        f"VALUES ({', '.join(['%s'] * len(STAGING_COLUMNS))})",
+        values
+    )
+    connection.commit()
+    cursor.close()
+
+
+def _tsv_field(value):
+    """Escape a value for LOAD DATA's default field format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+            .replace('\r', '\\r').replace('\0', '\\0'))
+
+
+def stage_load_data(connection, source, values):
+    """Write a chunk to the staging table through a temporary file and LOAD DATA LOCAL INFILE."""
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='\n', delete=False) as f:
+        for row in values:
+            f.write('\t'.join(_tsv_field(value) for value in row) + '\n')
+        path = f.name
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE {staging_table(source)}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'
+            (url, title, publication_date, author, content, @compressed, category)
+            SET content_compressed = UNHEX(@compressed)
+            """,
+            (path,)
+        )
+        connection.commit()
+        cursor.close()
+    finally:
+        os.remove(path)
+
+
+def merge_staging(connection, source):
+    """
+    Upsert a source's staged articles into its table in one transaction.
+
+    Rollups move by the difference between the stored and the merged rows,
+    and the ``scraper_metadata`` counters grow by the articles added and updated.
+
+    Returns:
+        tuple: Number of articles inserted and updated
+    """
+    table_name = f"{source}_articles"
+    staging = staging_table(source)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT COUNT(DISTINCT s.url), COUNT(DISTINCT a.url) FROM {staging} s "
+            f"LEFT JOIN {table_name} a ON a.url = s.url"
+        )
+        staged, existing = cursor.fetchone()
+        in_staging = f"url IN (SELECT url FROM {staging})"
+
+        # Add the staged authors and categories that have no id yet, then merge with their ids
+        cursor.execute(f"INSERT IGNORE INTO authors (name) SELECT DISTINCT author FROM {staging} WHERE author <> ''")
+        cursor.execute(
+            f"INSERT IGNORE INTO categories (name) SELECT DISTINCT category FROM {staging} WHERE category <> ''"
+        )
+
+        if rollups_enabled():
+            apply_articles(cursor, source, in_staging, sign=-1)
+        cursor.execute(
+            f"""
+            INSERT INTO {table_name} (url, title, publication_date, author_id, content, content_compressed, category_id)
+            SELECT s.url, s.title, s.publication_date, au.id, s.content, s.content_compressed, ca.id
+            FROM {staging} s
+            LEFT JOIN authors au ON au.name = s.author
+            LEFT JOIN categories ca ON ca.name = s.category
+            ON DUPLICATE KEY UPDATE
+                title = VALUES(title),
+                publication_date = VALUES(publication_date),
+                author_id = VALUES(author_id),
+                content = VALUES(content),
+                content_compressed = VALUES(content_compressed),
+                category_id = VALUES(category_id)
+            """
+        )
+        if rollups_enabled():
+            apply_articles(cursor, source, in_staging)
+
+        inserted, updated = staged - existing, existing
+        cursor.execute(
+            """
+            INSERT INTO scraper_metadata (source, last_scrape_time, articles_added, articles_updated, last_status)
+            VALUES (%s, NOW(), %s, %s, 'success')
+            ON DUPLICATE KEY UPDATE
+                articles_added = articles_added + VALUES(articles_added),
+                articles_updated = articles_updated + VALUES(articles_updated)
+            """,
+            (source, inserted, updated)
+        )
+        cursor.execute(f"DROP TEMPORARY TABLE {staging}")
+        connection.commit()
+        return inserted, updated
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def ingest_files(connection, paths, source=None, file_format=None, method=None, chunk_size=None):
+    """
+    Stage and merge archive files.
+
+    Args:
+        connection: Open MySQL connection (with allow_local_infile for 'load_data')
+        paths (list): Archive files
+        source (str): Source of every record; otherwise each record's ``source`` field
+        file_format (str): 'csv' or 'jsonl'; guessed per file if omitted
+        method (str): 'insert' or 'load_data'
+        chunk_size (int): Records normalized and staged at a time
+
+    Returns:
+        dict: Record counts and the seconds spent staging and merging
+    """
+    method = method or INGEST_SETTINGS['method']
+    chunk_size = chunk_size or INGEST_SETTINGS['chunk_size']
+    stats = {'rows': 0, 'rejected': 0, 'staged': 0, 'inserted': 0, 'updated': 0,
+             'stage_seconds': 0.0, 'merge_seconds': 0.0}
+    staged_sources = set()
+
+    start = time.perf_counter()
+    for path in paths:
+        for chunk in chunked(read_rows(path, file_format), chunk_size):
+            articles, rejected = normalize_chunk(chunk, source)
+            stats['rows'] += len(chunk)
+            stats['rejected'] += rejected
+            for chunk_source, chunk_articles in articles.items():
+                if chunk_source not in staged_sources:
+                    create_staging(connection, chunk_source)
+                    staged_sources.add(chunk_source)
+                values = staging_values(connection, chunk_source, chunk_articles)
+                if method == 'load_data':
+                    try:
+                        stage_load_data(connection, chunk_source, values)
+                    except Exception as e:
+                        logging.warning(f"LOAD DATA LOCAL INFILE failed ({e}), using multi-row inserts instead")
+                        method = 'insert'
+                if method == 'insert':
+                    stage_insert(connection, chunk_source, values)
+                stats['staged'] += len(values)
+            elapsed = time.perf_counter() - start
+            logging.info(f"Staged {stats['staged']} of {stats['rows']} records from {path} "
+                         f"({stats['rows'] / elapsed:.0f} records/s)")
+    stats['stage_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for staged_source in sorted(staged_sources):
+        inserted, updated = merge_staging(connection, staged_source)
+        stats['inserted'] += inserted
+        stats['updated'] += updated
+        logging.info(f"Merged {staged_source}: {inserted} new, {updated} updated")
+    stats['merge_seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk load article archives into the article tables')
+    parser.add_argument('files', nargs='+', help='CSV or JSON-lines archive files')
+    parser.add_argument('--source', choices=NEWS_SOURCES,
+                        help="Source of every record (default: each record's source field)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='File format (default: from the extension)')
+    parser.add_argument('--method', choices=['insert', 'load_data'], default=INGEST_SETTINGS['method'],
+                        help='How chunks are written to the staging table')
+    parser.add_argument('--chunk-size', type=int, default=INGEST_SETTINGS['chunk_size'], help='Records per chunk')
+    args = parser.parse_args()
+
+    connection = get_connection(allow_local_infile=True) if args.method == 'load_data' else get_connection()
+    if not connection:
+        logging.error("Failed to connect to database. Cannot ingest articles.")
+        return False
+
+    try:
+        stats = ingest_files(connection, args.files, args.source, args.format, args.method, args.chunk_size)
+    except Exception as e:
+        logging.error(f"Error ingesting articles: {e}")
+        return False
+    finally:
+        connection.close()
+
+    total_seconds = stats['stage_seconds'] + stats['merge_seconds']
+    logging.info(
+        f"Ingested {stats['rows']} records ({stats['rejected']} rejected): {stats['inserted']} new, "
+        f"{stats['updated']} updated. Staging {stats['stage_seconds']:.1f}s "
+        f"({stats['rows'] / max(stats['stage_seconds'], 1e-9):.0f} records/s), merge {stats['merge_seconds']:.1f}s, "
+        f"{stats['rows'] / max(total_seconds, 1e-9):.0f} records/s overall"
+    )
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,261 @@
+"""
+Database-backed job queue for crawling article pages with many workers.
+
+Discovery inserts article URLs into ``scrape_jobs``. Workers on any number of
+hosts claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` (MySQL 8.0+), so
+concurrent claims never block on or return the same row. A claimed job holds
+a lease; if its worker dies, the job becomes claimable again once the lease
+expires. Failed jobs are retried with exponential backoff and dead-lettered
+after ``QUEUE_SETTINGS['max_attempts']`` attempts.
+
+Politeness is enforced per host through ``crawl_hosts``: claiming a job for a
+host pushes that host's ``next_fetch_at`` forward, and the host row is locked
+for the duration of the claim, so all workers together respect the interval.
+"""
+import os
+import sys
+from urllib.parse import urlparse
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.settings import QUEUE_SETTINGS
+
+
+def url_host(url):
+    """Host name used for politeness limits, e.g. ``www.the-star.co.ke``."""
+    return urlparse(url).netloc.lower()
+
+
+def enqueue_jobs(connection, source, category, urls):
+    """
+    Add article URLs to the queue, ignoring URLs that are already queued.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        category (str): Category the links were found in
+        urls (list): Absolute article URLs
+
+    Returns:
+        int: Number of new jobs
+    """
+    if not urls:
+        return 0
+
+    cursor = connection.cursor()
+    hosts = sorted({url_host(url) for url in urls})
+    cursor.executemany(
+        "INSERT IGNORE INTO crawl_hosts (host, source) VALUES (%s, %s)",
+        [(host, source) for host in hosts]
+    )
+    cursor.executemany(
+        "INSERT IGNORE INTO scrape_jobs (source, category, url, host) VALUES (%s, %s, %s, %s)",
+        [(source, category, url, url_host(url)) for url in urls]
+    )
+    added = cursor.rowcount
+    connection.commit()
+    cursor.close()
+    return max(added, 0)
+
+
+def claim_job(connection, worker_id, sources):
+    """
+    Claim the next job whose host may be fetched now.
+
+    Jobs whose lease expired are claimable again; if such a job has used up
+    its attempts it is dead-lettered instead.
+
+    Args:
+        connection: Open MySQL connection
+        worker_id (str): Identity written to the job's lease
+        sources (list): Only claim jobs of these sources
+
+    Returns:
+        dict: Job with ``id``, ``source``, ``category``, ``url`` and ``attempts``
+        (including this one), or None if no job is ready
+    """
+    placeholders = ', '.join(['%s'] * len(sources))
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(
+            f"""
+            SELECT host FROM crawl_hosts
+            WHERE source IN ({placeholders}) AND next_fetch_at <= NOW(3)
+            ORDER BY next_fetch_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (*sources, QUEUE_SETTINGS['hosts_per_claim'])
+        )
+        hosts = [row['host'] for row in cursor.fetchall()]
+
+        for host in hosts:
+            while True:
+                cursor.execute(
+                    """
+                    SELECT id, source, category, url, attempts FROM scrape_jobs
+                    WHERE host = %s AND (
+                        (status = 'pending' AND available_at <= NOW())
+                        OR (status = 'running' AND lease_expires < NOW())
+                    )
+                    ORDER BY id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                    """,
+                    (host,)
+                )
+                job = cursor.fetchone()
+                if not job:
+                    break
+
+                if job['attempts'] >= QUEUE_SETTINGS['max_attempts']:
+                    # Its last worker died mid-job too many times
+                    cursor.execute(
+                        """
+                        UPDATE scrape_jobs
+                        SET status = 'dead', lease_owner = NULL, lease_expires = NULL,
+                            last_error = 'lease expired'
+                        WHERE id = %s
+                        """,
+                        (job['id'],)
+                    )
+                    continue
+
+                cursor.execute(
+                    """
+                    UPDATE scrape_jobs
+                    SET status = 'running', attempts = attempts + 1, lease_owner = %s,
+                        lease_expires = NOW() + INTERVAL %s SECOND
+                    WHERE id = %s
+                    """,
+                    (worker_id, QUEUE_SETTINGS['lease_seconds'], job['id'])
+                )
+                cursor.execute(
+                    "UPDATE crawl_hosts SET next_fetch_at = NOW(3) + INTERVAL %s MICROSECOND WHERE host = %s",
+                    (int(QUEUE_SETTINGS['host_interval'] * 1000000), host)
+                )
+                connection.commit()
+                job['attempts'] += 1
+                return job
+
+        connection.commit()
+        return None
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def complete_job(connection, job, worker_id):
+    """
+    Mark a claimed job as done.
+
+    Args:
+        connection: Open MySQL connection
+        job (dict): Job returned by ``claim_job``
+        worker_id (str): Worker holding the lease
+
+    Returns:
+        bool: False if the lease had already passed to another worker
+    """
+    cursor = connection.cursor()
+    cursor.execute(
+        """
+        UPDATE scrape_jobs
+        SET status = 'done', lease_owner = NULL, lease_expires = NULL, last_error = NULL
+        WHERE id = %s AND lease_owner = %s
+        """,
+        (job['id'], worker_id)
+    )
+    completed = cursor.rowcount > 0
+    connection.commit()
+    cursor.close()
+    return completed
+
+
+def fail_job(connection, job, worker_id, error):
+    """
+    Record a failed attempt, scheduling a retry or dead-lettering the job.
+
+    Args:
+        connection: Open MySQL connection
+        job (dict): Job returned by ``claim_job``
+        worker_id (str): Worker holding the lease
+        error (str): Reason for the failure
+
+    Returns:
+        str: New status of the job ('pending' or 'dead')
+    """
+    if job['attempts'] >= QUEUE_SETTINGS['max_attempts']:
+        status, delay = 'dead', 0
+    else:
+        status, delay = 'pending', QUEUE_SETTINGS['retry_delay'] * 2 ** (job['attempts'] - 1)
+
+    cursor = connection.cursor()
+    cursor.execute(
+        """
+        UPDATE scrape_jobs
+        SET status = %s, available_at = NOW() + INTERVAL %s SECOND,
+            lease_owner = NULL, lease_expires = NULL, last_error = %s
+        WHERE id = %s AND lease_owner = %s
+        """,
+        (status, delay, str(error)[:1000], job['id'], worker_id)
+    )
+    connection.commit()
+    cursor.close()
+    return status
+
+
+def requeue_dead_jobs(connection, sources):
+    """
+    Give dead-lettered jobs a fresh set of attempts.
+
+    Args:
+        connection: Open MySQL connection
+        sources (list): Sources whose dead jobs are requeued
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    placeholders = ', '.join(['%s'] * len(sources))
+    cursor = connection.cursor()
+    cursor.execute(
+        f"""
+        UPDATE scrape_jobs
+        SET status = 'pending', attempts = 0, available_at = NOW(), last_error = NULL
+        WHERE status = 'dead' AND source IN ({placeholders})
+        """,
+        tuple(sources)
+    )
+    requeued = cursor.rowcount
+    connection.commit()
+    cursor.close()
+    return requeued
+
+
+def queue_stats(connection, sources):
+    """
+    Count jobs by source and status.
+
+    Args:
+        connection: Open MySQL connection
+        sources (list): Sources to include
+
+    Returns:
+        dict: ``{source: {status: count}}``
+    """
+    placeholders = ', '.join(['%s'] * len(sources))
+    cursor = connection.cursor()
+    cursor.execute(
+        f"SELECT source, status, COUNT(*) FROM scrape_jobs WHERE source IN ({placeholders}) GROUP BY source, status",
+        tuple(sources)
+    )
+    stats = {}
+    for source, status, count in cursor.fetchall():
+        stats.setdefault(source, {})[status] = count
+    cursor.close()
+    return stats
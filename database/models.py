@@ -0,0 +1,132 @@
+"""
+Article record shared by all scrapers of the Kenya news scraping project.
+
+Scrapers build an ``Article`` from each page they extract; values are
+normalized once at construction, so the database, CSV and JSON writers can
+serialize records without checking types. ``ArticleCsvWriter`` and
+``ArticleJsonWriter`` write each record as it is saved instead of keeping the
+run's articles in memory.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+
+# Columns of the CSV and keys of the JSON exports, in order
+ARTICLE_FIELDS = ('source', 'url', 'title', 'publication_date', 'author', 'content', 'category', 'scraped_at')
+
+
+def _to_datetime(value):
+    """Coerce a datetime or ISO 8601 string to a naive datetime; anything else becomes None."""
+    if isinstance(value, str) and value.strip():
+        try:
+            value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    # Stored as naive DATETIME: keep the publisher's wall-clock time
+    return value.replace(tzinfo=None)
+
+
+@dataclass(slots=True)
+class Article:
+    """One scraped article."""
+
+    url: str
+    title: str
+    publication_date: Optional[datetime] = None
+    author: Optional[str] = None
+    content: str = ''
+    category: str = 'News'
+    source: Optional[str] = None
+    scraped_at: datetime = field(default_factory=datetime.now)
+
+    def __post_init__(self):
+        self.url = self.url.strip()
+        self.title = (self.title or '').strip()
+        self.publication_date = _to_datetime(self.publication_date)
+        self.author = (self.author or '').strip() or None
+        self.content = self.content or ''
+        self.category = (self.category or '').strip() or 'News'
+        self.scraped_at = _to_datetime(self.scraped_at) or datetime.now()
+
+    def db_values(self):
+        """
+        Column values for the article tables.
+
+        Returns:
+            tuple: ``(url, title, publication_date, author, content, category)``
+        """
+        return self.url, self.title, self.publication_date, self.author, self.content, self.category
+
+    def to_dict(self):
+        """
+        Plain values for CSV and JSON, with datetimes in ISO 8601.
+
+        Returns:
+            dict: Value of each field in ``ARTICLE_FIELDS``
+        """
+        return {
+            'source': self.source,
+            'url': self.url,
+            'title': self.title,
+            'publication_date': self.publication_date.isoformat() if self.publication_date else None,
+            'author': self.author,
+            'content': self.content,
+            'category': self.category,
+            'scraped_at': self.scraped_at.isoformat(),
+        }
+
+
+class ArticleWriter:
+    """Base class for writers that append articles to a file as they are saved."""
+
+    newline = None
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.file = open(path, mode='w', newline=self.newline, encoding='utf-8')
+
+    def write(self, article):
+        """Append one article and flush it to disk."""
+        self.write_record(article.to_dict())
+        self.file.flush()
+        self.count += 1
+
+    def write_record(self, record):
+        raise NotImplementedError("Subclasses must implement ")
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArticleCsvWriter(ArticleWriter):
+    """Writes articles to a CSV file with a header row."""
+
+    # The csv module writes its own line endings
+    newline = ''
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.writer = csv.DictWriter(self.file, fieldnames=ARTICLE_FIELDS)
+        self.writer.writeheader()
+
+    def write_record(self, record):
+        self.writer.writerow(record)
+
+
+class ArticleJsonWriter(ArticleWriter):
+    """Writes articles as JSON lines, one object per article."""
+
+    def write_record(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -0,0 +1,393 @@
+"""
+Shared database operations for the Kenya news scraping project.
+
+Batch jobs walk the article tables with keyset pagination (``WHERE id > last``)
+rather than OFFSET, so each chunk is an index range scan no matter how far
+into the table the job has progressed.
+
+Article bodies may be stored compressed in ``content_compressed`` (see
+``STORAGE_SETTINGS``); the helpers here compress on write and decompress on
+read so callers always see plain ``content``.
+
+Authors and categories are stored once each in the ``authors`` and
+``categories`` tables, and the article tables hold their ids. The ids are
+cached per process, so writes and reads translate names and ids without
+extra queries.
+"""
+import os
+import sys
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.settings import STORAGE_SETTINGS
+from utils.compression import ContentCodec, codec_available
+
+
+_codecs = {}
+
+
+def get_content_codec(connection, source, refresh=False):
+    """
+    Get the codec for a source, with every dictionary trained for it.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        refresh (bool): Reload dictionaries, e.g. after training a new one
+
+    Returns:
+        ContentCodec: Codec that encodes with the newest dictionary of the configured codec
+    """
+    if source in _codecs and not refresh:
+        return _codecs[source]
+
+    codec_name = STORAGE_SETTINGS['codec']
+    if not codec_available(codec_name):
+        codec_name = 'zlib'
+
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT id, codec, data FROM compression_dictionaries WHERE source = %s ORDER BY id",
+        (source,)
+    )
+    dictionaries = {}
+    dict_id = 0
+    for row_id, codec, data in cursor.fetchall():
+        dictionaries[row_id] = bytes(data)
+        if codec == codec_name:
+            dict_id = row_id
+    cursor.close()
+
+    codec = ContentCodec(codec_name, STORAGE_SETTINGS['level'], dictionaries, dict_id)
+    _codecs[source] = codec
+    return codec
+
+
+def encode_content(connection, source, content):
+    """
+    Prepare an article body for storage.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        content (str): Article content
+
+    Returns:
+        tuple: Values for the ``content`` and ``content_compressed`` columns
+    """
+    if not STORAGE_SETTINGS.get('compress_content') or not content:
+        return content, None
+    return '', get_content_codec(connection, source).encode(content)
+
+
+def decode_content(connection, source, content, content_compressed):
+    """
+    Return the plain article body from the stored column values.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        content (str): Value of the ``content`` column
+        content_compressed (bytes): Value of the ``content_compressed`` column, or None
+
+    Returns:
+        str: Article content
+    """
+    if content_compressed is None:
+        return content
+    return get_content_codec(connection, source).decode(content_compressed)
+
+
+# Article fields stored as ids into a dimension table: field -> (id column, table)
+DIMENSIONS = {
+    'author': ('author_id', 'authors'),
+    'category': ('category_id', 'categories'),
+}
+
+_dimension_ids = {}
+_dimension_names = {}
+
+
+def _load_dimension(connection, table):
+    """Read a whole dimension table into the cache; they hold one row per distinct name."""
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT id, name FROM {table}")
+    rows = cursor.fetchall()
+    cursor.close()
+    _dimension_ids[table] = {name: row_id for row_id, name in rows}
+    _dimension_names[table] = {row_id: name for row_id, name in rows}
+
+
+def clear_dimension_cache():
+    """Forget all cached dimension ids, e.g. before using another database in the same process."""
+    _dimension_ids.clear()
+    _dimension_names.clear()
+
+
+def get_dimension_id(connection, table, name, create=True):
+    """
+    Get the id of a name in a dimension table, adding the name if it is new.
+
+    The first call for a table loads all of it, so looking up a known name
+    costs no query. A new name is inserted and committed straight away, so an
+    id in the cache always refers to a stored row even if the article write
+    that needed it is rolled back; call this before writing anything else in
+    the transaction.
+
+    Args:
+        connection: Open MySQL connection
+        table (str): Dimension table, e.g. 'authors'
+        name (str): Name to look up; empty names have no id
+        create (bool): Insert the name if it is not stored yet
+
+    Returns:
+        int: Id of the name, or None for an empty or (with ``create=False``) unknown name
+    """
+    if not name:
+        return None
+    if table not in _dimension_ids:
+        _load_dimension(connection, table)
+    row_id = _dimension_ids[table].get(name)
+    if row_id is not None:
+        return row_id
+
+    cursor = connection.cursor()
+    if create:
+        # Returns the existing id if another process (or another spelling under
+        # the case-insensitive collation) got there first
+        cursor.execute(
+            f"INSERT INTO {table} (name) VALUES (%s) ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)",
+            (name,)
+        )
+        row_id = cursor.lastrowid
+        connection.commit()
+    else:
+        cursor.execute(f"SELECT id FROM {table} WHERE name = %s", (name,))
+        row = cursor.fetchone()
+        row_id = row[0] if row else None
+    cursor.close()
+
+    if row_id is not None:
+        _dimension_ids[table][name] = row_id
+        _dimension_names[table].setdefault(row_id, name)
+    return row_id
+
+
+def get_dimension_name(connection, table, row_id):
+    """
+    Get the name stored under an id of a dimension table.
+
+    Args:
+        connection: Open MySQL connection
+        table (str): Dimension table, e.g. 'authors'
+        row_id (int): Id to look up
+
+    Returns:
+        str: Name, or None if ``row_id`` is None or unknown
+    """
+    if row_id is None:
+        return None
+    if table not in _dimension_names:
+        _load_dimension(connection, table)
+    name = _dimension_names[table].get(row_id)
+    if name is None:
+        # Added by another process since the table was loaded
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT name FROM {table} WHERE id = %s", (row_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        if row:
+            name = row[0]
+            _dimension_names[table][row_id] = name
+            _dimension_ids[table].setdefault(name, row_id)
+    return name
+
+
+def article_dimension_ids(connection, author, category):
+    """
+    Ids for an article's author and category, as stored in the article tables.
+
+    Args:
+        connection: Open MySQL connection
+        author (str): Author name, or None
+        category (str): Category name, or None
+
+    Returns:
+        tuple: Values for the ``author_id`` and ``category_id`` columns
+    """
+    return (get_dimension_id(connection, DIMENSIONS['author'][1], author),
+            get_dimension_id(connection, DIMENSIONS['category'][1], category))
+
+
+def dimension_select(fields):
+    """Article table columns to select for the given fields, with id columns in place of dimension fields."""
+    return [DIMENSIONS[field][0] if field in DIMENSIONS else field for field in fields]
+
+
+def resolve_dimensions(connection, row):
+    """Replace the dimension id columns of a selected row dict with the names they stand for."""
+    for field, (id_column, table) in DIMENSIONS.items():
+        if id_column in row:
+            row[field] = get_dimension_name(connection, table, row.pop(id_column))
+    return row
+
+
+def bump_revision(cursor, source):
+    """
+    Record that a batch job changed a source's stored articles.
+
+    Scrapers and ingest already move ``articles_added`` and
+    ``articles_updated``; jobs that rewrite articles in place (sentiment
+    scores, recleaning, compression) bump ``revision`` instead, in the same
+    transaction as their changes, so the read API drops its cached pages.
+
+    Args:
+        cursor: Cursor of the transaction making the changes
+        source (str): News source name
+    """
+    cursor.execute(
+        "INSERT INTO scraper_metadata (source, revision) VALUES (%s, 1) "
+        "ON DUPLICATE KEY UPDATE revision = revision + 1",
+        (source,)
+    )
+
+
+ARTICLE_COLUMNS = [
+    'url', 'title', 'publication_date', 'author', 'content',
+    'category', 'created_at', 'last_updated', 'sentiment_score'
+]
+
+
+def fetch_article(connection, source, url):
+    """
+    Read one stored article by URL.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        url (str): Article URL
+
+    Returns:
+        dict: Article columns with plain ``content`` and author and category names,
+        or None if not found
+    """
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        f"SELECT {', '.join(dimension_select(ARTICLE_COLUMNS))}, content_compressed "
+        f"FROM {source}_articles WHERE url = %s",
+        (url,)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    if not row:
+        return None
+
+    row['content'] = decode_content(connection, source, row['content'], row.pop('content_compressed'))
+    return resolve_dimensions(connection, row)
+
+
+def iter_article_rows(connection, table_name, columns, where=None, params=(), chunk_size=500,
+                      start_after=0, decode=True):
+    """
+    Yield chunks of rows from an article table in primary-key order.
+
+    Args:
+        connection: Open MySQL connection
+        table_name (str): Article table to read
+        columns (list): Columns to select; ``id`` is always selected first
+        where (str): Extra SQL condition, e.g. ``"sentiment_score IS NULL"`` (optional)
+        params (tuple): Parameters for placeholders in ``where``
+        chunk_size (int): Maximum rows per chunk
+        start_after (int): Only return rows with an id above this value
+        decode (bool): Return decompressed bodies in place of ``content``
+
+    Yields:
+        list: Row tuples ``(id, *columns)``
+    """
+    columns = list(columns)
+    decode = decode and 'content' in columns
+    source = table_name[:-len('_articles')]
+    column_sql = ', '.join(['id'] + columns + (['content_compressed'] if decode else []))
+    condition = "id > %s" + (f" AND ({where})" if where else "")
+    query = f"SELECT {column_sql} FROM {table_name} WHERE {condition} ORDER BY id LIMIT %s"
+
+    last_id = start_after
+    while True:
+        cursor = connection.cursor()
+        cursor.execute(query, (last_id, *params, chunk_size))
+        rows = cursor.fetchall()
+        cursor.close()
+        if not rows:
+            break
+
+        if decode:
+            content_index = columns.index('content') + 1
+            rows = [
+                row[:content_index]
+                + (decode_content(connection, source, row[content_index], row[-1]),)
+                + row[content_index + 1:-1]
+                for row in rows
+            ]
+
+        yield rows
+
+        last_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            break
+
+
+def update_content_batch(connection, table_name, contents):
+    """
+    Rewrite the bodies of many articles, compressing them if enabled.
+
+    Args:
+        connection: Open MySQL connection
+        table_name (str): Article table to update
+        contents (dict): New plain content for each row id
+
+    Returns:
+        int: Number of rows changed
+    """
+    source = table_name[:-len('_articles')]
+    texts = {}
+    blobs = {}
+    for row_id, content in contents.items():
+        texts[row_id], blobs[row_id] = encode_content(connection, source, content)
+    changed = update_column_batch(connection, table_name, 'content', texts)
+    return max(changed, update_column_batch(connection, table_name, 'content_compressed', blobs))
+
+
+def update_column_batch(connection, table_name, column, values_by_id):
+    """
+    Set one column on many rows with a single UPDATE statement.
+
+    Args:
+        connection: Open MySQL connection
+        table_name (str): Article table to update
+        column (str): Column to set
+        values_by_id (dict): New value for each row id
+
+    Returns:
+        int: Number of rows changed
+    """
+    if not values_by_id:
+        return 0
+
+    ids = list(values_by_id)
+    cases = ' '.join(['WHEN %s THEN %s'] * len(ids))
+    placeholders = ', '.join(['%s'] * len(ids))
+    query = f"UPDATE {table_name} SET {column} = CASE id {cases} END WHERE id IN ({placeholders})"
+
+    params = []
+    for row_id in ids:
+        params.extend((row_id, values_by_id[row_id]))
+    params.extend(ids)
+
+    cursor = connection.cursor()
+    cursor.execute(query, params)
+    changed = cursor.rowcount
+    cursor.close()
+    return changed
@@ -0,0 +1,121 @@
+"""
+Re-clean stored article content with the boilerplate paragraph filter.
+
+The first pass counts paragraphs over every stored article of a source, the
+second rewrites rows whose content loses boilerplate paragraphs. The counts
+learned here become the source's filter state for future scrapes.
+
+Usage:
+    python -m database.reclean [--sources star tuko] [--threshold 5] [--dry-run]
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import NEWS_SOURCES, BOILERPLATE_SETTINGS
+from database.operations import bump_revision, iter_article_rows, update_content_batch
+from utils.text_cleaner import BoilerplateFilter
+
+
+def split_paragraphs(content):
+    """Split stored content back into its paragraphs."""
+    return [p for p in content.split('\n\n') if p.strip()]
+
+
+def reclean_source(connection, source, threshold=None, chunk_size=500, dry_run=False):
+    """
+    Remove boilerplate paragraphs from all stored articles of one source.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        threshold (int): Article count above which a paragraph is boilerplate (optional)
+        chunk_size (int): Rows read and updated per batch
+        dry_run (bool): Report what would change without writing
+
+    Returns:
+        dict: Rows scanned, rows changed and content bytes before and after
+    """
+    table_name = f"{source}_articles"
+    boilerplate_filter = BoilerplateFilter(
+        source,
+        threshold=threshold or BOILERPLATE_SETTINGS['threshold'],
+        width=BOILERPLATE_SETTINGS['width'],
+        depth=BOILERPLATE_SETTINGS['depth']
+    )
+
+    # Pass 1: learn paragraph frequencies from the whole stored corpus
+    for rows in iter_article_rows(connection, table_name, ['content'], chunk_size=chunk_size):
+        for _, content in rows:
+            boilerplate_filter.learn(split_paragraphs(content or ''))
+
+    # Pass 2: drop paragraphs above the threshold and write back changed rows
+    stats = {'rows': 0, 'changed': 0, 'bytes_before': 0, 'bytes_after': 0}
+    for rows in iter_article_rows(connection, table_name, ['content'], chunk_size=chunk_size):
+        updates = {}
+        for row_id, content in rows:
+            content = content or ''
+            paragraphs = split_paragraphs(content)
+            cleaned = '\n\n'.join(boilerplate_filter.filter(paragraphs, learn=False)) if paragraphs else content
+
+            stats['rows'] += 1
+            stats['bytes_before'] += len(content.encode('utf-8'))
+            stats['bytes_after'] += len(cleaned.encode('utf-8'))
+            if cleaned != content:
+                updates[row_id] = cleaned
+
+        stats['changed'] += len(updates)
+        if updates and not dry_run:
+            update_content_batch(connection, table_name, updates)
+            cursor = connection.cursor()
+            bump_revision(cursor, source)
+            cursor.close()
+            connection.commit()
+
+    if not dry_run:
+        boilerplate_filter.save(os.path.join(BOILERPLATE_SETTINGS['state_dir'], f"{source}.cms"))
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strip boilerplate paragraphs from stored articles')
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, help='Sources to re-clean')
+    parser.add_argument('--threshold', type=int, help='Article count above which a paragraph is dropped')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Rows per batch')
+    parser.add_argument('--dry-run', action='store_true', help='Report savings without writing')
+    args = parser.parse_args()
+
+    connection = get_connection()
+    if not connection:
+        logging.error("Failed to connect to database. Cannot re-clean articles.")
+        return False
+
+    try:
+        for source in args.sources:
+            stats = reclean_source(connection, source, args.threshold, args.chunk_size, args.dry_run)
+            saved = stats['bytes_before'] - stats['bytes_after']
+            logging.info(
+                f"{source}: {stats['changed']}/{stats['rows']} rows changed, "
+                f"{stats['bytes_before']} -> {stats['bytes_after']} bytes ({saved} saved)"
+            )
+    except Exception as e:
+        connection.rollback()
+        logging.error(f"Error re-cleaning articles: {e}")
+        return False
+    finally:
+        connection.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,238 @@
+"""
+Rollup tables for dashboards in the Kenya news scraping project.
+
+``article_daily_counts`` holds the number of articles and the sum and count of
+sentiment scores per source, category and day (publication date, or the day
+the article was stored if it has none); the ``article_daily_stats`` view adds
+the average sentiment. ``article_author_counts`` holds articles per source and
+author. Dashboards read these instead of scanning the article tables.
+
+The rollups are kept current as articles change: every change is applied as
+a signed delta computed from the article rows themselves, inside the same
+transaction as the change. ``rebuild`` recomputes them from scratch, e.g.
+for articles stored before the rollups existed.
+
+Usage:
+    python -m database.rollups rebuild [--sources star tuko]
+    python -m database.rollups daily [--sources star] [--days 30]
+    python -m database.rollups authors [--sources star] [--limit 20]
+"""
+import os
+import sys
+import argparse
+import logging
+from datetime import date, timedelta
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import NEWS_SOURCES, ROLLUP_SETTINGS
+
+
+# Rollup keys; articles are grouped by category and author id, and articles
+# without one are counted under ''. The groups' names are looked up afterwards,
+# once per group. (The outer ``WHERE 1 = 1`` lets SQLite, used by load tests,
+# tell the upsert clause from a join constraint.)
+DAY_KEY = "DATE(COALESCE(publication_date, created_at))"
+CATEGORY_NAME = "COALESCE((SELECT name FROM categories WHERE categories.id = g.category_id), '')"
+AUTHOR_NAME = "COALESCE((SELECT name FROM authors WHERE authors.id = g.author_id), '')"
+
+
+def rollups_enabled():
+    """Whether article writes maintain the rollup tables."""
+    return ROLLUP_SETTINGS.get('enabled', False)
+
+
+def apply_articles(cursor, source, where, params=(), sign=1):
+    """
+    Add (or with ``sign=-1`` remove) matching articles to the rollups.
+
+    Call with ``sign=-1`` before changing or deleting articles and with
+    ``sign=1`` after inserting or changing them, in the same transaction.
+
+    Args:
+        cursor: Cursor of the transaction changing the articles
+        source (str): News source name
+        where (str): SQL condition selecting the articles, e.g. ``"url = %s"``
+        params (tuple): Parameters of the condition
+        sign (int): 1 to add the articles, -1 to remove them
+    """
+    table_name = f"{source}_articles"
+    cursor.execute(
+        f"""
+        INSERT INTO article_daily_counts (source, category, day, articles, sentiment_sum, sentiment_count)
+        SELECT %s, {CATEGORY_NAME}, g.day_key, %s * g.n, %s * g.score_sum, %s * g.scored
+        FROM (
+            SELECT category_id, {DAY_KEY} AS day_key, COUNT(*) AS n,
+                   COALESCE(SUM(sentiment_score), 0) AS score_sum, COUNT(sentiment_score) AS scored
+            FROM {table_name} WHERE {where}
+            GROUP BY category_id, {DAY_KEY}
+        ) g WHERE 1 = 1
+        ON DUPLICATE KEY UPDATE
+            articles = articles + VALUES(articles),
+            sentiment_sum = sentiment_sum + VALUES(sentiment_sum),
+            sentiment_count = sentiment_count + VALUES(sentiment_count)
+        """,
+        (source, sign, sign, sign, *params)
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO article_author_counts (source, author, articles)
+        SELECT %s, {AUTHOR_NAME}, %s * g.n
+        FROM (
+            SELECT author_id, COUNT(*) AS n
+            FROM {table_name} WHERE {where}
+            GROUP BY author_id
+        ) g WHERE 1 = 1
+        ON DUPLICATE KEY UPDATE articles = articles + VALUES(articles)
+        """,
+        (source, sign, *params)
+    )
+
+
+def apply_sentiment(cursor, source, ids):
+    """
+    Add newly written sentiment scores to the rollups.
+
+    Args:
+        cursor: Cursor of the transaction that set the scores
+        source (str): News source name
+        ids (list): Ids of articles that had no score before
+    """
+    if not ids:
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f"""
+        INSERT INTO article_daily_counts (source, category, day, articles, sentiment_sum, sentiment_count)
+        SELECT %s, {CATEGORY_NAME}, g.day_key, 0, g.score_sum, g.scored
+        FROM (
+            SELECT category_id, {DAY_KEY} AS day_key, SUM(sentiment_score) AS score_sum,
+                   COUNT(sentiment_score) AS scored
+            FROM {source}_articles WHERE id IN ({placeholders}) AND sentiment_score IS NOT NULL
+            GROUP BY category_id, {DAY_KEY}
+        ) g WHERE 1 = 1
+        ON DUPLICATE KEY UPDATE
+            sentiment_sum = sentiment_sum + VALUES(sentiment_sum),
+            sentiment_count = sentiment_count + VALUES(sentiment_count)
+        """,
+        (source, *ids)
+    )
+
+
+def rebuild(connection, source):
+    """
+    Recompute a source's rollups from its article table in one transaction.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM article_daily_counts WHERE source = %s", (source,))
+        cursor.execute("DELETE FROM article_author_counts WHERE source = %s", (source,))
+        apply_articles(cursor, source, "1 = 1")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def daily_stats(connection, sources, since):
+    """
+    Articles and average sentiment per source, category and day.
+
+    Args:
+        connection: Open MySQL connection
+        sources (list): Sources to include
+        since (date): First day to include
+
+    Returns:
+        list: Row dicts ordered by day, source and category
+    """
+    placeholders = ', '.join(['%s'] * len(sources))
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        f"""
+        SELECT source, category, day, articles, avg_sentiment FROM article_daily_stats
+        WHERE source IN ({placeholders}) AND day >= %s AND articles > 0
+        ORDER BY day, source, category
+        """,
+        (*sources, since)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def top_authors(connection, sources, limit=20):
+    """
+    Authors with the most articles.
+
+    Args:
+        connection: Open MySQL connection
+        sources (list): Sources to include
+        limit (int): Number of authors to return
+
+    Returns:
+        list: Row dicts with source, author and articles
+    """
+    placeholders = ', '.join(['%s'] * len(sources))
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        f"""
+        SELECT source, author, articles FROM article_author_counts
+        WHERE source IN ({placeholders}) AND author != '' AND articles > 0
+        ORDER BY articles DESC LIMIT %s
+        """,
+        (*sources, limit)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain and query the dashboard rollup tables')
+    parser.add_argument('command', choices=['rebuild', 'daily', 'authors'])
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, help='Sources to include')
+    parser.add_argument('--days', type=int, default=30, help='Days of daily stats to show')
+    parser.add_argument('--limit', type=int, default=20, help='Number of authors to show')
+    args = parser.parse_args()
+
+    connection = get_connection()
+    if not connection:
+        logging.error("Failed to connect to database. Cannot use rollups.")
+        return False
+
+    try:
+        if args.command == 'rebuild':
+            for source in args.sources:
+                rebuild(connection, source)
+                logging.info(f"Rebuilt rollups for {source}")
+        elif args.command == 'daily':
+            since = date.today() - timedelta(days=args.days)
+            for row in daily_stats(connection, args.sources, since):
+                sentiment = f"{row['avg_sentiment']:.3f}" if row['avg_sentiment'] is not None else '-'
+                print(f"{row['day']}  {row['source']:<14} {row['category'] or '-':<20} {row['articles']:>5}  {sentiment}")
+        else:
+            for row in top_authors(connection, args.sources, args.limit):
+                print(f"{row['source']:<14} {row['author']:<40} {row['articles']:>5}")
+    except Exception as e:
+        logging.error(f"Error in rollup {args.command}: {e}")
+        return False
+    finally:
+        connection.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,29 @@
+"""
+Post-scrape enrichment stages: sentiment scoring and entity tagging.
+"""
+
+
+def bounded_map(executor, fn, iterable, max_pending):
+    """
+    Map ``fn`` over ``iterable`` in an executor with a bounded number of pending calls.
+
+    Results come back in input order; no more than ``max_pending`` calls are
+    submitted ahead of the result being waited for, so large inputs are not
+    queued all at once.
+
+    Args:
+        executor (concurrent.futures.Executor): Executor to run the calls in
+        fn (callable): Function to apply
+        iterable (iterable): Inputs, consumed lazily
+        max_pending (int): Most calls submitted but not yet returned
+
+    Yields:
+        Result of each call, in input order
+    """
+    pending = []
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
@@ -0,0 +1,380 @@
+"""
+Gazetteer-based entity tagging for stored articles.
+
+Tags articles with the counties, politicians, parties and companies they
+mention. The gazetteers under ``enrichment/gazetteers`` are compiled into one
+Aho-Corasick automaton over word tokens, so each article's title and body are
+scanned in a single pass however many names the gazetteers hold. Overlapping
+matches resolve to the leftmost, then longest name ("Jubilee Insurance" over
+"Jubilee").
+
+Articles saved since the last run are read in keyset-paginated chunks past a
+per-source watermark in ``enrichment_progress``, tagged in a process pool and
+written to ``article_entities`` with batched inserts. After editing a
+gazetteer, ``--retag`` tags every stored article again.
+
+Usage:
+    python -m enrichment.entities [--sources star tuko] [--workers 4] [--retag]
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import ENTITY_SETTINGS, NEWS_SOURCES
+from database.operations import iter_article_rows
+from enrichment import bounded_map
+
+
+GAZETTEER_DIR = os.path.join(current_dir, 'gazetteers')
+
+# Gazetteer file for each entity type
+GAZETTEER_FILES = {
+    'county': 'counties.txt',
+    'politician': 'politicians.txt',
+    'party': 'parties.txt',
+    'company': 'companies.txt',
+}
+
+STAGE = 'entities'
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+# Token that separates the title from the body; never part of a name
+_TITLE_END = '\n'
+
+_automaton = None
+
+
+def tokenize(text):
+    """
+    Split text into lower-case word tokens, as names and articles are matched.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: Tokens; punctuation such as the hyphen in "Taita-Taveta" separates tokens
+    """
+    return _TOKEN_RE.findall(text.lower().replace('’', "'")) if text else []
+
+
+def load_gazetteer(gazetteer_dir=GAZETTEER_DIR):
+    """
+    Load the names and aliases of every entity from the gazetteer files.
+
+    Each line holds a canonical name, optionally followed by a tab and
+    aliases separated by ``|``.
+
+    Args:
+        gazetteer_dir (str): Directory holding the gazetteer files
+
+    Returns:
+        list: ``(name or alias, canonical name, entity type)`` tuples
+    """
+    entries = []
+    for entity_type, filename in GAZETTEER_FILES.items():
+        with open(os.path.join(gazetteer_dir, filename), encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                name, _, aliases = line.partition('\t')
+                for term in [name] + [alias for alias in aliases.split('|') if alias]:
+                    entries.append((term.strip(), name, entity_type))
+    return entries
+
+
+class EntityAutomaton:
+    """Aho-Corasick automaton whose alphabet is word tokens."""
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries (list): ``(term, canonical name, entity type)`` tuples, as
+                returned by ``load_gazetteer``
+        """
+        self.entities = []
+        entity_ids = {}
+        self.goto = [{}]
+        self.output = [()]
+        # Terms are matched on tokens, so "Murang'a" and "MURANG'A" share a path
+        for term, name, entity_type in entries:
+            tokens = tokenize(term)
+            if not tokens:
+                continue
+            key = (name, entity_type)
+            if key not in entity_ids:
+                entity_ids[key] = len(self.entities)
+                self.entities.append(key)
+
+            state = 0
+            for token in tokens:
+                next_state = self.goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][token] = next_state
+                    self.goto.append({})
+                    self.output.append(())
+                state = next_state
+            match = (len(tokens), entity_ids[key])
+            if match not in self.output[state]:
+                self.output[state] += (match,)
+
+        self.vocabulary = frozenset(token for edges in self.goto for token in edges)
+        self.fail = [0] * len(self.goto)
+        self._link_failures()
+
+    def _link_failures(self):
+        # Breadth-first, so a state's failure target is final before its children need it
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] += self.output[self.fail[child]]
+
+    def find(self, tokens):
+        """
+        Find every gazetteer term in a token sequence, overlapping ones included.
+
+        Args:
+            tokens (list): Tokens from ``tokenize``
+
+        Returns:
+            list: ``(start index, token count, entity id)`` tuples
+        """
+        goto, fail, output, vocabulary = self.goto, self.fail, self.output, self.vocabulary
+        matches = []
+        state = 0
+        for i, token in enumerate(tokens):
+            if token not in vocabulary:
+                # No term contains this token, so every partial match ends here
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, entity_id in output[state]:
+                matches.append((i - length + 1, length, entity_id))
+        return matches
+
+    def tag(self, title, content):
+        """
+        Tag one article, scanning its title and body in one pass.
+
+        Args:
+            title (str): Article title
+            content (str): Article body
+
+        Returns:
+            dict: ``(name, entity type)`` to ``(mentions, in_title)``
+        """
+        title_tokens = tokenize(title)
+        title_end = len(title_tokens)
+        matches = self.find(title_tokens + [_TITLE_END] + tokenize(content))
+
+        # Keep the leftmost, then longest, of overlapping matches
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        tags = {}
+        covered = 0
+        for start, length, entity_id in matches:
+            if start < covered:
+                continue
+            covered = start + length
+            mentions, in_title = tags.get(entity_id, (0, False))
+            tags[entity_id] = (mentions + 1, in_title or start < title_end)
+        return {self.entities[entity_id]: tag for entity_id, tag in tags.items()}
+
+
+def get_automaton():
+    """Return the automaton of the bundled gazetteers, compiling it once per process."""
+    global _automaton
+    if _automaton is None:
+        _automaton = EntityAutomaton(load_gazetteer())
+    return _automaton
+
+
+def _tag_chunk(rows):
+    # rows are (id, title, content); returns the last id, the row count and the entity rows
+    automaton = get_automaton()
+    tagged = []
+    for article_id, title, content in rows:
+        for (name, entity_type), (mentions, in_title) in automaton.tag(title, content).items():
+            tagged.append((article_id, name, entity_type, mentions, int(in_title)))
+    return rows[-1][0], len(rows), tagged
+
+
+def get_watermark(connection, source):
+    """
+    Read the id of the last article tagged for a source.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+
+    Returns:
+        int: Article id, or 0 if nothing was tagged yet
+    """
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT last_id FROM enrichment_progress WHERE stage = %s AND source = %s",
+        (STAGE, source)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else 0
+
+
+def _set_watermark(cursor, source, last_id):
+    cursor.execute(
+        "INSERT INTO enrichment_progress (stage, source, last_id) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)",
+        (STAGE, source, last_id)
+    )
+
+
+def clear_entities(connection, source):
+    """
+    Delete a source's entity tags and reset its watermark, so the next run tags every article.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+    """
+    cursor = connection.cursor()
+    cursor.execute("DELETE FROM article_entities WHERE source = %s", (source,))
+    cursor.execute("DELETE FROM enrichment_progress WHERE stage = %s AND source = %s", (STAGE, source))
+    connection.commit()
+    cursor.close()
+
+
+def write_entities(cursor, source, tagged, batch_size=None):
+    """
+    Insert entity rows in batches.
+
+    Args:
+        cursor: Database cursor
+        source (str): News source name
+        tagged (list): ``(article_id, entity, entity_type, mentions, in_title)`` tuples
+        batch_size (int): Rows per INSERT (defaults to ENTITY_SETTINGS)
+    """
+    batch_size = batch_size or ENTITY_SETTINGS['insert_batch']
+    query = (
+        "INSERT INTO article_entities (source, article_id, entity, entity_type, mentions, in_title) "
+        "VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE mentions = VALUES(mentions), in_title = VALUES(in_title)"
+    )
+    for start in range(0, len(tagged), batch_size):
+        cursor.executemany(query, [(source,) + row for row in tagged[start:start + batch_size]])
+
+
+def tag_source(connection, source, executor=None, max_pending=2, chunk_size=None):
+    """
+    Tag every article of a source saved since the last run.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        executor (concurrent.futures.Executor): Pool to tag chunks in; chunks
+            are tagged in-process when omitted
+        max_pending (int): Chunks submitted to the pool ahead of the writer
+        chunk_size (int): Rows read and tagged per batch
+
+    Returns:
+        tuple: (articles tagged, entity rows written)
+    """
+    chunk_size = chunk_size or ENTITY_SETTINGS['chunk_size']
+    chunks = iter_article_rows(connection, f"{source}_articles", ['title', 'content'],
+                               chunk_size=chunk_size, start_after=get_watermark(connection, source))
+
+    if executor is None:
+        results = map(_tag_chunk, chunks)
+    else:
+        # Keep a bounded number of chunks in flight so memory stays flat
+        results = bounded_map(executor, _tag_chunk, chunks, max_pending)
+
+    articles = 0
+    written = 0
+    for last_id, count, tagged in results:
+        # Tags and the watermark move together, so a failed run resumes where it stopped
+        cursor = connection.cursor()
+        write_entities(cursor, source, tagged)
+        _set_watermark(cursor, source, last_id)
+        connection.commit()
+        cursor.close()
+        articles += count
+        written += len(tagged)
+    return articles, written
+
+
+def tag_pending_articles(sources=None, workers=None, logger=None, retag=False):
+    """
+    Tag articles saved since the last run; safe to run after every scrape.
+
+    Args:
+        sources (list): Sources to tag (defaults to all)
+        workers (int): Worker processes (defaults to ENTITY_SETTINGS, then the CPU count)
+        logger (logging.Logger): Logger for progress messages (optional)
+        retag (bool): Drop existing tags and tag every stored article
+
+    Returns:
+        bool: True if tagging finished without errors
+    """
+    logger = logger or logging.getLogger(__name__)
+    sources = sources or NEWS_SOURCES
+    workers = workers or ENTITY_SETTINGS.get('workers') or os.cpu_count() or 1
+
+    connection = get_connection()
+    if not connection:
+        logger.error("Failed to connect to database. Cannot tag entities.")
+        return False
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for source in sources:
+            if retag:
+                clear_entities(connection, source)
+            start = time.perf_counter()
+            tagged, written = tag_source(connection, source, executor, max_pending=workers * 2)
+            elapsed = time.perf_counter() - start
+            rate = tagged / elapsed if elapsed > 0 else 0
+            logger.info(f"Entities tagged for {tagged} {source} articles ({written} tags) "
+                        f"in {elapsed:.2f}s ({rate:.0f} rows/s)")
+        return True
+    except Exception as e:
+        connection.rollback()
+        logger.error(f"Error tagging entities: {e}")
+        return False
+    finally:
+        if executor:
+            executor.shutdown()
+        connection.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Tag stored articles with gazetteer entities')
+    parser.add_argument('--sources', nargs='+', help='Sources to tag (default: all)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--retag', action='store_true',
+                        help='Drop existing tags and tag every stored article, e.g. after editing a gazetteer')
+    args = parser.parse_args()
+
+    sys.exit(0 if tag_pending_articles(args.sources, args.workers, retag=args.retag) else 1)
@@ -0,0 +1,213 @@
+"""
+Lexicon-based sentiment scoring for stored articles.
+
+Fills the ``sentiment_score`` column of the article tables. Rows still
+missing a score are read in keyset-paginated chunks, scored in a process
+pool with the English and Swahili/Sheng lexicons under ``enrichment/lexicons``,
+and written back with one UPDATE per chunk.
+
+Usage:
+    python -m enrichment.sentiment [--sources star tuko] [--workers 4]
+"""
+import argparse
+import logging
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import NEWS_SOURCES, SENTIMENT_SETTINGS
+from database.operations import bump_revision, iter_article_rows, update_column_batch
+from database.rollups import apply_sentiment, rollups_enabled
+from enrichment import bounded_map
+
+
+LEXICON_DIR = os.path.join(current_dir, 'lexicons')
+LEXICON_FILES = ('english.txt', 'swahili.txt')
+
+# Tokens that flip the polarity of the word that follows them
+NEGATORS = frozenset(['not', 'no', 'never', 'without', 'nor', 'si', 'sio', 'siyo', 'hakuna', 'bila', 'hapana'])
+
+# Normalization constant that maps raw lexicon sums onto (-1, 1)
+ALPHA = 15
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+_lexicon = None
+
+
+def load_lexicon(lexicon_dir=LEXICON_DIR):
+    """
+    Load and merge the word scores from the lexicon files.
+
+    Args:
+        lexicon_dir (str): Directory holding the lexicon files
+
+    Returns:
+        dict: Word to score mapping
+    """
+    lexicon = {}
+    for filename in LEXICON_FILES:
+        with open(os.path.join(lexicon_dir, filename), encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                word, score = line.split('\t')
+                lexicon[word] = float(score)
+    return lexicon
+
+
+def get_lexicon():
+    """Return the lexicon, loading it once per process."""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = load_lexicon()
+    return _lexicon
+
+
+def score_text(text, lexicon=None):
+    """
+    Score the sentiment of one text.
+
+    Args:
+        text (str): Article text
+        lexicon (dict): Word scores (defaults to the bundled lexicons)
+
+    Returns:
+        float: Score between -1 (negative) and 1 (positive); 0.0 for neutral or empty text
+    """
+    lexicon = lexicon or get_lexicon()
+    tokens = _TOKEN_RE.findall(text.lower()) if text else []
+    if not tokens:
+        return 0.0
+
+    lookup = lexicon.get
+    total = 0.0
+    negate = False
+    for token in tokens:
+        score = lookup(token)
+        if score:
+            total += -score if negate else score
+        negate = token in NEGATORS or token.endswith("n't")
+
+    return total / math.sqrt(total * total + ALPHA)
+
+
+def score_batch(texts):
+    """
+    Score a batch of texts. Runs inside pool workers.
+
+    Args:
+        texts (list): Article texts
+
+    Returns:
+        list: One score per text
+    """
+    lexicon = get_lexicon()
+    return [round(score_text(text, lexicon), 4) for text in texts]
+
+
+def _score_chunk(rows):
+    # rows are (id, title, content); title and body are scored together
+    ids = [row[0] for row in rows]
+    scores = score_batch([f"{row[1] or ''}\n{row[2] or ''}" for row in rows])
+    return dict(zip(ids, scores))
+
+
+def score_source(connection, source, executor=None, max_pending=2, chunk_size=None):
+    """
+    Score every article of a source that has no sentiment score yet.
+
+    Args:
+        connection: Open MySQL connection
+        source (str): News source name
+        executor (concurrent.futures.Executor): Pool to score chunks in; chunks
+            are scored in-process when omitted
+        max_pending (int): Chunks submitted to the pool ahead of the writer
+        chunk_size (int): Rows read, scored and updated per batch
+
+    Returns:
+        int: Number of articles scored
+    """
+    table_name = f"{source}_articles"
+    chunk_size = chunk_size or SENTIMENT_SETTINGS['chunk_size']
+    chunks = iter_article_rows(connection, table_name, ['title', 'content'],
+                               where="sentiment_score IS NULL", chunk_size=chunk_size)
+
+    if executor is None:
+        results = map(_score_chunk, chunks)
+    else:
+        # Keep a bounded number of chunks in flight so memory stays flat
+        results = bounded_map(executor, _score_chunk, chunks, max_pending)
+
+    scored = 0
+    for scores in results:
+        update_column_batch(connection, table_name, 'sentiment_score', scores)
+        cursor = connection.cursor()
+        if rollups_enabled():
+            apply_sentiment(cursor, source, list(scores))
+        bump_revision(cursor, source)
+        cursor.close()
+        connection.commit()
+        scored += len(scores)
+    return scored
+
+
+def score_pending_articles(sources=None, workers=None, logger=None):
+    """
+    Score unscored articles of the given sources; safe to run after every scrape.
+
+    Args:
+        sources (list): Sources to score (defaults to all)
+        workers (int): Worker processes (defaults to SENTIMENT_SETTINGS, then the CPU count)
+        logger (logging.Logger): Logger for progress messages (optional)
+
+    Returns:
+        bool: True if scoring finished without errors
+    """
+    logger = logger or logging.getLogger(__name__)
+    sources = sources or NEWS_SOURCES
+    workers = workers or SENTIMENT_SETTINGS.get('workers') or os.cpu_count() or 1
+
+    connection = get_connection()
+    if not connection:
+        logger.error("Failed to connect to database. Cannot score sentiment.")
+        return False
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for source in sources:
+            start = time.perf_counter()
+            scored = score_source(connection, source, executor, max_pending=workers * 2)
+            elapsed = time.perf_counter() - start
+            rate = scored / elapsed if elapsed > 0 else 0
+            logger.info(f"Sentiment scored for {scored} {source} articles in {elapsed:.2f}s ({rate:.0f} rows/s)")
+        return True
+    except Exception as e:
+        connection.rollback()
+        logger.error(f"Error scoring sentiment: {e}")
+        return False
+    finally:
+        if executor:
+            executor.shutdown()
+        connection.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Score sentiment for stored articles')
+    parser.add_argument('--sources', nargs='+', help='Sources to score (default: all)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    sys.exit(0 if score_pending_articles(args.sources, args.workers) else 1)
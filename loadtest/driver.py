@@ -0,0 +1,51 @@
+"""
+Browserless stand-in for the Selenium WebDriver in load tests.
+
+``HttpDriver`` loads pages over plain HTTP and exposes them the way the
+scrapers read them from Firefox (``get`` then ``page_source``). Runs with it
+measure the scraper, parser and database without the browser; HTTP error
+pages are returned as the browser would show them, and network failures are
+raised as the Selenium exceptions Firefox would raise.
+"""
+import socket
+import urllib.error
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from utils.http import fetch_url
+
+
+class HttpDriver:
+    """The part of the WebDriver interface the scrapers use, over urllib."""
+
+    def __init__(self):
+        self.page_source = ''
+        self.current_url = None
+        self.capabilities = {}
+        self.timeout = 30
+        self.bytes_transferred = 0
+
+    def set_page_load_timeout(self, seconds):
+        self.timeout = seconds
+
+    def get(self, url):
+        try:
+            html, transferred = fetch_url(url, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            # A browser renders error pages like any other page
+            body = e.read()
+            html, transferred = body.decode('utf-8', errors='replace'), len(body)
+        except (urllib.error.URLError, OSError) as e:
+            if isinstance(e, socket.timeout) or isinstance(getattr(e, 'reason', None), socket.timeout):
+                raise TimeoutException(f"Timed out loading {url}: {e}")
+            raise WebDriverException(f"Reached error page: {url}: {e}")
+        self.current_url = url
+        self.page_source = html
+        self.bytes_transferred += transferred
+
+    def execute_script(self, script, *args):
+        # No Resource Timing API without a browser; page weight is not recorded
+        return None
+
+    def quit(self):
+        self.page_source = ''
@@ -0,0 +1,178 @@
+"""
+Embedded SQLite database standing in for MySQL in load tests.
+
+``EmbeddedConnection`` offers the part of the mysql-connector interface the
+scrapers use (``cursor(dictionary=True)``, ``%s`` placeholders, ``commit``,
+``is_connected``...) and translates the MySQL-only syntax they send, such as
+``NOW()``, ``ON DUPLICATE KEY UPDATE`` and ``LAST_INSERT_ID(expr)``. Timings are indicative of the
+scrapers' database work, not of a MySQL server's.
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+
+from config.settings import NEWS_SOURCES
+
+
+ARTICLE_TABLE = """
+CREATE TABLE IF NOT EXISTS {source}_articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    publication_date TEXT,
+    author_id INTEGER,
+    content TEXT NOT NULL,
+    content_compressed BLOB NULL,
+    category_id INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
+    sentiment_score REAL DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_{source}_publication_date ON {source}_articles (publication_date);
+CREATE INDEX IF NOT EXISTS idx_{source}_category_id ON {source}_articles (category_id);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS scraper_metadata (
+    source TEXT PRIMARY KEY,
+    last_scrape_time TEXT DEFAULT CURRENT_TIMESTAMP,
+    articles_added INTEGER DEFAULT 0,
+    articles_updated INTEGER DEFAULT 0,
+    last_status TEXT DEFAULT 'success',
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS compression_dictionaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS article_daily_counts (
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    day TEXT NOT NULL,
+    articles INTEGER NOT NULL DEFAULT 0,
+    sentiment_sum REAL NOT NULL DEFAULT 0,
+    sentiment_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, category, day)
+);
+CREATE TABLE IF NOT EXISTS article_author_counts (
+    source TEXT NOT NULL,
+    author TEXT NOT NULL,
+    articles INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, author)
+);
+"""
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+
+@lru_cache(maxsize=256)
+def translate(query):
+    """Rewrite a MySQL statement as used by the scrapers into SQLite syntax."""
+    query = query.replace('%s', '?')
+    if 'ON DUPLICATE KEY UPDATE' in query:
+        query = query.replace('ON DUPLICATE KEY UPDATE', 'ON CONFLICT DO UPDATE SET')
+        query = re.sub(r'VALUES\((\w+)\)', r'excluded.\1', query)
+    return query
+
+
+class EmbeddedCursor:
+    """Cursor with mysql-connector's interface over a SQLite cursor."""
+
+    def __init__(self, connection, cursor, dictionary=False):
+        self._connection = connection
+        self._cursor = cursor
+        self.dictionary = dictionary
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        # LAST_INSERT_ID(expr) in an upsert sets the id reported for the statement, as in MySQL
+        if self._connection.last_insert_id is not None:
+            return self._connection.last_insert_id
+        return self._cursor.lastrowid
+
+    def execute(self, query, params=()):
+        self._connection.last_insert_id = None
+        self._cursor.execute(translate(query), tuple(params or ()))
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(translate(query), [tuple(params) for params in seq_params])
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class EmbeddedConnection:
+    """Connection with mysql-connector's interface over a SQLite database file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.create_function('NOW', 0, lambda: datetime.now().isoformat(' ', timespec='seconds'))
+        self._db.create_function('LAST_INSERT_ID', 1, self._set_last_insert_id)
+        self.last_insert_id = None
+        self._db.execute('PRAGMA journal_mode=WAL')
+
+    def _set_last_insert_id(self, value):
+        self.last_insert_id = value
+        return value
+
+    def cursor(self, dictionary=False, **kwargs):
+        return EmbeddedCursor(self, self._db.cursor(), dictionary)
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def is_connected(self):
+        return self._db is not None
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def create_database(path, sources=NEWS_SOURCES):
+    """
+    Create the tables a scraper run writes to.
+
+    Args:
+        path (str): Database file
+        sources (list): Sources to create article tables for
+
+    Returns:
+        EmbeddedConnection: Open connection to the new database
+    """
+    connection = EmbeddedConnection(path)
+    connection._db.executescript(SCHEMA + ''.join(ARTICLE_TABLE.format(source=source) for source in sources))
+    return connection
@@ -0,0 +1,277 @@
+"""
+End-to-end load test of the scrapers against synthetic news sites.
+
+For every source and corpus size, a synthetic copy of the source's site is
+served locally and the scraper's full ``run()`` is driven against it, with an
+embedded SQLite database in place of MySQL. Each run happens in a fresh
+process, so its CPU time and peak memory are its own. Reported per run:
+articles saved per minute, CPU time of the scraper (and of the browser),
+peak memory, and time spent in database calls and page loads.
+
+Politeness delays and the fixed waits after page loads are skipped, since
+the site is local; retries, circuit breaker, variants, budget allocation and
+rollups (when enabled) run as in production. Citizen keeps its own limit of
+15 articles per category.
+
+Usage:
+    python -m loadtest.run --sources star tuko --sizes 1000 10000 100000
+    python -m loadtest.run --driver http --latency 0.05 --error-rate 0.02
+    python -m loadtest.run --driver http --pipeline 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.settings import BUDGET_SETTINGS, METRICS_SETTINGS, PIPELINE_SETTINGS
+from database.models import Article
+from database.operations import article_dimension_ids, clear_dimension_cache
+from database.rollups import rebuild, rollups_enabled
+from loadtest.embedded_db import EmbeddedConnection, create_database
+from loadtest.site import SyntheticCorpus, SyntheticSite
+from scrapers.budget import YieldStats
+from scrapers.registry import available_sources, get_scraper_class
+from utils.logger import setup_logger
+
+
+class _NoDelays:
+    """Stands in for the ``time`` module of a scraper module: sleeps return at once."""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+def load_test_scraper(source, db_path, driver):
+    """
+    Create a scraper that stores into the embedded database.
+
+    Args:
+        source (str): Source name
+        db_path (str): Embedded database file
+        driver (str): 'firefox' for the real browser, 'http' for ``HttpDriver``
+
+    Returns:
+        BaseScraper: Scraper instance
+    """
+    scraper_class = get_scraper_class(source)
+
+    class LoadTestScraper(scraper_class):
+        def initialize_db(self):
+            start = time.perf_counter()
+            self.connection = EmbeddedConnection(db_path)
+            self.record_startup('db', time.perf_counter() - start)
+            return True
+
+        def initialize_webdriver(self):
+            if driver == 'firefox':
+                return super().initialize_webdriver()
+            from loadtest.driver import HttpDriver
+            self.driver = HttpDriver()
+            return True
+
+    sys.modules[scraper_class.__module__].time = _NoDelays()
+    return LoadTestScraper()
+
+
+def preload(connection, corpus, base_url, count):
+    """Store the oldest ``count`` articles of a corpus, as if scraped by earlier runs."""
+    # Each run has a new database, so ids cached for the previous one do not apply
+    clear_dimension_cache()
+    rows = []
+    for i in range(count):
+        article = corpus.article(i)
+        url, title, publication_date, author, content, category = Article(
+            url=base_url + article['path'],
+            title=article['title'],
+            publication_date=article['published'],
+            author=article['author'],
+            content='\n\n'.join(article['paragraphs']),
+            category=article['category'].title(),
+            source=corpus.source
+        ).db_values()
+        author_id, category_id = article_dimension_ids(connection, author, category)
+        rows.append((url, title, publication_date, author_id, content, category_id))
+    cursor = connection.cursor()
+    cursor.executemany(
+        f"INSERT INTO {corpus.source}_articles (url, title, publication_date, author_id, content, category_id) "
+        f"VALUES (%s, %s, %s, %s, %s, %s)",
+        rows
+    )
+    connection.commit()
+    cursor.close()
+    if rollups_enabled():
+        rebuild(connection, corpus.source)
+
+
+def run_once(source, base_url, db_path, run_dir, max_articles, driver, pipeline=None):
+    """
+    Run one scraper against a synthetic site; executed in its own process.
+
+    Args:
+        pipeline (int): Run in pipeline mode with this many fetch workers (optional)
+
+    Returns:
+        dict: Measurements of the run
+    """
+    from scrapers.base_scraper import DB_SECONDS, FETCH_SECONDS
+
+    os.makedirs(run_dir, exist_ok=True)
+    os.chdir(run_dir)
+    METRICS_SETTINGS['http_port'] = None
+    BUDGET_SETTINGS['run_seconds'] = None
+    if pipeline:
+        PIPELINE_SETTINGS['enabled'][source] = True
+        PIPELINE_SETTINGS['fetch_workers'] = pipeline
+        PIPELINE_SETTINGS['article_delay'] = 0
+
+    scraper = load_test_scraper(source, db_path, driver)
+    scraper.base_url = base_url
+    scraper.max_articles = max_articles
+    scraper.article_wait_time = 0
+    scraper.listing_wait_time = 0
+
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = time.process_time()
+    start = time.perf_counter()
+    success = scraper.run()
+    seconds = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    browser_cpu = (after.ru_utime + after.ru_stime) - (children.ru_utime + children.ru_stime)
+
+    db_seconds = DB_SECONDS.summary(source=source)[1]
+    # Every new article needs at least its own page load; fewer pages means pages went uncounted
+    yields = YieldStats().data.get(source, {})
+    return {
+        'success': success,
+        'articles': scraper.articles_saved,
+        'pages': scraper.pages_fetched,
+        'seconds': seconds,
+        'articles_per_minute': scraper.articles_saved / seconds * 60 if seconds else 0.0,
+        'cpu_seconds': cpu,
+        'browser_cpu_seconds': browser_cpu,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'browser_peak_mb': scraper.peak_browser_memory / 1024 / 1024,
+        'db_seconds': db_seconds,
+        'db_share': db_seconds / seconds if seconds else 0.0,
+        'fetch_seconds': FETCH_SECONDS.summary(source=source)[1],
+        'pipeline': scraper.pipeline_stats,
+        'undercounted_categories': sorted(category for category, entry in yields.items()
+                                          if entry['new'] > entry['pages']),
+    }
+
+
+def load_test(source, size, args, logger):
+    """
+    Serve a corpus of ``size`` articles and scrape it.
+
+    Returns:
+        dict: Run measurements plus the site's request counts
+    """
+    categories = get_scraper_class(source)().categories
+    corpus = SyntheticCorpus(source, categories, size, seed=args.seed)
+    site = SyntheticSite(corpus, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         listing_size=args.listing_size, page_kb=args.page_kb, amp=not args.no_amp,
+                         seed=args.seed).start()
+    run_dir = os.path.abspath(f"{source}_{size}")
+    os.makedirs(run_dir, exist_ok=True)
+    db_path = os.path.join(run_dir, 'articles.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    stored = int(size * args.stored)
+    connection = create_database(db_path, [source])
+    preload(connection, corpus, site.base_url, stored)
+    connection.close()
+    max_articles = args.articles or size - stored
+    logger.info(f"{source}: {size} articles at {site.base_url}, {stored} stored, scraping up to {max_articles}")
+
+    try:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_once, source, site.base_url, db_path, run_dir,
+                                     max_articles, args.driver, args.pipeline).result()
+    finally:
+        site.stop()
+
+    result.update({'source': source, 'size': size, 'stored': stored, 'site': dict(site.stats)})
+    return result
+
+
+def report(results):
+    """Print one line per run."""
+    print(f"{'source':<14} {'size':>7} {'saved':>6} {'pages':>6} {'art/min':>8} {'cpu s':>7} "
+          f"{'browser s':>9} {'rss MB':>7} {'db s':>7} {'db %':>5} {'errors':>6}")
+    for r in results:
+        print(f"{r['source']:<14} {r['size']:>7} {r['articles']:>6} {r['pages']:>6} {r['articles_per_minute']:>8.0f} "
+              f"{r['cpu_seconds']:>7.1f} {r['browser_cpu_seconds']:>9.1f} {r['peak_rss_mb']:>7.0f} "
+              f"{r['db_seconds']:>7.1f} {r['db_share'] * 100:>5.1f} {r['site']['errors']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the scrapers against synthetic news sites')
+    parser.add_argument('--sources', nargs='+', default=['star'], choices=available_sources(),
+                        help='Sources to test')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                        help='Corpus sizes (articles on the synthetic site)')
+    parser.add_argument('--articles', type=int, default=None,
+                        help='Articles to scrape per run (default: every article not stored yet)')
+    parser.add_argument('--stored', type=float, default=0.0,
+                        help='Share of the corpus stored before the run, oldest first')
+    parser.add_argument('--driver', choices=['firefox', 'http'], default='firefox',
+                        help='Load pages in Firefox, or over plain HTTP without a browser')
+    parser.add_argument('--pipeline', type=int, default=None, metavar='N',
+                        help='Run the scrapers in pipeline mode with N fetch workers')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Up to this many further seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of responses that are 503 errors')
+    parser.add_argument('--listing-size', type=int, default=None,
+                        help='Articles per listing page (default: the whole category)')
+    parser.add_argument('--page-kb', type=int, default=0, help='Filler added to each full page, in KB')
+    parser.add_argument('--no-amp', action='store_true', help='Do not serve AMP variants of article pages')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the corpus and of injected latency and errors')
+    parser.add_argument('--workdir', default=os.path.join('loadtest_runs', time.strftime('%Y%m%d_%H%M%S')),
+                        help='Directory for databases, logs and results')
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    os.chdir(args.workdir)
+    logger = setup_logger('loadtest', f"logs/loadtest_{time.strftime('%Y%m%d')}.log")
+
+    results = []
+    for source in args.sources:
+        for size in sorted(args.sizes):
+            try:
+                result = load_test(source, size, args, logger)
+            except Exception as e:
+                logger.error(f"Load test of {source} with {size} articles failed: {e}")
+                return False
+            logger.info(f"{source} {size}: {result['articles']} articles in {result['seconds']:.1f}s "
+                        f"({result['articles_per_minute']:.0f}/min)")
+            if result['undercounted_categories']:
+                logger.error(f"{source} {size}: yield stats count fewer pages than new articles for "
+                             f"{', '.join(result['undercounted_categories'])}")
+            results.append(result)
+
+    with open('results.json', 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    report(results)
+    logger.info(f"Results written to {os.path.abspath('results.json')}")
+    return all(result['success'] and not result['undercounted_categories'] for result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
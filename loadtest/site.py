@@ -0,0 +1,334 @@
+"""
+Synthetic news sites for load testing the scrapers.
+
+A ``SyntheticCorpus`` is a reproducible set of articles for one source: the
+same seed always gives the same titles, dates and paragraphs, so any article
+can be rebuilt from its index. A layout per source renders listing and
+article pages with the markup that source's scraper looks for (URL shapes,
+``.article-body p``, JSON-LD and so on), plus navigation links, a repeated
+boilerplate paragraph and an AMP variant, as on the real sites.
+
+``SyntheticSite`` serves a corpus over HTTP from a background thread, with a
+configurable delay per request and a share of requests answered with 503.
+"""
+import json
+import time
+import random
+import threading
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+WORDS = (
+    'county government budget assembly governor senate court ruling police nairobi mombasa kisumu '
+    'nakuru eldoret farmers maize tea coffee prices fuel shilling economy investors bank loan '
+    'students schools teachers health hospital doctors strike union workers matatu traffic road '
+    'railway election campaign party leaders president parliament bill tax finance revenue '
+    'football harambee stars league coach athletes marathon champion record festival music artist '
+    'film drought rains floods water wildlife tourism market traders youth jobs technology mobile '
+    'money startup wananchi serikali bunge mahakama kaunti uchumi wakulima vijana michezo habari'
+).split()
+AUTHORS = ('Jane Wanjiku', 'Brian Otieno', 'Amina Hassan', 'Peter Kamau', 'Grace Achieng',
+           'David Mwangi', 'Faith Chebet', 'Moses Kiprono', 'Lucy Njeri', 'Staff Reporter')
+BOILERPLATE = 'Follow us on Twitter and Facebook for the latest news, and subscribe to our newsletter.'
+
+# Publication time of the oldest article; each later one is MINUTES_APART newer
+START = datetime(2023, 1, 1, 6, 0)
+MINUTES_APART = 17
+
+
+class SyntheticCorpus:
+    """Reproducible articles of one source, spread over its categories."""
+
+    def __init__(self, source, categories, size, seed=0):
+        self.source = source
+        self.categories = list(categories)
+        self.size = size
+        self.seed = seed
+        self.layout = LAYOUTS[source]()
+        self.category_of = [random.Random(self._seed(i)).choice(self.categories) for i in range(size)]
+        self.paths = [self.layout.article_path(self, i) for i in range(size)]
+        self.index_of = {path: i for i, path in enumerate(self.paths)}
+
+    def _seed(self, i):
+        return self.seed * 1000003 + i
+
+    def title(self, i):
+        rng = random.Random(self._seed(i) ^ 0x5EED)
+        return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 11))).capitalize() + f' {i}'
+
+    def slug(self, i):
+        return self.title(i).lower().replace(' ', '-')
+
+    def published(self, i):
+        return START + timedelta(minutes=MINUTES_APART * i)
+
+    def article(self, i):
+        """
+        Full data of one article.
+
+        Returns:
+            dict: ``path``, ``category``, ``title``, ``author``, ``published`` and ``paragraphs``
+        """
+        rng = random.Random(self._seed(i) ^ 0xA27)
+        paragraphs = []
+        for _ in range(rng.randint(4, 12)):
+            sentences = []
+            for _ in range(rng.randint(2, 5)):
+                sentences.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + '.')
+            paragraphs.append(' '.join(sentences))
+        return {
+            'path': self.paths[i],
+            'category': self.category_of[i],
+            'title': self.title(i),
+            'author': rng.choice(AUTHORS),
+            'published': self.published(i),
+            'paragraphs': paragraphs,
+        }
+
+    def listing(self, category, limit=None):
+        """Indexes of a category's articles, newest first."""
+        indexes = [i for i in range(self.size - 1, -1, -1) if self.category_of[i] == category]
+        return indexes[:limit] if limit else indexes
+
+
+class Layout:
+    """Page markup of one source. Subclasses mirror the selectors of its scraper."""
+
+    listing_class = 'article-card'
+
+    def article_path(self, corpus, i):
+        raise NotImplementedError("Subclasses must implement ")
+
+    def article_body(self, article):
+        raise NotImplementedError("Subclasses must implement ")
+
+    def page(self, title, body, head='', padding=0):
+        """Wrap page content in the navigation and footer every page has."""
+        filler = f'<script>var pad="{"x" * padding}";</script>' if padding else ''
+        return (
+            f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{escape(title)}</title>{head}{filler}</head>'
+            '<body><header><nav><a href="/">Home</a> <a href="/news">News</a> <a href="/business">Business</a> '
+            '<a href="/sports">Sports</a> <a href="/tag/politics">Politics</a> <a href="/authors/staff">Staff</a> '
+            '<a href="https://twitter.com/example">Twitter</a></nav></header>'
+            f'<main>{body}</main>'
+            '<footer><p>Copyright 2025. All rights reserved.</p><a href="/about-us">About us</a> '
+            '<a href="/privacy-policy">Privacy</a></footer></body></html>'
+        )
+
+    def paragraphs(self, article):
+        return ''.join(f'<p>{escape(text)}</p>' for text in article['paragraphs'] + [BOILERPLATE])
+
+    def render_article(self, article, amp=True, padding=0):
+        head = ''
+        if amp:
+            head = f'<link rel="amphtml" href="{article["path"].rstrip("/")}/amp">'
+        return self.page(article['title'], self.article_body(article), head, padding)
+
+    def render_amp(self, article):
+        """AMP variant: the same article markup without navigation or scripts."""
+        return (f'<!DOCTYPE html><html amp><head><meta charset="utf-8"><title>{escape(article["title"])}</title>'
+                f'<link rel="canonical" href="{article["path"]}"></head>'
+                f'<body>{self.article_body(article)}</body></html>')
+
+    def render_listing(self, corpus, category, indexes, padding=0):
+        cards = ''.join(
+            f'<div class="{self.listing_class}"><a href="{corpus.paths[i]}">{escape(corpus.title(i))}</a></div>'
+            for i in indexes
+        )
+        return self.page(category.title(), f'<h1>{escape(category.title())}</h1>{cards}', padding=padding)
+
+
+class StarLayout(Layout):
+    listing_class = 'card'
+
+    def article_path(self, corpus, i):
+        return f"/{corpus.category_of[i]}/{corpus.published(i):%Y-%m-%d}-{corpus.slug(i)}"
+
+    def article_body(self, article):
+        ld_json = json.dumps({
+            '@type': 'NewsArticle',
+            'headline': article['title'],
+            'datePublished': article['published'].isoformat() + '+03:00',
+            'author': {'@type': 'Person', 'name': article['author']},
+            'articleBody': '\n\n'.join(article['paragraphs']),
+            'articleSection': article['category'].title(),
+        })
+        return (f'<script type="application/ld+json">{ld_json}</script>'
+                f'<article><h1 class="article-title">{escape(article["title"])}</h1>'
+                f'<div class="article-metadata"><time datetime="{article["published"].isoformat()}">'
+                f'{article["published"]:%d %B %Y}</time></div>'
+                f'<span class="article-author">{escape(article["author"])}</span>'
+                f'<div class="article-body">{self.paragraphs(article)}</div></article>')
+
+
+class CitizenLayout(Layout):
+
+    def article_path(self, corpus, i):
+        return f"/{corpus.category_of[i]}/{corpus.slug(i)}-n{100000 + i}"
+
+    def article_body(self, article):
+        return (f'<h1 class="title-on-desktop"><a href="{article["path"]}">{escape(article["title"])}</a></h1>'
+                f'<span class="timepublished">{article["published"].isoformat()}</span>'
+                f'<span class="article-author">{escape(article["author"])}</span>'
+                f'<div class="article-body">{self.paragraphs(article)}</div>'
+                f'<div class="next-topstory-tags"><span>{escape(article["category"].title())}</span></div>')
+
+
+class DailyNationLayout(Layout):
+    listing_class = 'teaser'
+
+    def article_path(self, corpus, i):
+        return f"/kenya/{corpus.category_of[i]}/{corpus.slug(i)}-{4000000 + i}"
+
+    def article_body(self, article):
+        return (f'<article><h1 class="article-title">{escape(article["title"])}</h1>'
+                f'<time class="article-date" datetime="{article["published"].isoformat()}">'
+                f'{article["published"]:%A, %B %d, %Y}</time>'
+                f'<span class="article-author">{escape(article["author"])}</span>'
+                f'<div class="article-body">{self.paragraphs(article)}</div>'
+                f'<span class="article-category">{escape(article["category"].title())}</span></article>')
+
+
+class StandardMediaLayout(Layout):
+
+    def article_path(self, corpus, i):
+        return f"/{corpus.category_of[i]}/article/{2001000000 + i}/{corpus.slug(i)}"
+
+    def article_body(self, article):
+        return (f'<article><h1 class="article-title">{escape(article["title"])}</h1>'
+                f'<time class="article-date" datetime="{article["published"].isoformat()}">'
+                f'{article["published"]:%d %b %Y}</time>'
+                f'<span class="article-author">{escape(article["author"])}</span>'
+                f'<div class="article-content">{self.paragraphs(article)}</div>'
+                f'<span class="article-category">{escape(article["category"].title())}</span></article>')
+
+
+class TukoLayout(Layout):
+    listing_class = 'c-article-card'
+
+    def article_path(self, corpus, i):
+        return f"/{corpus.category_of[i]}/{500000 + i}-{corpus.slug(i)}/"
+
+    def article_body(self, article):
+        return (f'<article><h1 class="c-article__headline">{escape(article["title"])}</h1>'
+                f'<time class="c-article__date" datetime="{article["published"].isoformat()}">'
+                f'{article["published"]:%d.%m.%Y}</time>'
+                f'<span class="c-article__author">{escape(article["author"])}</span>'
+                f'<div class="c-article__content">{self.paragraphs(article)}</div>'
+                f'<span class="c-article__category">{escape(article["category"].title())}</span></article>')
+
+
+LAYOUTS = {
+    'citizen': CitizenLayout,
+    'daily_nations': DailyNationLayout,
+    'standardmedia': StandardMediaLayout,
+    'star': StarLayout,
+    'tuko': TukoLayout
+}
+
+
+class SyntheticSite:
+    """Serves a corpus over HTTP with injected latency and errors."""
+
+    def __init__(self, corpus, latency=0.0, jitter=0.0, error_rate=0.0, listing_size=None,
+                 page_kb=0, amp=True, seed=0):
+        """
+        Args:
+            corpus (SyntheticCorpus): Articles to serve
+            latency (float): Seconds added to every response
+            jitter (float): Up to this many further seconds, drawn per request
+            error_rate (float): Share of requests answered with 503
+            listing_size (int): Articles per listing page, None for all of the category
+            page_kb (int): Filler added to full pages, to mimic the weight of real pages
+            amp (bool): Link and serve AMP variants of article pages
+            seed (int): Seed for the latency and error draws
+        """
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.listing_size = listing_size
+        self.padding = page_kb * 1024
+        self.amp = amp
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'listing': 0, 'article': 0, 'amp': 0, 'not_found': 0, 'errors': 0}
+        self.server = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind):
+        with self.lock:
+            self.stats[kind] += 1
+
+    def respond(self, path):
+        """
+        Build the response for a request path.
+
+        Returns:
+            tuple: HTTP status and HTML
+        """
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            failed = self.rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self.count('errors')
+            return 503, '<html><head><title>503 Service Unavailable</title></head><body>Try again later.</body></html>'
+
+        corpus, layout = self.corpus, self.corpus.layout
+        category = path.strip('/')
+        if category in corpus.categories:
+            self.count('listing')
+            indexes = corpus.listing(category, self.listing_size)
+            return 200, layout.render_listing(corpus, category, indexes, self.padding)
+
+        if self.amp and path.endswith('/amp'):
+            base = path[:-len('/amp')]
+            i = corpus.index_of.get(base, corpus.index_of.get(base + '/'))
+            if i is not None:
+                self.count('amp')
+                return 200, layout.render_amp(corpus.article(i))
+
+        i = corpus.index_of.get(path)
+        if i is None:
+            self.count('not_found')
+            return 404, '<html><head><title>Page not found</title></head><body>Not found</body></html>'
+        self.count('article')
+        return 200, layout.render_article(corpus.article(i), self.amp, self.padding)
+
+    def start(self, host='127.0.0.1', port=0):
+        """Start serving from a background thread; port 0 picks a free port."""
+        site = self
+
+        class SiteHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, html = site.respond(self.path.split('?')[0])
+                body = html.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), SiteHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='synthetic-site', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -1,12 +1,12 @@
 import os
+import re
 import sys
 import time
-import logging
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urldefrag, urljoin, urlparse
 from selenium import webdriver
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
 from bs4 import BeautifulSoup
 
 # Add parent directory to sys.path for imports
@@ -15,65 +15,111 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from config.database import get_connection
-from utils.text_cleaner import clean_text
+from config.settings import BROWSER_SETTINGS, BUDGET_SETTINGS, METRICS_SETTINGS, PIPELINE_SETTINGS, RETRY_SETTINGS, TRENDING_SETTINGS, VARIANT_SETTINGS
+from database.models import ArticleCsvWriter
+from database.operations import article_dimension_ids, encode_content
+from database.rollups import apply_articles, rollups_enabled
+from scrapers.budget import YieldStats
+from utils.browser import PageWeightStats, firefox_options, is_lean, page_bytes, resolve_geckodriver
+from utils.text_cleaner import clean_text, clean_paragraphs, get_boilerplate_filter
+from utils.trending import get_trend_tracker
 from utils.date_parser import parse_date
+from utils.http import fetch_url
+from utils.logger import get_scraper_logger
+from utils.metrics import REGISTRY, start_http_server
+from utils.process import process_age, process_tree_rss
+from utils.resilience import BROWSER, PERMANENT, backoff_delay, classify_error, get_breaker
+from utils.variants import VariantRules, apply_template, find_variant_link
+
+
+FETCH_SECONDS = REGISTRY.histogram('scraper_fetch_seconds', 'Time spent loading pages in the browser')
+WAIT_SECONDS = REGISTRY.histogram('scraper_wait_seconds', 'Time spent in the fixed wait after each page load')
+PARSE_SECONDS = REGISTRY.histogram('scraper_parse_seconds', 'Time spent parsing page HTML')
+EXTRACT_SECONDS = REGISTRY.histogram('scraper_extract_seconds', 'Time spent extracting article fields from a parsed page')
+DB_SECONDS = REGISTRY.histogram('scraper_db_seconds', 'Time spent in database calls')
+PAGES = REGISTRY.counter('scraper_pages_total', 'Pages loaded')
+ARTICLES = REGISTRY.counter('scraper_articles_total', 'Articles written to the database')
+ERRORS = REGISTRY.counter('scraper_errors_total', 'Failed page loads, extractions and database writes')
+SKIPS = REGISTRY.counter('scraper_skipped_total', 'Article links skipped because they are already stored')
+PAGE_BYTES = REGISTRY.counter('scraper_page_bytes_total', 'Bytes transferred by the browser for loaded pages')
+BROWSER_MEMORY = REGISTRY.gauge('scraper_browser_memory_bytes', 'Resident memory of the browser process tree')
+COLD_START = REGISTRY.gauge('scraper_cold_start_seconds', 'Seconds from process start to the first page request')
+STARTUP_SECONDS = REGISTRY.gauge('scraper_startup_seconds', 'Seconds spent starting the browser and connecting to the database')
+LINKS = REGISTRY.counter('scraper_links_total', 'Links seen on listing pages, by whether they look like articles')
+DRIVER_RESTARTS = REGISTRY.counter('scraper_driver_restarts_total', 'Browser restarts by the memory and page-count watchdog')
+FETCH_FAILURES = REGISTRY.counter('scraper_fetch_failures_total', 'Failed page load attempts, by error kind')
+CIRCUIT_TRIPS = REGISTRY.counter('scraper_circuit_trips_total', 'Times a source circuit breaker opened')
+VARIANTS = REGISTRY.counter('scraper_variants_total', 'Article variant (AMP) attempts, by result')
+VARIANT_BYTES = REGISTRY.counter('scraper_variant_bytes_total', 'Bytes transferred for article variants used instead of full pages')
+
+
+@lru_cache(maxsize=None)
+def _compile_url_patterns(patterns):
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+# Only the first page request of a process is a cold start
+_cold_start_recorded = False
 
 
 class BaseScraper:
     """Base class for news scrapers with common functionality."""
     
+    article_wait_time = 5
+    listing_wait_time = 5
+    # Regular expressions matching the path of this source's article URLs
+    article_url_patterns = ()
+    
     def __init__(self, source_name):
         self.source_name = source_name
         self.table_name = f"{source_name}_articles"
         self.driver = None
         self.connection = None
+        self.last_fetch_time = None
+        self.current_category = None
+        self.lean_browser = is_lean(source_name)
+        self.page_weight = {'pages': 0, 'bytes': 0, 'seconds': 0.0}
+        self.browser_memory = None
+        self.peak_browser_memory = 0
+        self.driver_pages = 0
+        self.driver_restarts = 0
+        self.startup_seconds = {}
+        self.breaker = get_breaker(source_name)
+        self.pages_fetched = 0
+        self.articles_saved = 0
+        self.use_variants = VARIANT_SETTINGS['enabled'].get(source_name, False)
+        self.variant_template = VARIANT_SETTINGS['url_templates'].get(source_name)
+        self.variant_rules = None
+        self.variant_stats = {'hits': 0, 'misses': 0, 'bytes': 0}
+        self.variant_misses = 0
+        self.use_pipeline = PIPELINE_SETTINGS['enabled'].get(source_name, False)
+        self.pipeline_stats = None
+        self.defer_boilerplate = False
+        self.boilerplate_deferred = False
+        # Scrapers that name a CSV file also write every saved article to it
+        self.csv_filename = None
+        self.article_writer = None
         self.logger = self._setup_logger()
         
     def _setup_logger(self):
         """Set up a logger for this scraper instance."""
-        logger = logging.getLogger(f"{self.source_name}_scraper")
-        logger.setLevel(logging.INFO)
-        
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
-        
-        # File handler
-        file_handler = logging.FileHandler(f"logs/{self.source_name}_{datetime.now().strftime('%Y%m%d')}.log")
-        file_handler.setLevel(logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Create formatter and add to handlers
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-        
-        return logger
+        return get_scraper_logger(self.source_name)
     
     def initialize_webdriver(self):
         """Initialize and configure the Selenium WebDriver."""
         try:
+            start = time.perf_counter()
+            
             # Setup Firefox options
-            options = FirefoxOptions()
-            options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-sandbox')
-            options.set_preference("general.useragent.override", 
-                                "Mozilla/5.0 (X11; Linux x86_64; rv:134.0) Gecko/20100101 Firefox/134.0")
-            options.set_preference("intl.accept_languages", "en-US,en;q=0.5")
-            options.set_preference("network.http.accept-encoding", "gzip, deflate, br, zstd")
-            options.set_preference("privacy.donottrackheader.enabled", True)
+            options = firefox_options(lean=self.lean_browser)
             
             # Initialize WebDriver
-            service = FirefoxService(GeckoDriverManager().install())
+            service = FirefoxService(resolve_geckodriver())
             self.driver = webdriver.Firefox(service=service, options=options)
-            self.logger.info(f"WebDriver initialized for {self.source_name}")
+            self.driver.set_page_load_timeout(RETRY_SETTINGS['page_load_timeout'])
+            self.record_startup('driver', time.perf_counter() - start)
+            mode = 'lean' if self.lean_browser else 'full'
+            self.logger.info(f"WebDriver initialized for {self.source_name} ({mode} browser)")
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize WebDriver: {e}")
@@ -88,10 +134,50 @@ class BaseScraper:
             except Exception as e:
                 self.logger.error(f"Error closing WebDriver: {e}")
     
+    def restart_webdriver(self, reason):
+        """
+        Replace the browser with a fresh instance.
+
+        Called between page loads, so the scraper carries on from the same
+        category and link it was about to load.
+
+        Args:
+            reason (str): Why the browser is restarted ('memory' or 'pages')
+
+        Returns:
+            bool: True if the new browser started
+        """
+        memory_mb = (self.browser_memory or 0) / 1024 / 1024
+        self.logger.info(f"Restarting WebDriver ({reason}): {self.driver_pages} pages, {memory_mb:.0f} MB")
+        self.close_webdriver()
+        self.driver = None
+        self.browser_memory = None
+        self.driver_pages = 0
+        self.driver_restarts += 1
+        DRIVER_RESTARTS.inc(source=self.source_name, reason=reason)
+        return self.initialize_webdriver()
+    
+    def check_browser_health(self):
+        """
+        Restart the browser if it has grown past the memory or page-count limit.
+
+        Returns:
+            bool: False if a restart was needed and failed
+        """
+        max_memory_mb = BROWSER_SETTINGS.get('max_memory_mb')
+        max_pages = BROWSER_SETTINGS.get('max_pages')
+        if max_memory_mb and self.browser_memory and self.browser_memory > max_memory_mb * 1024 * 1024:
+            return self.restart_webdriver('memory')
+        if max_pages and self.driver_pages >= max_pages:
+            return self.restart_webdriver('pages')
+        return True
+    
     def initialize_db(self):
         """Initialize database connection."""
         try:
+            start = time.perf_counter()
             self.connection = get_connection()
+            self.record_startup('db', time.perf_counter() - start)
             if self.connection and self.connection.is_connected():
                 self.logger.info("Database connection established")
                 return True
@@ -111,22 +197,705 @@ class BaseScraper:
             except Exception as e:
                 self.logger.error(f"Error closing database connection: {e}")
     
-    def get_soup(self, url, wait_time=5):
+    def get_soup(self, url, wait_time=5, parse=True):
+        """
+        Load a page in the browser and parse it, retrying transient failures.
+        
+        Timeouts and network errors are retried with jittered exponential
+        backoff, after restarting the browser if it crashed. A page that still
+        fails counts against the source's circuit breaker; while the breaker
+        is open no page is requested.
+        
+        Args:
+            url (str): Page URL
+            wait_time (float): Seconds to wait after the page loads
+            parse (bool): Parse the page; pass False to get its HTML for parsing elsewhere
+            
+        Returns:
+            BeautifulSoup: Parsed page (HTML string if ``parse`` is False), or None if it could not be loaded
+        """
         if not self.driver:
             self.logger.error("WebDriver not initialized")
             return None
             
-        try:
-            self.logger.info(f"Loading URL: {url}")
-            self.driver.get(url)
-            time.sleep(wait_time)  # Wait for page to load
+        labels = self.metric_labels()
+        if not self.breaker.allow():
+            FETCH_FAILURES.inc(kind='circuit_open', **labels)
+            self.logger.warning(f"Circuit open for {self.source_name}, skipping {url} "
+                                f"({self.breaker.remaining():.0f}s of cool-down left)")
+            return None
             
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
+        max_attempts = RETRY_SETTINGS['max_attempts']
+        for attempt in range(1, max_attempts + 1):
+            if not self.check_browser_health():
+                self.logger.error("WebDriver could not be restarted")
+                return None
+            try:
+                soup = self.load_page(url, wait_time, parse)
+            except Exception as e:
+                kind = classify_error(e)
+                FETCH_FAILURES.inc(kind=kind, **labels)
+                self.logger.warning(f"Error loading URL {url} (attempt {attempt}/{max_attempts}, {kind}): {e}")
+                if kind == PERMANENT:
+                    # Says nothing about the site's health
+                    ERRORS.inc(stage='fetch', **labels)
+                    return None
+                if attempt == max_attempts:
+                    break
+                if kind == BROWSER and not self.restart_webdriver('crash'):
+                    break
+                time.sleep(backoff_delay(attempt))
+                continue
+            self.breaker.record_success()
             return soup
+            
+        ERRORS.inc(stage='fetch', **labels)
+        self.logger.error(f"Giving up on {url} after {attempt} attempts")
+        if self.breaker.record_failure():
+            self.trip_circuit()
+        return None
+    
+    def load_page(self, url, wait_time, parse=True):
+        """
+        Load a page once and parse it, recording fetch metrics.
+        
+        Returns:
+            BeautifulSoup: Parsed page, or its HTML if ``parse`` is False
+        
+        Raises:
+            Exception: Whatever the browser raised for the page load
+        """
+        labels = self.metric_labels()
+        self.record_cold_start()
+        self.logger.info(f"Loading URL: {url}")
+        start = time.perf_counter()
+        self.driver.get(url)
+        fetch_seconds = time.perf_counter() - start
+        self.last_fetch_time = datetime.now()
+        with WAIT_SECONDS.time(**labels):
+            time.sleep(wait_time)  # Wait for page to load
+        
+        # Reading back the rendered DOM is a browser round trip too
+        start = time.perf_counter()
+        html = self.driver.page_source
+        FETCH_SECONDS.observe(fetch_seconds + time.perf_counter() - start, **labels)
+        self.record_page_weight(fetch_seconds)
+        soup = html
+        if parse:
+            with PARSE_SECONDS.time(**labels):
+                soup = BeautifulSoup(html, 'html.parser')
+        PAGES.inc(**labels)
+        self.driver_pages += 1
+        self.pages_fetched += 1
+        self.record_browser_memory()
+        return soup
+    
+    def trip_circuit(self):
+        """Record that the source's circuit breaker opened and mark the run failed right away."""
+        CIRCUIT_TRIPS.inc(source=self.source_name)
+        self.logger.error(f"{self.breaker.failures} pages in a row failed for {self.source_name}, "
+                          f"pausing fetches for {self.breaker.cooldown}s")
+        self.update_metadata(status='failed')
+    
+    def record_startup(self, phase, seconds):
+        """Record how long one startup step ('driver' or 'db') took."""
+        self.startup_seconds[phase] = self.startup_seconds.get(phase, 0.0) + seconds
+        STARTUP_SECONDS.set(self.startup_seconds[phase], source=self.source_name, phase=phase)
+    
+    def record_cold_start(self):
+        """Record the time from process start to this process's first page request."""
+        global _cold_start_recorded
+        if _cold_start_recorded:
+            return
+        _cold_start_recorded = True
+        
+        age = process_age()
+        if age is None:
+            return
+        COLD_START.set(age, source=self.source_name)
+        steps = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in self.startup_seconds.items())
+        self.logger.info(f"Cold start for {self.source_name}: first page request {age:.2f}s after process start"
+                         + (f" ({steps})" if steps else ""))
+    
+    def metric_labels(self):
+        """Labels identifying this scraper's current source and category in metrics."""
+        return {'source': self.source_name, 'category': self.current_category or ''}
+    
+    def record_page_weight(self, fetch_seconds):
+        """
+        Record the bytes the browser transferred for the current page.
+
+        Args:
+            fetch_seconds (float): Time driver.get() took for the page
+        """
+        transferred = page_bytes(self.driver)
+        if transferred is None:
+            return
+        PAGE_BYTES.inc(transferred, **self.metric_labels())
+        self.page_weight['pages'] += 1
+        self.page_weight['bytes'] += transferred
+        self.page_weight['seconds'] += fetch_seconds
+    
+    def report_page_weight(self):
+        """Log this run's page weight and what lean mode saves against full-browser runs."""
+        weight = self.page_weight
+        if not weight['pages']:
+            return
+        
+        mode = 'lean' if self.lean_browser else 'full'
+        stats = PageWeightStats()
+        stats.add(self.source_name, mode, weight['pages'], weight['bytes'], weight['seconds'])
+        try:
+            stats.save()
+        except OSError as e:
+            self.logger.error(f"Error saving page weight stats: {e}")
+        
+        page_kb = weight['bytes'] / weight['pages'] / 1024
+        page_seconds = weight['seconds'] / weight['pages']
+        message = f"Page weight for {self.source_name} ({mode}): {page_kb:.0f} KB, {page_seconds:.2f}s load per page"
+        
+        lean = stats.per_page(self.source_name, 'lean')
+        full = stats.per_page(self.source_name, 'full')
+        if lean and full and full[0]:
+            message += (f"; lean saves {(1 - lean[0] / full[0]) * 100:.0f}% of bytes and "
+                        f"{full[1] - lean[1]:.2f}s per page vs full browser")
+        self.logger.info(message)
+    
+    def report_variants(self):
+        """Log how many articles came from variants and the bytes that saved against full pages."""
+        stats = self.variant_stats
+        attempts = stats['hits'] + stats['misses']
+        if not attempts:
+            return
+        
+        message = (f"Article variants for {self.source_name}: {stats['hits']} of {attempts} "
+                   f"({stats['hits'] / attempts * 100:.0f}%) used")
+        if stats['hits']:
+            variant_kb = stats['bytes'] / stats['hits'] / 1024
+            message += f", {variant_kb:.0f} KB per variant"
+            mode = 'lean' if self.lean_browser else 'full'
+            full = PageWeightStats().per_page(self.source_name, mode)
+            if full:
+                saved = max(full[0] * stats['hits'] - stats['bytes'], 0)
+                message += f" vs {full[0] / 1024:.0f} KB per {mode} page, {saved / 1024 / 1024:.1f} MB saved"
+        self.logger.info(message)
+    
+    def record_browser_memory(self):
+        """
+        Record the browser's resident memory in the metrics.
+
+        Returns:
+            int: Memory of the browser process tree in bytes, or None if unavailable
+        """
+        try:
+            pid = self.driver.capabilities.get('moz:processID')
+        except Exception:
+            return None
+        rss = process_tree_rss(pid)
+        if rss is not None:
+            BROWSER_MEMORY.set(rss, source=self.source_name)
+            self.browser_memory = rss
+            self.peak_browser_memory = max(self.peak_browser_memory, rss)
+        return rss
+    
+    def scrape_article_page(self, url):
+        """
+        Load an article page and extract its data.
+        
+        Args:
+            url (str): URL of the article to scrape
+            
+        Returns:
+            Article: Extracted article, or None if it is already stored or scraping failed
+        """
+        labels = self.metric_labels()
+        if self.article_exists(url):
+            self.logger.info(f"Article already exists: {url}")
+            SKIPS.inc(**labels)
+            return None
+            
+        if self.use_variants:
+            article_data = self.scrape_article_variant(url)
+            if article_data:
+                return article_data
+            
+        soup = self.get_soup(url, wait_time=self.article_wait_time)
+        if not soup:
+            return None
+        if self.use_variants:
+            self.learn_variant_template(soup, url)
+            
+        with EXTRACT_SECONDS.time(**labels):
+            article_data = self.extract_article(soup, url)
+        if not article_data:
+            ERRORS.inc(stage='extract', **labels)
+        return article_data
+    
+    def variant_url(self, url):
+        """
+        URL of an article's lightweight variant.
+        
+        Uses the source's configured template, or the one learned from an
+        earlier full page of this source.
+        
+        Args:
+            url (str): Article URL
+            
+        Returns:
+            str: Variant URL, or None if no template is known yet
+        """
+        template = self.variant_template
+        if not template:
+            if self.variant_rules is None:
+                self.variant_rules = VariantRules()
+            template = self.variant_rules.get(self.source_name)
+        return apply_template(template, url) if template else None
+    
+    def learn_variant_template(self, soup, url):
+        """Learn the variant URL template from a full article page's amphtml link."""
+        if self.variant_template:
+            return
+        self.learn_variant_link(url, find_variant_link(soup, url))
+    
+    def learn_variant_link(self, url, variant_url):
+        """
+        Learn the variant URL template from an article URL and its variant's URL.
+        
+        Args:
+            url (str): Article URL
+            variant_url (str): URL of the article's variant, or None if the page links none
+        """
+        if self.variant_template or not variant_url:
+            return
+        if self.variant_rules is None:
+            self.variant_rules = VariantRules()
+        if self.variant_rules.learn(self.source_name, url, variant_url):
+            self.logger.info(f"Learned article variant URLs for {self.source_name}: "
+                             f"{self.variant_rules.get(self.source_name)}")
+            try:
+                self.variant_rules.save()
+            except OSError as e:
+                self.logger.error(f"Error saving variant rules: {e}")
+    
+    def is_complete(self, article):
+        """Whether an extracted article has a title, a date and enough content."""
+        return bool(article
+                    and article.title
+                    and article.publication_date
+                    and len(article.content) >= VARIANT_SETTINGS['min_content_chars'])
+    
+    def scrape_article_variant(self, url):
+        """
+        Fetch an article's lightweight variant over plain HTTP and extract it.
+        
+        The variant is parsed with the source's usual ``extract_article``; if
+        that leaves out anything a full page would give, the caller loads the
+        full page instead. Sources stop trying variants for the rest of the run
+        after ``max_misses`` unusable variants in a row.
+        
+        Args:
+            url (str): Article URL
+            
+        Returns:
+            Article: Extracted article, or None if the full page should be loaded
+        """
+        variant_url = self.variant_url(url)
+        if not variant_url or not self.breaker.allow():
+            return None
+        
+        labels = self.metric_labels()
+        content = None
+        try:
+            start = time.perf_counter()
+            html, transferred = fetch_url(variant_url, timeout=VARIANT_SETTINGS['timeout'])
+            self.pages_fetched += 1
+            FETCH_SECONDS.observe(time.perf_counter() - start, **labels)
+            self.last_fetch_time = datetime.now()
+            with PARSE_SECONDS.time(**labels):
+                soup = BeautifulSoup(html, 'html.parser')
+            # Only the article that is kept may count towards the boilerplate
+            # filter, so filtering waits until the variant is known to be usable
+            defer_boilerplate = self.defer_boilerplate
+            self.defer_boilerplate = True
+            self.boilerplate_deferred = False
+            try:
+                with EXTRACT_SECONDS.time(**labels):
+                    article_data = self.extract_article(soup, url)
+            finally:
+                self.defer_boilerplate = defer_boilerplate
+        except Exception as e:
+            self.logger.debug(f"Variant {variant_url} failed: {e}")
+            article_data, result, transferred = None, 'error', 0
+        else:
+            if article_data and self.boilerplate_deferred:
+                content = article_data.content
+            if content:
+                article_data.content = self.filter_boilerplate(content, learn=False)
+            result = 'hit' if self.is_complete(article_data) else 'incomplete'
+        
+        if not self.record_variant(result, variant_url, transferred):
+            return None
+        if content:
+            article_data.content = self.filter_boilerplate(content)
+        return article_data
+    
+    def record_variant(self, result, variant_url, transferred=0):
+        """
+        Record the outcome of one variant attempt.
+        
+        Args:
+            result (str): 'hit', 'incomplete' or 'error'
+            variant_url (str): Variant URL that was tried
+            transferred (int): Bytes transferred for the variant
+            
+        Returns:
+            bool: True if the variant's article is used
+        """
+        VARIANTS.inc(result=result, **self.metric_labels())
+        if result == 'hit':
+            self.logger.info(f"Article loaded from variant: {variant_url}")
+            VARIANT_BYTES.inc(transferred, **self.metric_labels())
+            self.variant_stats['hits'] += 1
+            self.variant_stats['bytes'] += transferred
+            self.variant_misses = 0
+            return True
+        
+        self.variant_stats['misses'] += 1
+        self.variant_misses += 1
+        if self.variant_misses >= VARIANT_SETTINGS['max_misses']:
+            self.logger.warning(f"{self.variant_misses} unusable variants in a row for {self.source_name}, "
+                                f"loading full pages for the rest of the run")
+            self.use_variants = False
+        return False
+
+    def extract_article(self, soup, url):
+        raise NotImplementedError("Subclasses must implement ")
+    
+    def find_article_links(self, soup):
+        """
+        Find article links on a category listing page.
+        
+        Uses the URL-pattern harvester, and the source's CSS selectors only if
+        no link on the page matched its article URL patterns.
+        
+        Args:
+            soup (BeautifulSoup): Parsed listing page
+            
+        Returns:
+            list: Unique absolute article URLs in page order
+        """
+        links = self.harvest_links(soup)
+        if not links:
+            self.logger.warning(f"No links matched the article URL patterns for {self.source_name}, "
+                                f"falling back to CSS selectors")
+            links = self.select_article_links(soup)
+        return links
+    
+    def select_article_links(self, soup):
+        """Find article links with source-specific CSS selectors."""
+        return []
+    
+    def harvest_links(self, soup):
+        """
+        Collect article links from every anchor on a page in one pass.
+        
+        Each href is resolved against the base URL, stripped of its fragment,
+        and kept only if it is on this source's site and its path matches
+        one of ``article_url_patterns``; navigation, tag and author links do not.
+        
+        Args:
+            soup (BeautifulSoup): Parsed page
+            
+        Returns:
+            list: Unique absolute article URLs in page order
+        """
+        if not self.article_url_patterns:
+            return []
+        
+        pattern = _compile_url_patterns(tuple(self.article_url_patterns))
+        site = urlparse(self.base_url).netloc.lower().removeprefix('www.')
+        base = self.base_url + '/'
+        
+        links = {}
+        rejected = 0
+        for anchor in soup.find_all('a', href=True):
+            url = urldefrag(urljoin(base, anchor['href'].strip()))[0]
+            parsed = urlparse(url)
+            if (parsed.scheme in ('http', 'https')
+                    and parsed.netloc.lower().removeprefix('www.') == site
+                    and pattern.search(parsed.path)):
+                links[url] = None
+            else:
+                rejected += 1
+        
+        labels = self.metric_labels()
+        LINKS.inc(len(links), kind='article', **labels)
+        LINKS.inc(rejected, kind='other', **labels)
+        return list(links)
+    
+    def absolute_links(self, links):
+        """
+        Resolve links against the source's base URL and remove duplicates.
+        
+        Args:
+            links (list): Link hrefs as found on the page
+            
+        Returns:
+            list: Unique absolute URLs in page order
+        """
+        absolute_links = []
+        for link in links:
+            if not link.startswith('http'):
+                link = self.base_url + link if link.startswith('/') else self.base_url + '/' + link
+            absolute_links.append(link)
+        return list(dict.fromkeys(absolute_links))
+    
+    def discover_links(self, category):
+        """
+        Load a category listing page and return the article links on it.
+        
+        Args:
+            category (str): Category to load
+            
+        Returns:
+            list: Unique absolute article URLs, or None if the page could not be loaded
+        """
+        self.current_category = category
+        url = f"{self.base_url}/{category}"
+        self.logger.info(f"Discovering articles in {category} from {url}")
+        
+        soup = self.get_soup(url, wait_time=self.listing_wait_time)
+        if not soup:
+            return None
+        return self.find_article_links(soup)
+    
+    def category_links(self, links, articles_needed):
+        """
+        Yield the links of a category that are not stored yet, up to its page load limit.
+        
+        Stored links are skipped without a page load and not counted, so a
+        category can go past them to find articles_needed new ones; but when
+        pages keep failing to extract it stops after ``page_load_factor``
+        loads per article needed instead of loading every link.
+        
+        Args:
+            links (list): Article links from the category's listing page
+            articles_needed (int): Maximum number of articles to save from the category
+            
+        Yields:
+            str: Link to scrape
+        """
+        max_loads = articles_needed * BUDGET_SETTINGS['page_load_factor']
+        loads = 0
+        for link in links:
+            if self.article_exists(link):
+                self.logger.info(f"Article already exists: {link}")
+                SKIPS.inc(**self.metric_labels())
+                continue
+            if loads >= max_loads:
+                self.logger.info(f"Reached page load limit of {max_loads} for category {self.current_category}")
+                return
+            loads += 1
+            yield link
+    
+    def crawl_category(self, category, limit):
+        """
+        Discover a category's article links and scrape the ones not stored yet.
+        
+        Args:
+            category (str): Category to crawl
+            limit (int): Maximum number of articles to scrape
+            
+        Returns:
+            tuple: Links found that are not stored yet and number of articles
+            saved, or None if the listing page could not be loaded
+        """
+        links = self.discover_links(category)
+        if links is None:
+            return None
+        
+        new_links = [link for link in links if not self.article_exists(link)]
+        self.logger.info(f"Found {len(new_links)} new of {len(links)} articles in {category}")
+        
+        saved = 0
+        for link in new_links[:limit]:
+            article_data = self.scrape_article_page(link)
+            if article_data and self.save_article(article_data):
+                saved += 1
+            # Add a small delay to avoid overloading the server
+            time.sleep(2)
+        return new_links, saved
+    
+    def pipeline_categories(self):
+        """
+        Categories for pipeline mode and the number of articles to aim for in each.
+        
+        Yields:
+            tuple: Category and article limit; by default from ``allocate_budget``
+        """
+        return self.allocate_budget()
+    
+    def scrape_pipeline(self):
+        """
+        Scrape like ``scrape``, with fetching, parsing and saving as concurrent stages.
+        
+        Listing pages are loaded by this scraper's browser. Article pages go
+        through a ``ScrapePipeline``: fetch worker threads with a browser each,
+        a process pool parsing and extracting pages, and this thread writing
+        articles in batches.
+        
+        Returns:
+            bool: True if any article was saved
+        """
+        from scrapers.pipeline import ScrapePipeline
+        
+        pipeline = ScrapePipeline(self)
+        total_articles = 0
+        try:
+            if self.csv_filename:
+                self.article_writer = ArticleCsvWriter(self.csv_filename)
+            if not pipeline.start():
+                return False
+            for category, limit in self.pipeline_categories():
+                links = self.discover_links(category)
+                if links is None:
+                    continue
+                new_links = [link for link in links if not self.article_exists(link)]
+                self.logger.info(f"Found {len(new_links)} new of {len(links)} articles in {category}")
+                
+                articles_count = pipeline.crawl(category, new_links, limit)
+                total_articles += articles_count
+                self.logger.info(f"Scraped {articles_count} articles from {category}, {total_articles} total so far")
         except Exception as e:
-            self.logger.error(f"Error loading URL {url}: {e}")
+            self.logger.error(f"Error in pipeline scrape process: {e}")
+            return False
+        finally:
+            pipeline.close()
+            if self.article_writer:
+                self.logger.info(f"Saved {self.article_writer.count} articles to {self.csv_filename}")
+                self.article_writer.close()
+                self.article_writer = None
+        
+        self.logger.info(f"Total articles scraped: {total_articles}")
+        return total_articles > 0
+    
+    def allocate_budget(self):
+        """
+        Hand out ``max_articles`` across categories by their historical yield.
+        
+        Categories are visited from the highest sampled yield down. Each may
+        use the budget still left except one article for every category after
+        it, so busy categories are not cut off at an even split and whatever
+        they leave passes on. A category's budget is also capped by what the
+        remaining time allows at its usual seconds per page, and no category
+        is started once the time budget is spent. Pages and new articles of
+        each visit are recorded for later runs.
+        
+        Yields:
+            tuple: Category and the number of articles to aim for in it
+        """
+        stats = YieldStats()
+        samples = {category: stats.sample(self.source_name, category) for category in self.categories}
+        order = sorted(self.categories, key=samples.get, reverse=True)
+        run_seconds = BUDGET_SETTINGS.get('run_seconds')
+        deadline = time.monotonic() + run_seconds if run_seconds else None
+        remaining = self.max_articles
+        self.logger.info(f"Category order for {self.source_name}: "
+                         + ', '.join(f"{category} {samples[category]:.2f}" for category in order))
+        
+        try:
+            for i, category in enumerate(order):
+                if remaining <= 0:
+                    self.logger.info(f"Reached maximum article limit of {self.max_articles}")
+                    break
+                if deadline and time.monotonic() >= deadline:
+                    self.logger.info(f"Time budget of {run_seconds}s used up before {category}")
+                    break
+                
+                articles = max(1, remaining - (len(order) - i - 1))
+                seconds_per_page = stats.seconds_per_page(self.source_name, category)
+                if deadline and seconds_per_page:
+                    articles = min(articles, int((deadline - time.monotonic()) / seconds_per_page))
+                if articles <= 0:
+                    continue
+                
+                pages, saved, start = self.pages_fetched, self.articles_saved, time.monotonic()
+                yield category, articles
+                new_articles = self.articles_saved - saved
+                stats.update(self.source_name, category, self.pages_fetched - pages, new_articles,
+                             time.monotonic() - start)
+                remaining -= new_articles
+        finally:
+            try:
+                stats.save()
+            except OSError as e:
+                self.logger.error(f"Error saving category yield stats: {e}")
+    
+    def parse_publication_date(self, date_text, selector=None):
+        """
+        Parse a date string with this source's learned formats.
+
+        Relative dates such as "2 hours ago" are anchored to when the last page was fetched.
+
+        Args:
+            date_text (str): Date text from an article
+            selector (str): CSS selector or field the text came from
+
+        Returns:
+            datetime: Parsed datetime object or None if parsing fails
+        """
+        return parse_date(date_text, reference_time=self.last_fetch_time,
+                          source=self.source_name, selector=selector)
+
+    def extract_publication_date(self, date_element):
+        """
+        Parse the publication date from a date element, preferring its datetime attribute.
+
+        Args:
+            date_element (bs4.element.Tag): Element holding the date, or None
+
+        Returns:
+            datetime: Parsed datetime object or None if parsing fails
+        """
+        if not date_element:
             return None
+
+        selector = date_element.name + ''.join(f'.{cls}' for cls in date_element.get('class', []))
+        if date_element.get('datetime'):
+            return self.parse_publication_date(date_element['datetime'], f'{selector}[datetime]')
+        return self.parse_publication_date(clean_text(date_element.text), selector)
+
+    def join_paragraphs(self, elements):
+        """
+        Clean paragraph elements, drop this source's boilerplate and join them into content.
+
+        Args:
+            elements (list): Paragraph elements of the article body
+
+        Returns:
+            str: Article content with paragraphs separated by blank lines
+        """
+        if self.defer_boilerplate:
+            # Pipeline parse workers leave filtering to the writer, which holds the source's learned counts
+            self.boilerplate_deferred = True
+            return clean_paragraphs(p.text for p in elements)
+        return clean_paragraphs((p.text for p in elements), source=self.source_name)
+
+    def filter_boilerplate(self, content, learn=True):
+        """
+        Drop this source's boilerplate from content extracted with ``defer_boilerplate`` set.
+        
+        Args:
+            content (str): Unfiltered article content
+            learn (bool): Count the article's paragraphs first; only for the article that is kept
+            
+        Returns:
+            str: Content without boilerplate paragraphs
+        """
+        boilerplate_filter = get_boilerplate_filter(self.source_name)
+        if not boilerplate_filter or not content:
+            return content
+        return '\n\n'.join(boilerplate_filter.filter(content.split('\n\n'), learn=learn))
     
     def article_exists(self, url):
         if not self.connection or not self.connection.is_connected():
@@ -136,8 +905,9 @@ class BaseScraper:
         try:
             cursor = self.connection.cursor()
             query = f"SELECT COUNT(*) FROM {self.table_name} WHERE url = %s"
-            cursor.execute(query, (url,))
-            count = cursor.fetchone()[0]
+            with DB_SECONDS.time(operation='exists', **self.metric_labels()):
+                cursor.execute(query, (url,))
+                count = cursor.fetchone()[0]
             cursor.close()
             return count > 0
         except Exception as e:
@@ -150,8 +920,8 @@ class BaseScraper:
             return False
             
         # Check if the article already exists
-        if self.article_exists(article_data['url']):
-            self.logger.info(f"Article already exists: {article_data['url']}")
+        if self.article_exists(article_data.url):
+            self.logger.info(f"Article already exists: {article_data.url}")
             return self.update_article(article_data)
             
         try:
@@ -160,31 +930,119 @@ class BaseScraper:
             # Insert new article
             query = f"""
             INSERT INTO {self.table_name} 
-            (url, title, publication_date, author, content, category) 
-            VALUES (%s, %s, %s, %s, %s, %s)
+            (url, title, publication_date, author_id, content, content_compressed, category_id) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
             """
             
-            values = (
-                article_data['url'],
-                article_data['title'],
-                article_data['publication_date'],
-                article_data['author'],
-                article_data['content'],
-                article_data['category']
-            )
+            url, title, publication_date, author, content, category = article_data.db_values()
+            author_id, category_id = article_dimension_ids(self.connection, author, category)
+            content, content_compressed = encode_content(self.connection, self.source_name, content)
+            values = (url, title, publication_date, author_id, content, content_compressed, category_id)
             
-            cursor.execute(query, values)
-            self.connection.commit()
+            with DB_SECONDS.time(operation='insert', **self.metric_labels()):
+                cursor.execute(query, values)
+                if rollups_enabled():
+                    apply_articles(cursor, self.source_name, "url = %s", (url,))
+                self.connection.commit()
             cursor.close()
             
-            self.logger.info(f"Article saved: {article_data['title']}")
+            ARTICLES.inc(result='new', **self.metric_labels())
+            self.articles_saved += 1
+            self.logger.info(f"Article saved: {article_data.title}")
             self.update_metadata(1, 0)
+            self.record_trends(article_data)
             return True
         except Exception as e:
             self.connection.rollback()
+            ERRORS.inc(stage='db', **self.metric_labels())
             self.logger.error(f"Error saving article: {e}")
             return False
     
+    def save_articles(self, articles):
+        """
+        Save a batch of articles, inserting the new ones in one transaction.
+        
+        Articles already stored are updated one by one as ``save_article``
+        would. If the batch insert fails, each article is saved on its own so
+        one bad row does not lose the rest.
+        
+        Args:
+            articles (list): Extracted articles
+            
+        Returns:
+            int: Number of articles saved or updated
+        """
+        if not articles:
+            return 0
+        if not self.connection or not self.connection.is_connected():
+            self.logger.error("Database conn not initialized")
+            return 0
+        
+        by_url = {article.url: article for article in articles}
+        urls = list(by_url)
+        placeholders = ', '.join(['%s'] * len(urls))
+        try:
+            cursor = self.connection.cursor()
+            with DB_SECONDS.time(operation='insert_batch', **self.metric_labels()):
+                cursor.execute(f"SELECT url FROM {self.table_name} WHERE url IN ({placeholders})", urls)
+                existing = {row[0] for row in cursor.fetchall()}
+                new_urls = [url for url in urls if url not in existing]
+                values = []
+                for url in new_urls:
+                    url, title, publication_date, author, content, category = by_url[url].db_values()
+                    author_id, category_id = article_dimension_ids(self.connection, author, category)
+                    content, content_compressed = encode_content(self.connection, self.source_name, content)
+                    values.append((url, title, publication_date, author_id, content, content_compressed, category_id))
+                if values:
+                    cursor.executemany(f"""
+                    INSERT INTO {self.table_name} 
+                    (url, title, publication_date, author_id, content, content_compressed, category_id) 
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, values)
+                    if rollups_enabled():
+                        apply_articles(cursor, self.source_name, f"url IN ({', '.join(['%s'] * len(new_urls))})",
+                                       tuple(new_urls))
+                self.connection.commit()
+            cursor.close()
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Error saving batch of {len(urls)} articles, saving them one by one: {e}")
+            return self.write_saved([article for article in by_url.values() if self.save_article(article)])
+        
+        for url in new_urls:
+            ARTICLES.inc(result='new', **self.metric_labels())
+            self.articles_saved += 1
+            self.logger.info(f"Article saved: {by_url[url].title}")
+            self.record_trends(by_url[url])
+        if new_urls:
+            self.update_metadata(len(new_urls), 0)
+        updated = [by_url[url] for url in urls if url in existing and self.update_article(by_url[url])]
+        return self.write_saved([by_url[url] for url in new_urls] + updated)
+    
+    def write_saved(self, articles):
+        """
+        Write saved articles to the scraper's article file, if it keeps one.
+        
+        Args:
+            articles (list): Articles saved or updated
+            
+        Returns:
+            int: Number of articles
+        """
+        if self.article_writer:
+            for article in articles:
+                self.article_writer.write(article)
+        return len(articles)
+    
+    def record_trends(self, article_data):
+        """Count a newly saved article into this source's trending terms."""
+        tracker = get_trend_tracker(self.source_name)
+        if not tracker:
+            return
+        tracker.add_article(article_data.title, article_data.content, article_data.publication_date)
+        if self.articles_saved % TRENDING_SETTINGS['save_every'] == 0:
+            tracker.save()
+
     def update_article(self, article_data):
         if not self.connection or not self.connection.is_connected():
             self.logger.error("Database conn initialized")
@@ -196,28 +1054,32 @@ class BaseScraper:
             # Update existing article
             query = f"""
             UPDATE {self.table_name} 
-            SET title = %s, publication_date = %s, author = %s, content = %s, category = %s
+            SET title = %s, publication_date = %s, author_id = %s, content = %s, content_compressed = %s, category_id = %s
             WHERE url = %s
             """
             
-            values = (
-                article_data['title'],
-                article_data['publication_date'],
-                article_data['author'],
-                article_data['content'],
-                article_data['category'],
-                article_data['url']
-            )
+            url, title, publication_date, author, content, category = article_data.db_values()
+            author_id, category_id = article_dimension_ids(self.connection, author, category)
+            content, content_compressed = encode_content(self.connection, self.source_name, content)
+            values = (title, publication_date, author_id, content, content_compressed, category_id, url)
             
-            cursor.execute(query, values)
-            self.connection.commit()
+            with DB_SECONDS.time(operation='update', **self.metric_labels()):
+                # Move the article's counts if its category, date or author changed
+                if rollups_enabled():
+                    apply_articles(cursor, self.source_name, "url = %s", (url,), sign=-1)
+                cursor.execute(query, values)
+                if rollups_enabled():
+                    apply_articles(cursor, self.source_name, "url = %s", (url,))
+                self.connection.commit()
             cursor.close()
             
-            self.logger.info(f"Article updated: {article_data['title']}")
+            ARTICLES.inc(result='updated', **self.metric_labels())
+            self.logger.info(f"Article updated: {article_data.title}")
             self.update_metadata(0, 1)
             return True
         except Exception as e:
             self.connection.rollback()
+            ERRORS.inc(stage='db', **self.metric_labels())
             self.logger.error(f"Error updating article: {e}")
             return False
     
@@ -227,6 +1089,7 @@ class BaseScraper:
             return False
             
         try:
+            start = time.perf_counter()
             cursor = self.connection.cursor()
             
             # Check if metadata entry exists
@@ -256,6 +1119,7 @@ class BaseScraper:
                 
             self.connection.commit()
             cursor.close()
+            DB_SECONDS.observe(time.perf_counter() - start, operation='metadata', **self.metric_labels())
             return True
         except Exception as e:
             self.connection.rollback()
@@ -270,6 +1134,9 @@ class BaseScraper:
         Run the full scraping process.
         """
         success = False
+        if METRICS_SETTINGS.get('http_port'):
+            start_http_server(METRICS_SETTINGS['http_port'])
+        
         try:
             # Initialize resources
             if not self.initialize_webdriver():
@@ -281,7 +1148,11 @@ class BaseScraper:
             
             # Run the scraping process
             self.logger.info(f"Starting scraping for {self.source_name}")
-            success = self.scrape()
+            trips = self.breaker.trips
+            success = self.scrape_pipeline() if self.use_pipeline else self.scrape()
+            if self.breaker.trips > trips:
+                # Already recorded as failed when the breaker opened
+                success = False
             
             # Update final status
             if success:
@@ -300,5 +1171,36 @@ class BaseScraper:
             # Clean up resources
             self.close_webdriver()
             self.close_db()
+
+            # Keep learned boilerplate and trending counts for the next run
+            boilerplate_filter = get_boilerplate_filter(self.source_name)
+            if boilerplate_filter:
+                boilerplate_filter.save()
+            trend_tracker = get_trend_tracker(self.source_name)
+            if trend_tracker:
+                trend_tracker.save()
+            
+            self.report_page_weight()
+            self.report_variants()
+            self.export_metrics()
             
-        return success
\ No newline at end of file
+        return success
+    
+    def export_metrics(self):
+        """Log a per-phase timing summary and write this source's metrics textfile."""
+        labels = {'source': self.source_name}
+        phases = []
+        for name, histogram in (('fetch', FETCH_SECONDS), ('wait', WAIT_SECONDS), ('parse', PARSE_SECONDS),
+                                ('extract', EXTRACT_SECONDS), ('db', DB_SECONDS)):
+            count, total = histogram.summary(**labels)
+            phases.append(f"{name} {total:.1f}s/{count}")
+        self.logger.info(f"Phase timings for {self.source_name}: {', '.join(phases)}")
+        self.logger.info(f"Browser for {self.source_name}: peak memory {self.peak_browser_memory / 1024 / 1024:.0f} MB, "
+                         f"{self.driver_restarts} restarts")
+        
+        textfile_dir = METRICS_SETTINGS.get('textfile_dir')
+        if textfile_dir:
+            try:
+                REGISTRY.write_textfile(os.path.join(textfile_dir, f"scraper_{self.source_name}.prom"), match=labels)
+            except OSError as e:
+                self.logger.error(f"Error writing metrics textfile: {e}")
@@ -0,0 +1,125 @@
+"""
+Yield-aware article budget allocation for the Kenya news scraping project.
+
+A category's yield is the number of new articles saved per page fetched for
+it, listing page included. Yields are kept per source and category as
+exponentially decayed totals. Each run draws a yield for every category from
+its Beta posterior (Thompson sampling), so categories that produced new
+articles are visited first while rarely tried ones still win a draw now and
+then; within a source the budget follows that order. Sources, which run
+independently, get budget shares in proportion to their draws. Parallel
+sources share one stats file: each save re-reads it under a lock and replaces
+only the categories this process updated.
+"""
+import os
+import json
+import random
+
+from config.settings import BUDGET_SETTINGS
+from utils.file_lock import file_lock
+
+
+class YieldStats:
+    """Decayed pages, new articles and seconds per source and category, stored as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or BUDGET_SETTINGS['stats_file']
+        self.data = self._read()
+        self.changed = set()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def entry(self, source, category=None):
+        """
+        Totals for one category, or summed over a source's categories.
+
+        Returns:
+            dict: ``pages``, ``new`` and ``seconds``
+        """
+        categories = self.data.get(source, {})
+        if category is not None:
+            return categories.get(category, {'pages': 0.0, 'new': 0.0, 'seconds': 0.0})
+        totals = {'pages': 0.0, 'new': 0.0, 'seconds': 0.0}
+        for entry in categories.values():
+            for key in totals:
+                totals[key] += entry[key]
+        return totals
+
+    def update(self, source, category, pages, new_articles, seconds):
+        """Fold one visit to a category into its decayed totals."""
+        decay = BUDGET_SETTINGS['decay']
+        entry = self.data.setdefault(source, {}).setdefault(category, {'pages': 0.0, 'new': 0.0, 'seconds': 0.0})
+        entry['pages'] = entry['pages'] * decay + pages
+        entry['new'] = entry['new'] * decay + new_articles
+        entry['seconds'] = entry['seconds'] * decay + seconds
+        self.changed.add((source, category))
+
+    def sample(self, source, category=None, rng=random):
+        """Draw a yield from the Beta posterior of a category (or of a whole source)."""
+        entry = self.entry(source, category)
+        new = min(entry['new'], entry['pages'])
+        return rng.betavariate(new + 1, entry['pages'] - new + 1)
+
+    def seconds_per_page(self, source, category):
+        """Average seconds per page fetched for a category, or None before its first visit."""
+        entry = self.entry(source, category)
+        return entry['seconds'] / entry['pages'] if entry['pages'] else None
+
+    def save(self):
+        """
+        Write the categories updated here into the stats file, replacing it atomically.
+
+        The file is re-read under a lock first, so the categories other
+        processes saved since it was loaded are kept.
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with file_lock(f"{self.path}.lock"):
+            data = self._read()
+            for source, category in self.changed:
+                data.setdefault(source, {})[category] = self.data[source][category]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        self.data = data
+        self.changed = set()
+
+
+def share(budget, weight, weights):
+    """Round ``budget * weight / sum(weights)``, splitting evenly if every weight is 0."""
+    total = sum(weights)
+    if total <= 0:
+        return budget // max(len(weights), 1)
+    return int(round(budget * weight / total))
+
+
+def source_budgets(sources, total_articles, stats=None):
+    """
+    Split a run's article budget across sources by sampled yield.
+
+    Args:
+        sources (list): Source names
+        total_articles (int): Articles to aim for across all sources
+        stats (YieldStats): Yield history (optional)
+
+    Returns:
+        dict: Article budget per source; every source gets at least one
+    """
+    stats = stats or YieldStats()
+    samples = {source: stats.sample(source) for source in sources}
+    budgets = {}
+    remaining = total_articles
+    order = sorted(sources, key=samples.get, reverse=True)
+    for i, source in enumerate(order):
+        rest = order[i:]
+        budget = remaining if len(rest) == 1 else share(remaining, samples[source], [samples[s] for s in rest])
+        budgets[source] = max(1, budget)
+        remaining = max(remaining - budget, 0)
+    return budgets
@@ -9,9 +9,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
+from database.models import Article
 from scrapers.base_scraper import BaseScraper
 from utils.text_cleaner import clean_text
-from utils.date_parser import parse_date
 
 
 class CitizenScraper(BaseScraper):
@@ -21,6 +21,11 @@ class CitizenScraper(BaseScraper):
         """Initialize the Citizen scraper."""
         super().__init__('citizen')
         self.base_url = 'https://www.citizen.digital'
+        self.article_wait_time = 6  # Longer wait time to ensure article pages load
+        self.listing_wait_time = 8  # Longer wait time for page to load
+        self.article_url_patterns = [
+            r'/[a-z0-9-]+-n\d+/?$'  # /news/some-headline-n360455
+        ]
         self.categories = [
             'news',
             'business',
@@ -29,24 +34,17 @@ class CitizenScraper(BaseScraper):
             'entertainment'
         ]
     
-    def scrape_article_page(self, url):
+    def extract_article(self, soup, url):
         """
-        Scrape a single article page.
+        Extract article data from a loaded article page.
         
         Args:
-            url (str): URL of the article to scrape
+            soup (BeautifulSoup): Parsed article page
+            url (str): URL of the article
             
         Returns:
-            dict: Article data or None if failed
+            Article: Extracted article, or None if failed
         """
-        if self.article_exists(url):
-            self.logger.info(f"Article already exists: {url}")
-            return None
-            
-        soup = self.get_soup(url, wait_time=6)  # Longer wait time to ensure page loads
-        if not soup:
-            return None
-            
         try:
             # Extract article title - Citizen has desktop and mobile title variations
             title_element = soup.select_one('h1.title-on-desktop a') or soup.select_one('h1.title-on-mobile a')
@@ -61,10 +59,7 @@ class CitizenScraper(BaseScraper):
             
             # Extract publication date
             date_element = soup.select_one('span.timepublished') or soup.select_one('.article-date')
-            publication_date = None
-            if date_element:
-                date_text = clean_text(date_element.text)
-                publication_date = parse_date(date_text)
+            publication_date = self.extract_publication_date(date_element)
             
             # Extract author - Citizen often uses "Citizen Digital" as default author
             author_element = soup.select_one('.article-author')
@@ -76,21 +71,22 @@ class CitizenScraper(BaseScraper):
                 # Try alternative content containers
                 content_elements = soup.select('div.topstory-excerpt p')
             
-            content = '\n\n'.join([clean_text(p.text) for p in content_elements if p.text.strip()])
+            content = self.join_paragraphs(content_elements)
             
             # Extract category
             category_element = soup.select_one('.next-topstory-tags span:first-child') or soup.select_one('.article-category')
             category = clean_text(category_element.text) if category_element else "News"
             
             # Create article data
-            article_data = {
-                'url': url,
-                'title': title,
-                'publication_date': publication_date,
-                'author': author,
-                'content': content,
-                'category': category
-            }
+            article_data = Article(
+                url=url,
+                title=title,
+                publication_date=publication_date,
+                author=author,
+                content=content,
+                category=category,
+                source=self.source_name
+            )
             
             return article_data
             
@@ -98,6 +94,46 @@ class CitizenScraper(BaseScraper):
             self.logger.error(f"Error scraping article {url}: {e}")
             return None
     
+    def select_article_links(self, soup):
+        """
+        Find article links on a category listing page with CSS selectors.
+        
+        Only used when no link matches ``article_url_patterns``.
+        
+        Args:
+            soup (BeautifulSoup): Parsed listing page
+            
+        Returns:
+            list: Unique absolute article URLs in page order
+        """
+        article_links = []
+        
+        # Citizen specific article selectors:
+        # 1. Main pinned story 
+        main_story_element = soup.select_one('.main-pinned-story a')
+        if main_story_element and main_story_element.get('href'):
+            article_links.append(main_story_element.get('href'))
+        
+        # 2. Other pinned stories
+        other_stories = soup.select('.other-pinned-stories h3 a')
+        for story in other_stories:
+            if story.get('href'):
+                article_links.append(story.get('href'))
+        
+        # 3. Featured stories
+        featured_stories = soup.select('.topstory.featuredstory h1 a')
+        for story in featured_stories:
+            if story.get('href'):
+                article_links.append(story.get('href'))
+        
+        # 4. Additional story cards
+        story_cards = soup.select('.article-card a') or soup.select('.story-card a')
+        for card in story_cards:
+            if card.get('href'):
+                article_links.append(card.get('href'))
+        
+        return self.absolute_links(article_links)
+    
     def scrape_category(self, category):
         """
         Scrape articles from a specific category.
@@ -108,52 +144,18 @@ class CitizenScraper(BaseScraper):
         Returns:
             int: Number of articles scraped
         """
+        self.current_category = category
         url = f"{self.base_url}/{category}"
         self.logger.info(f"Scraping category: {category} from {url}")
         
-        soup = self.get_soup(url, wait_time=8)  # Longer wait time for page to load
+        soup = self.get_soup(url, wait_time=self.listing_wait_time)
         if not soup:
             return 0
             
         articles_count = 0
         
         try:
-            # Find all article links on the page
-            article_links = []
-            
-            # Citizen specific article selectors:
-            # 1. Main pinned story 
-            main_story_element = soup.select_one('.main-pinned-story a')
-            if main_story_element and main_story_element.get('href'):
-                article_links.append(main_story_element.get('href'))
-            
-            # 2. Other pinned stories
-            other_stories = soup.select('.other-pinned-stories h3 a')
-            for story in other_stories:
-                if story.get('href'):
-                    article_links.append(story.get('href'))
-            
-            # 3. Featured stories
-            featured_stories = soup.select('.topstory.featuredstory h1 a')
-            for story in featured_stories:
-                if story.get('href'):
-                    article_links.append(story.get('href'))
-            
-            # 4. Additional story cards
-            story_cards = soup.select('.article-card a') or soup.select('.story-card a')
-            for card in story_cards:
-                if card.get('href'):
-                    article_links.append(card.get('href'))
-            
-            # Make sure all links are absolute URLs
-            absolute_links = []
-            for link in article_links:
-                if not link.startswith('http'):
-                    link = self.base_url + link if link.startswith('/') else self.base_url + '/' + link
-                absolute_links.append(link)
-            
-            # Remove duplicate links
-            absolute_links = list(set(absolute_links))
+            absolute_links = self.find_article_links(soup)
             
             # Log the number of articles found
             self.logger.info(f"Found {len(absolute_links)} articles in {category}")
@@ -173,6 +175,10 @@ class CitizenScraper(BaseScraper):
             self.logger.error(f"Error scraping category {category}: {e}")
             return articles_count
     
+    def pipeline_categories(self):
+        """Every category, with the same limit of 15 articles as ``scrape_category``."""
+        return ((category, 15) for category in self.categories)
+    
     def scrape(self):
         """
         Implement the scraping process for Citizen TV News.
@@ -0,0 +1,412 @@
+"""
+Staged fetch, parse and store pipeline for the scrapers.
+
+In pipeline mode a scraper's article pages flow through three stages joined
+by bounded queues, so page loads, parsing and database writes overlap:
+
+- fetch: worker threads, each driving its own browser (or fetching the
+  article's variant over HTTP), hand page HTML to the parse stage
+- parse: a process pool builds the soup and runs the source's
+  ``extract_article``; boilerplate filtering is left to the writer, which
+  holds the source's learned counts
+- store: the scraper's own thread saves the articles in batches
+
+Links are queued only while the fetch queue is below its limit, and fetchers
+wait for a free parse slot before handing a page on, so a slow stage holds
+back the ones before it instead of piling pages up in memory. Queue depths
+and each stage's busy share are exported as metrics and logged when the
+pipeline closes.
+"""
+import os
+import copy
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from config.settings import PIPELINE_SETTINGS, VARIANT_SETTINGS
+from scrapers.base_scraper import ERRORS, EXTRACT_SECONDS, FETCH_SECONDS, PARSE_SECONDS
+from utils.http import fetch_url
+from utils.metrics import REGISTRY
+from utils.variants import find_variant_link
+
+
+QUEUE_DEPTH = REGISTRY.gauge('scraper_pipeline_queue_depth', 'Items waiting for each pipeline stage')
+STAGE_BUSY = REGISTRY.counter('scraper_pipeline_busy_seconds_total', 'Seconds pipeline stage workers spent working')
+STAGE_UTILISATION = REGISTRY.gauge('scraper_pipeline_utilisation', 'Busy share of each pipeline stage over the last run')
+
+STAGES = ('fetch', 'parse', 'store')
+
+_parser = None
+
+
+def _init_parser(source, base_url):
+    """Create the scraper a parse worker extracts articles with."""
+    global _parser
+    from scrapers.registry import get_scraper_class
+    _parser = get_scraper_class(source)()
+    _parser.base_url = base_url
+    _parser.defer_boilerplate = True
+
+
+def parse_page(url, html, fetched_at, find_variant):
+    """
+    Parse one page and extract its article. Runs inside pool workers.
+
+    Args:
+        url (str): Article URL
+        html (str): Page HTML
+        fetched_at (datetime): When the page was loaded, for relative dates
+        find_variant (bool): Also look for the page's variant link
+
+    Returns:
+        tuple: Article (or None), whether boilerplate filtering was deferred,
+        the variant URL linked from the page (or None), and the seconds spent
+        parsing and extracting
+    """
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, 'html.parser')
+    parsed = time.perf_counter()
+    _parser.last_fetch_time = fetched_at
+    _parser.boilerplate_deferred = False
+    article = _parser.extract_article(soup, url)
+    variant_url = find_variant_link(soup, url) if find_variant else None
+    return article, _parser.boilerplate_deferred, variant_url, parsed - start, time.perf_counter() - parsed
+
+
+class ScrapePipeline:
+    """Fetch, parse and store stages for one scraper's article pages."""
+
+    def __init__(self, scraper, settings=None):
+        """
+        Args:
+            scraper (BaseScraper): Scraper whose articles to fetch; it also
+                loads the listing pages and writes the articles
+            settings (dict): Stage sizes (defaults to PIPELINE_SETTINGS)
+        """
+        settings = settings or PIPELINE_SETTINGS
+        self.scraper = scraper
+        self.logger = scraper.logger
+        self.fetch_workers = settings['fetch_workers']
+        self.parse_workers = settings.get('parse_workers') or os.cpu_count() or 1
+        self.fetch_limit = settings['fetch_queue']
+        self.parse_slots = threading.BoundedSemaphore(settings['parse_queue'])
+        self.write_batch = settings['write_batch']
+        self.flush_seconds = settings['flush_seconds']
+        self.article_delay = settings['article_delay']
+
+        self.links = queue.Queue()
+        self.results = queue.Queue()
+        self.pool = None
+        self.fetchers = []
+        self.threads = []
+        self.stopping = False
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.busy = dict.fromkeys(STAGES, 0.0)
+        self.depths = {stage: [0, 0] for stage in STAGES}
+        self.started = None
+        self.stats = {}
+
+    def start(self):
+        """
+        Start the parse pool and the fetch workers, each with its own browser.
+
+        Returns:
+            bool: False if no fetch worker could start a browser
+        """
+        scraper = self.scraper
+        self.pool = ProcessPoolExecutor(max_workers=self.parse_workers, initializer=_init_parser,
+                                        initargs=(scraper.source_name, scraper.base_url))
+        # Start the pool's processes before any fetch thread exists
+        self.pool.submit(os.getpid).result()
+
+        for _ in range(self.fetch_workers):
+            fetcher = copy.copy(scraper)
+            fetcher.driver = None
+            fetcher.pages_fetched = 0
+            fetcher.pages_counted = 0
+            fetcher.driver_pages = 0
+            fetcher.driver_restarts = 0
+            fetcher.peak_browser_memory = 0
+            fetcher.page_weight = {'pages': 0, 'bytes': 0, 'seconds': 0.0}
+            fetcher.startup_seconds = {}
+            # The database connection is not thread-safe: only the writer uses it, and a
+            # fetcher's metadata updates (such as a tripped breaker) are handed to the writer
+            fetcher.connection = None
+            fetcher.update_metadata = self._queue_metadata
+            if fetcher.initialize_webdriver():
+                self.fetchers.append(fetcher)
+        if not self.fetchers:
+            self.logger.error(f"No pipeline fetch worker could start a browser for {scraper.source_name}")
+            return False
+
+        for i, fetcher in enumerate(self.fetchers):
+            thread = threading.Thread(target=self._fetch_loop, args=(fetcher,), daemon=True,
+                                      name=f"fetch-{scraper.source_name}-{i}")
+            thread.start()
+            self.threads.append(thread)
+        self.started = time.perf_counter()
+        self.logger.info(f"Pipeline started for {scraper.source_name}: {len(self.fetchers)} fetch workers, "
+                         f"{self.parse_workers} parse processes")
+        return True
+
+    def crawl(self, category, links, limit):
+        """
+        Scrape a category's article links through the pipeline.
+
+        Links are handed to the fetchers only while the fetch queue is below
+        its limit and the articles in flight could still be needed, so no more
+        than ``limit`` articles are saved.
+
+        Args:
+            category (str): Category the links were found in
+            links (list): Article URLs not stored yet
+            limit (int): Maximum number of articles to save
+
+        Returns:
+            int: Number of articles saved
+        """
+        for fetcher in self.fetchers:
+            fetcher.current_category = category
+
+        pending = deque(links)
+        in_flight = 0
+        saved = 0
+        batch = []
+        batch_started = None
+        while pending or in_flight:
+            while pending and self.links.qsize() < self.fetch_limit and saved + in_flight < limit:
+                self.links.put((pending.popleft(), False))
+                in_flight += 1
+            if not in_flight:
+                break
+
+            wait = self.flush_seconds - (time.monotonic() - batch_started) if batch else self.flush_seconds
+            try:
+                result = self.results.get(timeout=max(wait, 0.01))
+            except queue.Empty:
+                article, refetch = None, None
+            else:
+                if self._apply_metadata(result):
+                    continue
+                article, refetch = self._collect(result)
+                if article:
+                    batch.append(article)
+                    batch_started = batch_started or time.monotonic()
+                elif refetch:
+                    self.links.put((refetch, True))
+                else:
+                    in_flight -= 1
+            self._sample_depths(len(batch))
+
+            # Write when the batch is full, has waited long enough, or nothing else is coming
+            if batch and (len(batch) >= self.write_batch or len(batch) == in_flight
+                          or time.monotonic() - batch_started >= self.flush_seconds):
+                start = time.perf_counter()
+                saved += self.scraper.save_articles(batch)
+                self._add_busy('store', time.perf_counter() - start)
+                in_flight -= len(batch)
+                batch = []
+                batch_started = None
+        # Counted per category, so the budget's yield stats see the article pages too
+        self._count_pages()
+        return saved
+
+    def close(self):
+        """Stop the workers, close their browsers and report how busy each stage was."""
+        self.stopping = True
+        try:
+            while True:
+                self.links.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in self.threads:
+            self.links.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+        try:
+            while True:
+                self._apply_metadata(self.results.get_nowait())
+        except queue.Empty:
+            pass
+
+        self._count_pages()
+        scraper = self.scraper
+        for fetcher in self.fetchers:
+            fetcher.close_webdriver()
+            scraper.driver_restarts += fetcher.driver_restarts
+            scraper.peak_browser_memory += fetcher.peak_browser_memory
+            for key, value in fetcher.page_weight.items():
+                scraper.page_weight[key] += value
+        if self.started is not None:
+            self.report()
+
+    def report(self):
+        """Set the utilisation gauges and log each stage's busy share and average queue depth."""
+        seconds = time.perf_counter() - self.started
+        capacity = {'fetch': len(self.fetchers), 'parse': self.parse_workers, 'store': 1}
+        source = self.scraper.source_name
+        parts = []
+        for stage in STAGES:
+            utilisation = self.busy[stage] / (seconds * capacity[stage]) if seconds else 0.0
+            total, samples = self.depths[stage]
+            depth = total / samples if samples else 0.0
+            STAGE_UTILISATION.set(utilisation, source=source, stage=stage)
+            self.stats[stage] = {'workers': capacity[stage], 'utilisation': utilisation, 'queue_depth': depth}
+            parts.append(f"{stage} {utilisation * 100:.0f}% busy x{capacity[stage]}, queue {depth:.1f}")
+        self.scraper.pipeline_stats = self.stats
+        self.logger.info(f"Pipeline for {source} over {seconds:.1f}s: " + '; '.join(parts))
+
+    def _count_pages(self):
+        """Add the pages the fetchers loaded since the last call to the scraper's count."""
+        for fetcher in self.fetchers:
+            pages = fetcher.pages_fetched
+            self.scraper.pages_fetched += pages - fetcher.pages_counted
+            fetcher.pages_counted = pages
+
+    def _queue_metadata(self, articles_added=0, articles_updated=0, status='success'):
+        """A fetcher's ``update_metadata``: queue the update for the writer thread."""
+        self.results.put(({'metadata': (articles_added, articles_updated, status)}, None))
+        return True
+
+    def _apply_metadata(self, result):
+        """Apply a queued metadata update on the writer thread; False if the result is a page."""
+        page, _ = result
+        if 'metadata' not in page:
+            return False
+        self.scraper.update_metadata(*page['metadata'])
+        return True
+
+    def _fetch_loop(self, fetcher):
+        while True:
+            item = self.links.get()
+            if item is None:
+                break
+            url, full = item
+            start = time.perf_counter()
+            try:
+                page = self._fetch(fetcher, url, full)
+            except Exception as e:
+                self.logger.error(f"Error fetching {url} in pipeline: {e}")
+                page = {'url': url, 'html': None, 'variant_url': None, 'variant_error': False}
+            self._add_busy('fetch', time.perf_counter() - start)
+
+            future = None
+            if page['html'] is not None:
+                # Wait for room in the parse stage; this is what holds fetching back
+                while not self.parse_slots.acquire(timeout=1):
+                    if self.stopping:
+                        break
+                else:
+                    with self.lock:
+                        self.submitted += 1
+                    future = self.pool.submit(parse_page, url, page['html'], page['fetched_at'],
+                                              page['find_variant'])
+                    page['html'] = None
+            if future is None:
+                self.results.put((page, None))
+            else:
+                future.add_done_callback(lambda f, page=page: self._parsed(page, f))
+            if self.article_delay:
+                time.sleep(self.article_delay)
+
+    def _fetch(self, fetcher, url, full):
+        scraper = self.scraper
+        page = {'url': url, 'html': None, 'variant_url': None, 'variant_error': False, 'transferred': 0}
+
+        if not full and scraper.use_variants:
+            variant_url = scraper.variant_url(url)
+            if variant_url and scraper.breaker.allow():
+                page['variant_url'] = variant_url
+                try:
+                    start = time.perf_counter()
+                    html, transferred = fetch_url(variant_url, timeout=VARIANT_SETTINGS['timeout'])
+                    FETCH_SECONDS.observe(time.perf_counter() - start, **fetcher.metric_labels())
+                    fetcher.pages_fetched += 1
+                    page.update(html=html, transferred=transferred, fetched_at=datetime.now(), find_variant=False)
+                    return page
+                except Exception as e:
+                    self.logger.debug(f"Variant {variant_url} failed: {e}")
+                    page['variant_error'] = True
+
+        page['html'] = fetcher.get_soup(url, wait_time=fetcher.article_wait_time, parse=False)
+        page['fetched_at'] = fetcher.last_fetch_time
+        page['find_variant'] = scraper.use_variants and not scraper.variant_template
+        page['full'] = True
+        return page
+
+    def _parsed(self, page, future):
+        with self.lock:
+            self.completed += 1
+        self.results.put((page, future))
+
+    def _collect(self, result):
+        """
+        Take one fetched page off the results queue.
+
+        Returns:
+            tuple: The extracted article (or None), and the URL to load again
+            as a full page if its variant was not usable (or None)
+        """
+        page, future = result
+        scraper = self.scraper
+        if page['variant_error']:
+            scraper.record_variant('error', page['variant_url'])
+        if future is None:
+            return None, None
+
+        self.parse_slots.release()
+        labels = scraper.metric_labels()
+        try:
+            article, deferred, variant_url, parse_seconds, extract_seconds = future.result()
+        except Exception as e:
+            ERRORS.inc(stage='extract', **labels)
+            self.logger.error(f"Error parsing {page['url']} in pipeline: {e}")
+            return None, None
+        PARSE_SECONDS.observe(parse_seconds, **labels)
+        EXTRACT_SECONDS.observe(extract_seconds, **labels)
+        self._add_busy('parse', parse_seconds + extract_seconds)
+
+        # Boilerplate is only learned from the article that is kept: a variant
+        # is checked with learning off, and filtered again once it is accepted
+        content = article.content if article and deferred else None
+        if not page.get('full'):
+            if content:
+                article.content = scraper.filter_boilerplate(content, learn=False)
+            result = 'hit' if scraper.is_complete(article) else 'incomplete'
+            if not scraper.record_variant(result, page['variant_url'], page['transferred']):
+                return None, page['url']
+            if content:
+                article.content = scraper.filter_boilerplate(content)
+            return article, None
+
+        if content:
+            article.content = scraper.filter_boilerplate(content)
+        if variant_url:
+            scraper.learn_variant_link(page['url'], variant_url)
+        if not article:
+            ERRORS.inc(stage='extract', **labels)
+        return article, None
+
+    def _add_busy(self, stage, seconds):
+        with self.lock:
+            self.busy[stage] += seconds
+        STAGE_BUSY.inc(seconds, source=self.scraper.source_name, stage=stage)
+
+    def _sample_depths(self, batch_size):
+        with self.lock:
+            parsing = self.submitted - self.completed
+        depths = {'fetch': self.links.qsize(), 'parse': parsing, 'store': self.results.qsize() + batch_size}
+        source = self.scraper.source_name
+        for stage, depth in depths.items():
+            QUEUE_DEPTH.set(depth, source=source, stage=stage)
+            self.depths[stage][0] += depth
+            self.depths[stage][1] += 1
@@ -0,0 +1,245 @@
+"""
+Queue-based crawling: discover article links once, fetch them with many workers.
+
+Usage:
+    python -m scrapers.queue_worker discover [--sources star tuko]
+    python -m scrapers.queue_worker work     [--sources star tuko] [--processes 4] [--exit-when-idle]
+    python -m scrapers.queue_worker status   [--sources star tuko]
+    python -m scrapers.queue_worker requeue  [--sources star tuko]
+
+``discover`` loads each category listing and queues links that are not yet
+stored. ``work`` claims queued links and runs the scraper's usual
+``scrape_article_page`` and ``save_article``; start it on as many hosts and
+processes as needed, all pointing at the same database. ``requeue`` gives
+dead-lettered jobs another set of attempts.
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to sys.path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import NEWS_SOURCES, QUEUE_SETTINGS
+from database.jobs import claim_job, complete_job, enqueue_jobs, fail_job, queue_stats, requeue_dead_jobs
+from scrapers.base_scraper import DB_SECONDS
+from scrapers.registry import get_scraper_class
+from utils.logger import setup_logger, stop_listeners
+from utils.metrics import REGISTRY
+from utils.resilience import get_breaker
+from utils.text_cleaner import get_boilerplate_filter
+from utils.trending import get_trend_tracker
+
+
+JOBS = REGISTRY.counter('scraper_jobs_total', 'Queued article jobs processed, by outcome')
+
+
+def discover(sources, logger):
+    """
+    Queue the article links found on every category page of the given sources.
+
+    Args:
+        sources (list): Sources to discover
+        logger (logging.Logger): Logger for progress messages
+
+    Returns:
+        int: Number of new jobs queued
+    """
+    queued = 0
+    for source in sources:
+        scraper = get_scraper_class(source)()
+        if not scraper.initialize_webdriver():
+            continue
+        if not scraper.initialize_db():
+            scraper.close_webdriver()
+            continue
+
+        try:
+            for category in scraper.categories:
+                links = scraper.discover_links(category)
+                if links is None:
+                    continue
+                new_links = [link for link in links if not scraper.article_exists(link)]
+                added = enqueue_jobs(scraper.connection, source, category, new_links)
+                queued += added
+                logger.info(f"{source}/{category}: {len(links)} links, {added} queued")
+        finally:
+            scraper.close_webdriver()
+            scraper.close_db()
+    return queued
+
+
+class QueueWorker:
+    """Claims queued article jobs and scrapes them with the matching source's scraper."""
+
+    def __init__(self, sources, logger, worker_id=None):
+        self.sources = list(sources)
+        self.logger = logger
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.connection = None
+        self.scrapers = {}
+
+    def get_scraper(self, source):
+        """Return this worker's scraper for a source, starting its browser on first use."""
+        scraper = self.scrapers.get(source)
+        if scraper is None:
+            scraper = get_scraper_class(source)()
+            if not scraper.initialize_webdriver():
+                return None
+            scraper.connection = self.connection
+            self.scrapers[source] = scraper
+        return scraper
+
+    def process(self, job):
+        """
+        Scrape and store one claimed job, then record its outcome.
+
+        Args:
+            job (dict): Job returned by ``claim_job``
+
+        Returns:
+            str: Outcome ('done', 'skipped', 'pending' for a scheduled retry, or 'dead')
+        """
+        try:
+            scraper = self.get_scraper(job['source'])
+            if scraper is None:
+                raise RuntimeError("WebDriver could not be started")
+            scraper.current_category = job['category']
+
+            if scraper.article_exists(job['url']):
+                complete_job(self.connection, job, self.worker_id)
+                return 'skipped'
+
+            article_data = scraper.scrape_article_page(job['url'])
+            if not article_data:
+                raise RuntimeError("Article could not be loaded or extracted")
+            if not scraper.save_article(article_data):
+                raise RuntimeError("Article could not be saved")
+
+            complete_job(self.connection, job, self.worker_id)
+            return 'done'
+        except Exception as e:
+            self.logger.error(f"Job {job['id']} ({job['url']}) failed on attempt {job['attempts']}: {e}")
+            return fail_job(self.connection, job, self.worker_id, e)
+
+    def run(self, exit_when_idle=False):
+        """
+        Claim and process jobs until interrupted, or until the queue is empty.
+
+        Args:
+            exit_when_idle (bool): Stop when no job is ready instead of polling
+
+        Returns:
+            dict: Number of jobs per outcome, or None if the database is unreachable
+        """
+        self.connection = get_connection()
+        if not self.connection:
+            self.logger.error("Failed to connect to database")
+            return None
+
+        outcomes = {}
+        try:
+            while True:
+                # Leave jobs of sources whose circuit breaker is open to other workers or later
+                sources = [source for source in self.sources if get_breaker(source).allow()]
+                job = None
+                if sources:
+                    with DB_SECONDS.time(operation='claim', source=','.join(self.sources), category=''):
+                        job = claim_job(self.connection, self.worker_id, sources)
+                if job is None:
+                    if exit_when_idle:
+                        break
+                    time.sleep(QUEUE_SETTINGS['poll_interval'])
+                    continue
+
+                outcome = self.process(job)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+                JOBS.inc(source=job['source'], result=outcome)
+        except KeyboardInterrupt:
+            self.logger.info("Worker interrupted; unfinished job will be retried after its lease expires")
+        finally:
+            self.close()
+
+        self.logger.info(f"Worker {self.worker_id} finished: {outcomes}")
+        return outcomes
+
+    def close(self):
+        """Shut down every browser and the database connection, keeping learned state and metrics."""
+        for source, scraper in self.scrapers.items():
+            scraper.close_webdriver()
+            boilerplate_filter = get_boilerplate_filter(source)
+            if boilerplate_filter:
+                boilerplate_filter.save()
+            trend_tracker = get_trend_tracker(source)
+            if trend_tracker:
+                trend_tracker.save()
+            scraper.report_page_weight()
+            scraper.report_variants()
+            scraper.export_metrics()
+        self.scrapers = {}
+        if self.connection and self.connection.is_connected():
+            self.connection.close()
+
+
+def get_worker_logger():
+    """Logger shared by discovery and every worker process on this host."""
+    return setup_logger('queue_worker', f"logs/queue_worker_{time.strftime('%Y%m%d')}.log")
+
+
+def run_worker(sources, exit_when_idle=False):
+    """Run one queue worker; the entry point for each process started by ``work``."""
+    logger = get_worker_logger()
+    try:
+        return QueueWorker(sources, logger).run(exit_when_idle)
+    finally:
+        stop_listeners()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl articles through the database job queue')
+    parser.add_argument('command', choices=['discover', 'work', 'status', 'requeue'])
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, choices=NEWS_SOURCES,
+                        help='Sources to process')
+    parser.add_argument('--processes', type=int, default=1, help='With work: worker processes on this host')
+    parser.add_argument('--exit-when-idle', action='store_true', help='With work: stop when the queue is empty')
+    args = parser.parse_args()
+
+    logger = get_worker_logger()
+
+    if args.command == 'discover':
+        logger.info(f"Queued {discover(args.sources, logger)} new article jobs")
+        return True
+
+    if args.command == 'work':
+        if args.processes <= 1:
+            return run_worker(args.sources, args.exit_when_idle) is not None
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            futures = [executor.submit(run_worker, args.sources, args.exit_when_idle)
+                       for _ in range(args.processes)]
+            for future in futures:
+                future.result()
+        return True
+
+    connection = get_connection()
+    if not connection:
+        logger.error("Failed to connect to database")
+        return False
+    try:
+        if args.command == 'requeue':
+            logger.info(f"Requeued {requeue_dead_jobs(connection, args.sources)} dead jobs")
+        else:
+            for source, counts in sorted(queue_stats(connection, args.sources).items()):
+                logger.info(f"{source}: " + ', '.join(f"{status} {count}" for status, count in sorted(counts.items())))
+    finally:
+        connection.close()
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
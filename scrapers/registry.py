@@ -0,0 +1,38 @@
+"""
+Registry of the available scrapers, imported only when a source is requested.
+
+Each entry names the module and class of a source's scraper, so running a
+single source does not import the modules of all the others.
+"""
+import importlib
+
+
+SCRAPER_PATHS = {
+    'citizen': 'scrapers.citizen:CitizenScraper',
+    'daily_nations': 'scrapers.daily_nations:DailyNationsScraper',
+    'standardmedia': 'scrapers.standardmedia:StandardMediaScraper',
+    'star': 'scrapers.star:StarScraper',
+    'tuko': 'scrapers.tuko_new:TukoScraper'
+}
+
+
+def available_sources():
+    """Names of all registered sources."""
+    return list(SCRAPER_PATHS)
+
+
+def get_scraper_class(source):
+    """
+    Import and return the scraper class for a source.
+
+    Args:
+        source (str): Source name, e.g. 'star'
+
+    Returns:
+        type: Scraper class
+
+    Raises:
+        KeyError: If the source is not registered
+    """
+    module_name, class_name = SCRAPER_PATHS[source].split(':')
+    return getattr(importlib.import_module(module_name), class_name)
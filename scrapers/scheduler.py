@@ -0,0 +1,294 @@
+"""
+Long-running crawl scheduler for the Kenya news scraping project.
+
+Every source/category pair has its own crawl interval. After each crawl the
+pair's rate of new articles per hour is updated as an exponentially weighted
+average, and the next interval is the time that rate needs to produce
+``SCHEDULE_SETTINGS['target_new_articles']`` new articles. Busy categories
+are therefore visited often and quiet ones rarely. Schedules are kept in the
+``crawl_schedule`` table, so a restarted daemon continues where it left off.
+
+Only links that were not on a category's listing at its previous crawl
+count as new, so articles left over from earlier crawls (past the per-run
+limit, or failing to extract) do not inflate the rate. A crawl that raises
+is logged and retried with a growing delay instead of stopping the daemon.
+
+Browsers and database connections stay open between crawls, and are reopened
+if they were dropped. A browser is only closed when its source has nothing
+due for a while.
+"""
+import os
+import sys
+import signal
+import threading
+from datetime import datetime, timedelta
+
+# Add parent directory to sys.path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.database import get_connection
+from config.settings import SCHEDULE_SETTINGS
+from utils.metrics import REGISTRY
+from utils.text_cleaner import get_boilerplate_filter
+from utils.trending import get_trend_tracker
+
+
+INTERVAL_SECONDS = REGISTRY.gauge('scraper_schedule_interval_seconds', 'Current crawl interval per source and category')
+NEW_PER_HOUR = REGISTRY.gauge('scraper_schedule_new_per_hour', 'Smoothed rate of new articles per source and category')
+
+
+def next_interval(interval, rate, settings=SCHEDULE_SETTINGS):
+    """
+    Choose the next crawl interval from the smoothed new-article rate.
+
+    Args:
+        interval (int): Current interval in seconds
+        rate (float): Smoothed new articles per hour
+        settings (dict): Schedule settings
+
+    Returns:
+        int: Next interval in seconds
+    """
+    if rate > 0:
+        interval = settings['target_new_articles'] / rate * 3600
+    else:
+        # Nothing new lately: back off
+        interval = interval * 2
+    return int(min(max(interval, settings['min_interval']), settings['max_interval']))
+
+
+def update_rate(rate, new_articles, elapsed_seconds, settings=SCHEDULE_SETTINGS):
+    """
+    Fold one crawl's result into the smoothed new-article rate.
+
+    Args:
+        rate (float): Previous smoothed new articles per hour, or None before the first measurement
+        new_articles (int): New articles found by this crawl
+        elapsed_seconds (float): Time since the previous crawl
+        settings (dict): Schedule settings
+
+    Returns:
+        float: Updated new articles per hour
+    """
+    observed = new_articles / max(elapsed_seconds, 1) * 3600
+    if rate is None:
+        return observed
+    return settings['smoothing'] * observed + (1 - settings['smoothing']) * rate
+
+
+class CrawlScheduler:
+    """Runs category crawls for several sources, each on its own adaptive interval."""
+
+    def __init__(self, scraper_classes, logger, on_articles_saved=None):
+        """
+        Args:
+            scraper_classes (dict): Scraper class for each source to schedule
+            logger (logging.Logger): Logger for scheduling decisions
+            on_articles_saved (callable): Called with the source name after a crawl saved articles (optional)
+        """
+        self.logger = logger
+        self.on_articles_saved = on_articles_saved
+        self.scrapers = {source: scraper_class() for source, scraper_class in scraper_classes.items()}
+        self.schedule = {}
+        self.connection = None
+        self.stop_event = threading.Event()
+
+    def load_schedule(self):
+        """Read saved schedules and add every category not seen before, due now."""
+        now = datetime.now()
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT source, category, interval_seconds, new_per_hour, last_run_at, next_run_at FROM crawl_schedule"
+        )
+        saved = {(row['source'], row['category']): row for row in cursor.fetchall()}
+        cursor.close()
+
+        for source, scraper in self.scrapers.items():
+            for category in scraper.categories:
+                entry = saved.get((source, category)) or {
+                    'source': source,
+                    'category': category,
+                    'interval_seconds': SCHEDULE_SETTINGS['initial_interval'],
+                    'new_per_hour': None,
+                    'last_run_at': None,
+                    'next_run_at': now,
+                }
+                self.schedule[(source, category)] = entry
+
+    def ensure_connection(self):
+        """Reconnect the scheduler's database connection if it was dropped, e.g. while idle between crawls."""
+        if self.connection and self.connection.is_connected():
+            return True
+        self.logger.warning("Scheduler database connection lost, reconnecting")
+        self.connection = get_connection()
+        return self.connection is not None
+
+    def save_entry(self, entry, new_articles):
+        """
+        Write one source/category schedule back to the database.
+
+        Returns:
+            bool: False if the database could not be reached; the schedule is
+            still kept in memory and saved with the entry's next crawl
+        """
+        if not self.ensure_connection():
+            self.logger.error(f"{entry['source']}/{entry['category']}: could not save schedule, database unreachable")
+            return False
+        cursor = self.connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO crawl_schedule
+            (source, category, interval_seconds, new_per_hour, last_new_articles, last_run_at, next_run_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                interval_seconds = VALUES(interval_seconds),
+                new_per_hour = VALUES(new_per_hour),
+                last_new_articles = VALUES(last_new_articles),
+                last_run_at = VALUES(last_run_at),
+                next_run_at = VALUES(next_run_at)
+            """,
+            (entry['source'], entry['category'], entry['interval_seconds'], entry['new_per_hour'],
+             new_articles, entry['last_run_at'], entry['next_run_at'])
+        )
+        self.connection.commit()
+        cursor.close()
+        return True
+
+    def ensure_ready(self, scraper):
+        """Start the scraper's browser and database connection if they are not running."""
+        if not scraper.driver and not scraper.initialize_webdriver():
+            return False
+        if not scraper.connection or not scraper.connection.is_connected():
+            return scraper.initialize_db()
+        return True
+
+    def close_idle_browsers(self, now):
+        """Close browsers of sources with nothing due within the idle timeout."""
+        horizon = now + timedelta(seconds=SCHEDULE_SETTINGS['idle_browser_timeout'])
+        for source, scraper in self.scrapers.items():
+            if not scraper.driver:
+                continue
+            due = min(entry['next_run_at'] for key, entry in self.schedule.items() if key[0] == source)
+            if due > horizon:
+                scraper.close_webdriver()
+                scraper.driver = None
+
+    def crawl(self, entry):
+        """
+        Crawl one source/category and reschedule it from what was found.
+
+        Args:
+            entry (dict): Schedule entry to run
+        """
+        source, category = entry['source'], entry['category']
+        scraper = self.scrapers[source]
+        started = datetime.now()
+
+        result = None
+        if self.ensure_ready(scraper):
+            result = scraper.crawl_category(category, SCHEDULE_SETTINGS['articles_per_run'])
+
+        if result is None:
+            # Listing failed: try again after the current interval without learning from it
+            entry['next_run_at'] = started + timedelta(seconds=entry['interval_seconds'])
+            self.save_entry(entry, 0)
+            self.logger.warning(f"{source}/{category}: crawl failed, retrying at {entry['next_run_at']:%H:%M}")
+            return
+
+        new_links, saved = result
+        previous_links = entry.get('links')
+        entry['links'] = set(new_links)
+        new_articles = len(entry['links'] - (previous_links or set()))
+        if entry['last_run_at'] is not None and previous_links is not None:
+            elapsed = (started - entry['last_run_at']).total_seconds()
+            entry['new_per_hour'] = update_rate(entry['new_per_hour'], new_articles, elapsed)
+            entry['interval_seconds'] = next_interval(entry['interval_seconds'], entry['new_per_hour'])
+        # The first crawl of a daemon run finds the whole backlog on the page, which says nothing about the rate
+
+        entry['failures'] = 0
+        entry['last_run_at'] = started
+        entry['next_run_at'] = started + timedelta(seconds=entry['interval_seconds'])
+        self.save_entry(entry, new_articles)
+
+        labels = {'source': source, 'category': category}
+        INTERVAL_SECONDS.set(entry['interval_seconds'], **labels)
+        NEW_PER_HOUR.set(entry['new_per_hour'] or 0.0, **labels)
+        self.logger.info(
+            f"{source}/{category}: {new_articles} new, {saved} saved, {entry['new_per_hour'] or 0.0:.1f}/h, "
+            f"next in {entry['interval_seconds'] // 60} min"
+        )
+
+        if saved and self.on_articles_saved:
+            self.on_articles_saved(source)
+
+    def crawl_failed(self, entry, error):
+        """
+        Reschedule a source/category whose crawl raised, waiting longer after each failure in a row.
+
+        Args:
+            entry (dict): Schedule entry that failed
+            error (Exception): What went wrong
+        """
+        entry['failures'] = entry.get('failures', 0) + 1
+        delay = min(SCHEDULE_SETTINGS['min_interval'] * 2 ** (entry['failures'] - 1), SCHEDULE_SETTINGS['max_interval'])
+        entry['next_run_at'] = datetime.now() + timedelta(seconds=delay)
+        self.logger.error(f"{entry['source']}/{entry['category']}: crawl failed ({error}), "
+                          f"retrying at {entry['next_run_at']:%H:%M}")
+        try:
+            self.save_entry(entry, 0)
+        except Exception as e:
+            self.logger.error(f"{entry['source']}/{entry['category']}: could not save schedule: {e}")
+
+    def run(self):
+        """
+        Crawl due categories until stopped with SIGINT or SIGTERM.
+
+        Returns:
+            bool: False if the database could not be reached
+        """
+        self.connection = get_connection()
+        if not self.connection:
+            self.logger.error("Failed to connect to database")
+            return False
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *args: self.stop_event.set())
+
+        try:
+            self.load_schedule()
+            self.logger.info(f"Scheduler started with {len(self.schedule)} source/category pairs")
+            while not self.stop_event.is_set():
+                entry = min(self.schedule.values(), key=lambda e: e['next_run_at'])
+                now = datetime.now()
+                if entry['next_run_at'] > now:
+                    self.close_idle_browsers(now)
+                    wait = (entry['next_run_at'] - now).total_seconds()
+                    self.stop_event.wait(wait)
+                    continue
+                try:
+                    self.crawl(entry)
+                except Exception as e:
+                    self.crawl_failed(entry, e)
+        finally:
+            self.close()
+        return True
+
+    def close(self):
+        """Shut down every browser and connection, keeping learned state and metrics."""
+        self.logger.info("Scheduler stopping")
+        for source, scraper in self.scrapers.items():
+            scraper.close_webdriver()
+            scraper.close_db()
+            boilerplate_filter = get_boilerplate_filter(source)
+            if boilerplate_filter:
+                boilerplate_filter.save()
+            trend_tracker = get_trend_tracker(source)
+            if trend_tracker:
+                trend_tracker.save()
+            scraper.report_page_weight()
+            scraper.report_variants()
+            scraper.export_metrics()
+        if self.connection and self.connection.is_connected():
+            self.connection.close()
@@ -3,9 +3,9 @@ import json
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+from database.models import Article
 from scrapers.base_scraper import BaseScraper
 from utils.text_cleaner import clean_text
-from utils.date_parser import parse_date
 
 
 class StarScraper(BaseScraper):
@@ -15,6 +15,11 @@ class StarScraper(BaseScraper):
         """Initialize The Star scraper."""
         super().__init__('star')
         self.base_url = 'https://www.the-star.co.ke'
+        self.article_wait_time = 5
+        self.listing_wait_time = 5
+        self.article_url_patterns = [
+            r'/\d{4}-\d{2}-\d{2}-[a-z0-9-]+/?$'  # /news/2025-04-05-some-headline
+        ]
         self.categories = [
             'news',
             'business',
@@ -24,15 +29,7 @@ class StarScraper(BaseScraper):
         ]
         self.max_articles = 30  # Maximum number of articles to scrape in total
     
-    def scrape_article_page(self, url):
-        if self.article_exists(url):
-            self.logger.info(f"Article already exists: {url}")
-            return None
-            
-        soup = self.get_soup(url, wait_time=5)
-        if not soup:
-            return None
-            
+    def extract_article(self, soup, url):
         try:
             # The Star often uses structured JSON-LD data which is much more reliable
             ld_json = soup.find("script", type="application/ld+json")
@@ -57,7 +54,7 @@ class StarScraper(BaseScraper):
                         
                     # Extract publication date
                     if json_data.get("datePublished"):
-                        publication_date = parse_date(json_data.get("datePublished"))
+                        publication_date = self.parse_publication_date(json_data.get("datePublished"), "ld+json:datePublished")
                         
                     # Extract author
                     if isinstance(json_data.get("author"), dict) and json_data.get("author", {}).get("name"):
@@ -73,7 +70,7 @@ class StarScraper(BaseScraper):
                     if json_data.get("articleSection"):
                         category = clean_text(json_data.get("articleSection"))
                         
-                    self.logger.info(f"Successfully extracted structured data from JSON-LD for {url}")
+                    self.logger.debug(f"Successfully extracted structured data from JSON-LD for {url}")
                         
                 except Exception as e:
                     self.logger.error(f"Failed to parse JSON-LD for {url}: {e}")
@@ -92,9 +89,7 @@ class StarScraper(BaseScraper):
             # Extract publication date if not found in JSON-LD
             if not publication_date:
                 date_element = soup.select_one('.article-metadata time') or soup.select_one('.publish-date') or soup.select_one('time')
-                if date_element:
-                    date_text = date_element.get('datetime') or clean_text(date_element.text)
-                    publication_date = parse_date(date_text)
+                publication_date = self.extract_publication_date(date_element)
             
             # Extract author if not found in JSON-LD
             if author == "The Star":
@@ -126,7 +121,7 @@ class StarScraper(BaseScraper):
                     content_elements = [p for p in all_paragraphs if len(p.text.strip()) > 100]
                 
                 if content_elements:
-                    content = '\n\n'.join([clean_text(p.text) for p in content_elements if p.text.strip()])
+                    content = self.join_paragraphs(content_elements)
                 else:
                     self.logger.warning(f"Could not extract content from {url}")
                     return None
@@ -138,14 +133,15 @@ class StarScraper(BaseScraper):
                     category = clean_text(category_element.text)
             
             # Create article data
-            article_data = {
-                'url': url,
-                'title': title,
-                'publication_date': publication_date,
-                'author': author,
-                'content': content,
-                'category': category
-            }
+            article_data = Article(
+                url=url,
+                title=title,
+                publication_date=publication_date,
+                author=author,
+                content=content,
+                category=category,
+                source=self.source_name
+            )
             
             return article_data
             
@@ -153,61 +149,67 @@ class StarScraper(BaseScraper):
             self.logger.error(f"Error scraping article {url}: {e}")
             return None
     
+    def select_article_links(self, soup):
+        """
+        Find article links on a category listing page with CSS selectors.
+        
+        Only used when no link matches ``article_url_patterns``.
+        
+        Args:
+            soup (BeautifulSoup): Parsed listing page
+            
+        Returns:
+            list: Unique absolute article URLs in page order
+        """
+        article_links = []
+        
+        # The Star specific article selectors
+        # 1. Main article containers
+        article_containers = soup.select("article.group") + soup.select("div.flex.group")
+        for container in article_containers:
+            link_elem = container.select_one("a")
+            if link_elem and link_elem.get("href"):
+                article_links.append(link_elem.get("href"))
+        
+        # 2. Look for headline articles
+        headline_links = soup.select(".headline a") + soup.select(".headline-article a")
+        for link in headline_links:
+            if link.get("href"):
+                article_links.append(link.get("href"))
+        
+        # 3. Look for feature articles
+        feature_links = soup.select(".feature a") + soup.select(".featured-article a")
+        for link in feature_links:
+            if link.get("href"):
+                article_links.append(link.get("href"))
+        
+        # 4. Additional article cards
+        card_links = soup.select(".card a") + soup.select(".article-card a") + soup.select(".newscard a")
+        for link in card_links:
+            if link.get("href"):
+                article_links.append(link.get("href"))
+        
+        return self.absolute_links(article_links)
+    
     def scrape_category(self, category, articles_needed):
+        self.current_category = category
         url = f"{self.base_url}/{category}"
         self.logger.info(f"Scraping category: {category} from {url}")
         
-        soup = self.get_soup(url)
+        soup = self.get_soup(url, wait_time=self.listing_wait_time)
         if not soup:
             return 0
             
         articles_count = 0
         
         try:
-            # Find all article links on the page
-            article_links = []
-            
-            # The Star specific article selectors
-            # 1. Main article containers
-            article_containers = soup.select("article.group") + soup.select("div.flex.group")
-            for container in article_containers:
-                link_elem = container.select_one("a")
-                if link_elem and link_elem.get("href"):
-                    article_links.append(link_elem.get("href"))
-            
-            # 2. Look for headline articles
-            headline_links = soup.select(".headline a") + soup.select(".headline-article a")
-            for link in headline_links:
-                if link.get("href"):
-                    article_links.append(link.get("href"))
-            
-            # 3. Look for feature articles
-            feature_links = soup.select(".feature a") + soup.select(".featured-article a")
-            for link in feature_links:
-                if link.get("href"):
-                    article_links.append(link.get("href"))
-                    
-            # 4. Additional article cards
-            card_links = soup.select(".card a") + soup.select(".article-card a") + soup.select(".newscard a")
-            for link in card_links:
-                if link.get("href"):
-                    article_links.append(link.get("href"))
-            
-            # Make sure all links are absolute URLs
-            absolute_links = []
-            for link in article_links:
-                if not link.startswith('http'):
-                    link = self.base_url + link if link.startswith('/') else self.base_url + '/' + link
-                absolute_links.append(link)
-            
-            # Remove duplicate links
-            absolute_links = list(set(absolute_links))
+            absolute_links = self.find_article_links(soup)
             
             # Log the number of articles found
             self.logger.info(f"Found {len(absolute_links)} articles in {category}")
             
-            # Scrape each article, but only up to the articles_needed limit
-            for link in absolute_links[:articles_needed]:
+            # Stored links cost no page load; the others are capped at a few per article needed
+            for link in self.category_links(absolute_links, articles_needed):
                 article_data = self.scrape_article_page(link)
                 if article_data:
                     if self.save_article(article_data):
@@ -236,24 +238,12 @@ class StarScraper(BaseScraper):
         """
         try:
             total_articles = 0
-            remaining_articles = self.max_articles
-            
-            # Scrape each category, but only up to the maximum total limit
-            for category in self.categories:
-                if remaining_articles <= 0:
-                    self.logger.info(f"Reached maximum article limit of {self.max_articles}")
-                    break
-                    
-                # Calculate how many articles to get from this category
-                # Distribute remaining articles evenly among remaining categories
-                remaining_categories = len(self.categories) - self.categories.index(category)
-                articles_per_category = max(1, remaining_articles // remaining_categories)
-                
+            # Best-yielding categories first, each with its share of the budget still left
+            for category, articles_per_category in self.allocate_budget():
                 self.logger.info(f"Aiming to scrape up to {articles_per_category} articles from {category}")
                 articles_count = self.scrape_category(category, articles_per_category)
                 
                 total_articles += articles_count
-                remaining_articles -= articles_count
                 
                 self.logger.info(f"Scraped {articles_count} articles from {category}, {total_articles} total so far")
                 
@@ -12,15 +12,45 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from config.database import get_connection
+from config.settings import NEWS_SOURCES
+
+def ensure_column(cursor, table_name, column, definition):
+    """
+    Add a column to an existing table if it is missing.
+
+    Args:
+        cursor: Database cursor
+        table_name (str): Table to alter
+        column (str): Column name
+        definition (str): Column type and options, e.g. "MEDIUMBLOB NULL"
+    """
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table_name, column))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {definition}")
+        logging.info(f"Column '{column}' added to '{table_name}'.")
+
+
+def ensure_index(cursor, table_name, index, columns):
+    """
+    Add an index to an existing table if it is missing.
+
+    Args:
+        cursor: Database cursor
+        table_name (str): Table to alter
+        index (str): Index name
+        columns (str): Indexed columns, e.g. "category_id"
+    """
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table_name, index))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table_name} ADD INDEX {index} ({columns})")
+        logging.info(f"Index '{index}' added to '{table_name}'.")
 
-# Define the news sources
-NEWS_SOURCES = [
-    'citizen',
-    'daily_nations',
-    'standardmedia',
-    'star',
-    'tuko'
-]
 
 def setup_database():
     """
@@ -35,6 +65,31 @@ def setup_database():
     success = True
     
     try:
+        # Dimension tables: each author, category and source is stored once and
+        # referenced by id (see database/dimensions.py)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS authors (
+            id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            UNIQUE KEY uq_name (name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS categories (
+            id SMALLINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            UNIQUE KEY uq_name (name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            id TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(50) NOT NULL,
+            UNIQUE KEY uq_name (name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        cursor.executemany("INSERT IGNORE INTO sources (name) VALUES (%s)", [(source,) for source in NEWS_SOURCES])
+        
         # Create a table for each news source
         for source in NEWS_SOURCES:
             table_name = f"{source}_articles"
@@ -46,20 +101,29 @@ def setup_database():
                 url VARCHAR(255) NOT NULL UNIQUE,
                 title VARCHAR(255) NOT NULL,
                 publication_date DATETIME,
-                author VARCHAR(100),
+                author_id INT UNSIGNED NULL,
                 content TEXT NOT NULL,
-                category VARCHAR(100),
+                content_compressed MEDIUMBLOB NULL,
+                category_id SMALLINT UNSIGNED NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 sentiment_score FLOAT DEFAULT NULL,
                 INDEX idx_url (url),
                 INDEX idx_publication_date (publication_date),
-                INDEX idx_category (category)
+                INDEX idx_category_id (category_id)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
             """
             
             cursor.execute(create_table_sql)
             logging.info(f"Table '{table_name}' created or already exists.")
+
+            # Tables created before compressed storage was added
+            ensure_column(cursor, table_name, 'content_compressed', 'MEDIUMBLOB NULL AFTER content')
+            # Tables created with author and category names; python -m database.dimensions migrate
+            # fills in the ids and drops the name columns
+            ensure_column(cursor, table_name, 'author_id', 'INT UNSIGNED NULL AFTER publication_date')
+            ensure_column(cursor, table_name, 'category_id', 'SMALLINT UNSIGNED NULL AFTER content_compressed')
+            ensure_index(cursor, table_name, 'idx_category_id', 'category_id')
         
         # Create a metadata table to track last scrape times
         cursor.execute("""
@@ -68,10 +132,134 @@ def setup_database():
             last_scrape_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             articles_added INT DEFAULT 0,
             articles_updated INT DEFAULT 0,
-            last_status VARCHAR(20) DEFAULT 'success'
+            last_status VARCHAR(20) DEFAULT 'success',
+            revision INT UNSIGNED NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        ensure_column(cursor, 'scraper_metadata', 'revision', 'INT UNSIGNED NOT NULL DEFAULT 0')
+        
+        # Compression dictionaries trained per source (see database/compression.py)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS compression_dictionaries (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            source VARCHAR(50) NOT NULL,
+            codec VARCHAR(10) NOT NULL,
+            data MEDIUMBLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_source (source)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        
+        # Job queue for distributed crawling (see database/jobs.py)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scrape_jobs (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            source VARCHAR(50) NOT NULL,
+            category VARCHAR(100),
+            url VARCHAR(255) NOT NULL UNIQUE,
+            host VARCHAR(100) NOT NULL,
+            status ENUM('pending', 'running', 'done', 'dead') NOT NULL DEFAULT 'pending',
+            attempts INT NOT NULL DEFAULT 0,
+            available_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            lease_owner VARCHAR(100) NULL,
+            lease_expires DATETIME NULL,
+            last_error TEXT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_claim (host, status, available_at),
+            INDEX idx_source_status (source, status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        
+        # Per-host politeness: the earliest time any worker may load the next page
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_hosts (
+            host VARCHAR(100) PRIMARY KEY,
+            source VARCHAR(50) NOT NULL,
+            next_fetch_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+            INDEX idx_source_next (source, next_fetch_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        
+        # Adaptive crawl intervals for daemon mode (see scrapers/scheduler.py)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_schedule (
+            source VARCHAR(50) NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            interval_seconds INT NOT NULL,
+            new_per_hour FLOAT NULL,
+            last_new_articles INT NOT NULL DEFAULT 0,
+            last_run_at DATETIME NULL,
+            next_run_at DATETIME NOT NULL,
+            PRIMARY KEY (source, category)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """)
         
+        # Dashboard rollups, kept current by article writes (see database/rollups.py)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_daily_counts (
+            source VARCHAR(50) NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            day DATE NOT NULL,
+            articles INT NOT NULL DEFAULT 0,
+            sentiment_sum DOUBLE NOT NULL DEFAULT 0,
+            sentiment_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, category, day),
+            INDEX idx_day (day)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_author_counts (
+            source VARCHAR(50) NOT NULL,
+            author VARCHAR(100) NOT NULL,
+            articles INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, author)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        cursor.execute("""
+        CREATE OR REPLACE VIEW article_daily_stats AS
+        SELECT source, category, day, articles,
+               sentiment_sum / NULLIF(sentiment_count, 0) AS avg_sentiment
+        FROM article_daily_counts
+        """)
+        
+        # Entity tags from the gazetteers, and how far each enrichment stage has read (see enrichment/entities.py)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_entities (
+            source VARCHAR(50) NOT NULL,
+            article_id INT NOT NULL,
+            entity VARCHAR(100) NOT NULL,
+            entity_type VARCHAR(20) NOT NULL,
+            mentions INT NOT NULL DEFAULT 1,
+            in_title TINYINT(1) NOT NULL DEFAULT 0,
+            PRIMARY KEY (source, article_id, entity),
+            INDEX idx_entity (entity_type, entity)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS enrichment_progress (
+            stage VARCHAR(30) NOT NULL,
+            source VARCHAR(50) NOT NULL,
+            last_id INT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (stage, source)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """)
+        
+        # Every source's articles with source, author and category names, for SQL and BI tools
+        cursor.execute("CREATE OR REPLACE VIEW all_articles AS " + "\nUNION ALL\n".join(
+            f"""
+            SELECT s.id AS source_id, s.name AS source, a.id, a.url, a.title, a.publication_date,
+                   a.author_id, au.name AS author, a.category_id, ca.name AS category,
+                   a.created_at, a.last_updated, a.sentiment_score
+            FROM {source}_articles a
+            JOIN sources s ON s.name = '{source}'
+            LEFT JOIN authors au ON au.id = a.author_id
+            LEFT JOIN categories ca ON ca.id = a.category_id
+            """
+            for source in NEWS_SOURCES
+        ))
+        
         connection.commit()
         logging.info("All database tables have been set up successfully.")
     
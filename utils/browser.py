@@ -0,0 +1,200 @@
+"""
+Browser configuration for the Kenya news scraping project.
+
+The scrapers only read the HTML of listing and article pages, so in lean mode
+Firefox skips images, web fonts and media, and requests to ad and analytics
+domains are sent through a proxy auto-config script to a dead local port so
+they fail immediately. Page weight per mode is kept in a small JSON file so a
+run can report what lean mode saves against earlier full-browser runs.
+
+The geckodriver path is resolved once and remembered on disk, so later runs
+start without webdriver_manager's online version check and work offline.
+"""
+import os
+import json
+import shutil
+from urllib.parse import quote
+
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+from config.settings import BROWSER_SETTINGS
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:134.0) Gecko/20100101 Firefox/134.0"
+
+# Nothing listens on the discard port, so blocked requests are refused at once
+BLOCKING_PROXY = "PROXY 127.0.0.1:9"
+
+# Summed by Firefox itself; cross-origin resources without Timing-Allow-Origin report 0
+PAGE_BYTES_SCRIPT = """
+var total = 0;
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+for (var i = 0; i < entries.length; i++) {
+    total += entries[i].transferSize || 0;
+}
+return total;
+"""
+
+
+def resolve_geckodriver(refresh=False):
+    """
+    Find the geckodriver executable, caching its path for later runs.
+
+    Tries the cached path, then a geckodriver on PATH, and only then downloads
+    one with webdriver_manager (imported here because it is slow to import).
+
+    Args:
+        refresh (bool): Ignore the cached path
+
+    Returns:
+        str: Path to geckodriver
+    """
+    cache_file = BROWSER_SETTINGS['geckodriver_cache']
+    if not refresh and os.path.exists(cache_file):
+        try:
+            with open(cache_file, encoding='utf-8') as f:
+                path = json.load(f)['path']
+            if os.access(path, os.X_OK):
+                return path
+        except (OSError, ValueError, KeyError):
+            pass
+
+    path = shutil.which('geckodriver')
+    if not path:
+        from webdriver_manager.firefox import GeckoDriverManager
+        path = GeckoDriverManager().install()
+
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({'path': path}, f)
+    return path
+
+
+def is_lean(source):
+    """Whether a source runs in lean browser mode."""
+    return BROWSER_SETTINGS['lean'].get(source, False)
+
+
+def pac_url(domains):
+    """
+    Build a proxy auto-config ``data:`` URL that blocks the given domains and their subdomains.
+
+    Args:
+        domains (list): Domain names to block
+
+    Returns:
+        str: Value for the ``network.proxy.autoconfig_url`` preference
+    """
+    script = (
+        "function FindProxyForURL(url, host) {"
+        f" var blocked = {json.dumps(list(domains))};"
+        " for (var i = 0; i < blocked.length; i++) {"
+        "  if (host == blocked[i] || dnsDomainIs(host, '.' + blocked[i])) {"
+        f"   return '{BLOCKING_PROXY}';"
+        "  }"
+        " }"
+        " return 'DIRECT';"
+        "}"
+    )
+    return 'data:application/x-ns-proxy-autoconfig,' + quote(script)
+
+
+def firefox_options(lean=False):
+    """
+    Build the Firefox options used by the scrapers.
+
+    Args:
+        lean (bool): Skip images, fonts, media and blocked third-party domains
+
+    Returns:
+        FirefoxOptions: Configured options
+    """
+    options = FirefoxOptions()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.set_preference("general.useragent.override", USER_AGENT)
+    options.set_preference("intl.accept_languages", "en-US,en;q=0.5")
+    options.set_preference("network.http.accept-encoding", "gzip, deflate, br, zstd")
+    options.set_preference("privacy.donottrackheader.enabled", True)
+
+    if not lean:
+        return options
+
+    # Return from driver.get() at DOMContentLoaded instead of waiting for every subresource
+    options.page_load_strategy = BROWSER_SETTINGS['page_load_strategy']
+
+    if BROWSER_SETTINGS['block_images']:
+        options.set_preference("permissions.default.image", 2)
+    if BROWSER_SETTINGS['block_fonts']:
+        options.set_preference("gfx.downloadable_fonts.enabled", False)
+        options.set_preference("browser.display.use_document_fonts", 0)
+    if BROWSER_SETTINGS['block_media']:
+        options.set_preference("media.autoplay.default", 5)
+        options.set_preference("media.preload.default", 0)
+        options.set_preference("media.preload.auto", 0)
+
+    domains = BROWSER_SETTINGS['blocked_domains']
+    if domains:
+        options.set_preference("network.proxy.type", 2)
+        options.set_preference("network.proxy.autoconfig_url", pac_url(domains))
+    options.set_preference("privacy.trackingprotection.enabled", True)
+    return options
+
+
+def page_bytes(driver):
+    """
+    Bytes transferred for the page currently loaded in the browser.
+
+    Args:
+        driver: Selenium WebDriver
+
+    Returns:
+        int: Transferred bytes, or None if the browser cannot report them
+    """
+    try:
+        value = driver.execute_script(PAGE_BYTES_SCRIPT)
+    except Exception:
+        return None
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+class PageWeightStats:
+    """Running page weight and load time totals per source and browser mode."""
+
+    def __init__(self, path=None):
+        self.path = path or BROWSER_SETTINGS['stats_file']
+        self.data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                self.data = {}
+
+    def add(self, source, mode, pages, total_bytes, seconds):
+        """Add one run's totals for a source and mode ('lean' or 'full')."""
+        entry = self.data.setdefault(source, {}).setdefault(mode, {'pages': 0, 'bytes': 0, 'seconds': 0.0})
+        entry['pages'] += pages
+        entry['bytes'] += total_bytes
+        entry['seconds'] += seconds
+
+    def per_page(self, source, mode):
+        """
+        Average bytes and load seconds per page.
+
+        Returns:
+            tuple: ``(bytes, seconds)``, or None if no pages were recorded
+        """
+        entry = self.data.get(source, {}).get(mode)
+        if not entry or not entry['pages']:
+            return None
+        return entry['bytes'] / entry['pages'], entry['seconds'] / entry['pages']
+
+    def save(self):
+        """Write the totals, replacing the file atomically."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
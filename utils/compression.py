@@ -0,0 +1,157 @@
+"""
+Article body compression for the Kenya news scraping project.
+
+Compressed bodies start with a 5-byte header: one codec byte followed by the
+big-endian id of the dictionary they were compressed with (0 for none), so
+rows written with an older dictionary stay readable after retraining.
+zstd is used when the optional ``zstandard`` package is installed; zlib with
+a preset dictionary works everywhere.
+"""
+import struct
+import zlib
+from collections import Counter
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CODEC_IDS = {'zlib': 1, 'zstd': 2}
+CODEC_NAMES = {value: key for key, value in CODEC_IDS.items()}
+
+_HEADER = struct.Struct('>BI')
+
+
+def codec_available(codec):
+    """
+    Check whether a codec can be used in this environment.
+
+    Args:
+        codec (str): 'zlib' or 'zstd'
+
+    Returns:
+        bool: True if the codec is usable
+    """
+    return codec == 'zlib' or (codec == 'zstd' and zstandard is not None)
+
+
+def train_dictionary(samples, codec='zlib', size=32768):
+    """
+    Build a compression dictionary from sample article bodies.
+
+    Args:
+        samples (list): Article bodies of one source
+        codec (str): Codec the dictionary is for
+        size (int): Maximum dictionary size in bytes
+
+    Returns:
+        bytes: Dictionary data, empty if the samples are too small to learn from
+    """
+    samples = [s for s in samples if s]
+    if not samples:
+        return b''
+
+    if codec == 'zstd':
+        encoded = [s.encode('utf-8') for s in samples]
+        try:
+            return zstandard.train_dictionary(size, encoded).as_bytes()
+        except zstandard.ZstdError:
+            # Too few samples for the trainer; fall back to a phrase dictionary
+            pass
+
+    # zlib preset dictionaries are plain text: frequent phrases, most frequent last
+    counts = Counter()
+    for text in samples:
+        words = text.split()
+        for i in range(len(words) - 3):
+            counts[' '.join(words[i:i + 4])] += 1
+
+    chosen = []
+    total = 0
+    for phrase, count in counts.most_common():
+        if count < 2:
+            break
+        length = len(phrase.encode('utf-8')) + 1
+        if total + length > size:
+            break
+        chosen.append(phrase)
+        total += length
+    return '\n'.join(reversed(chosen)).encode('utf-8')
+
+
+class ContentCodec:
+    """Compresses and decompresses article bodies for one news source."""
+
+    def __init__(self, codec='zlib', level=6, dictionaries=None, dict_id=0):
+        """
+        Args:
+            codec (str): Codec used for new bodies, 'zlib' or 'zstd'
+            level (int): Compression level
+            dictionaries (dict): Dictionary data by id, for encoding and decoding (optional)
+            dict_id (int): Id of the dictionary used for new bodies (0 for none)
+        """
+        if not codec_available(codec):
+            raise ValueError(f"Compression codec not available: {codec}")
+        self.codec = codec
+        self.level = level
+        self.dictionaries = dictionaries or {}
+        self.dict_id = dict_id if dict_id in self.dictionaries else 0
+        self._zstd_compressor = None
+        self._zstd_decompressors = {}
+
+    def encode(self, text):
+        """
+        Compress an article body.
+
+        Args:
+            text (str): Article content
+
+        Returns:
+            bytes: Header followed by the compressed UTF-8 text
+        """
+        data = text.encode('utf-8')
+        header = _HEADER.pack(CODEC_IDS[self.codec], self.dict_id)
+
+        if self.codec == 'zstd':
+            if self._zstd_compressor is None:
+                dict_data = self._zstd_dict(self.dict_id)
+                self._zstd_compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+            return header + self._zstd_compressor.compress(data)
+
+        zdict = self.dictionaries.get(self.dict_id)
+        if zdict:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=zdict)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        return header + compressor.compress(data) + compressor.flush()
+
+    def decode(self, blob):
+        """
+        Decompress an article body written by ``encode``.
+
+        Args:
+            blob (bytes): Stored compressed body
+
+        Returns:
+            str: Article content
+        """
+        codec_id, dict_id = _HEADER.unpack_from(blob)
+        payload = bytes(blob[_HEADER.size:])
+
+        if CODEC_NAMES.get(codec_id) == 'zstd':
+            decompressor = self._zstd_decompressors.get(dict_id)
+            if decompressor is None:
+                decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dict(dict_id))
+                self._zstd_decompressors[dict_id] = decompressor
+            return decompressor.decompress(payload).decode('utf-8')
+
+        zdict = self.dictionaries.get(dict_id)
+        if dict_id and zdict is None:
+            raise ValueError(f"Unknown compression dictionary id: {dict_id}")
+        decompressor = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+        return (decompressor.decompress(payload) + decompressor.flush()).decode('utf-8')
+
+    def _zstd_dict(self, dict_id):
+        data = self.dictionaries.get(dict_id)
+        return zstandard.ZstdCompressionDict(data) if data else None
@@ -1,76 +1,348 @@
 """
 Date parsing utilities for the Kenya news scraping project.
+
+Dates are parsed with precompiled patterns instead of a chain of ``strptime``
+attempts. ISO-8601 timestamps (JSON-LD ``datePublished``, ``<time datetime>``)
+take a dedicated fast path, and each ``DateParser`` remembers which format
+last worked for a given selector so repeat lookups try that format first.
+Nothing is learned for text parsed without a source or a selector, so one
+caller's dates never change how another caller's ambiguous dates are read.
 """
 import re
+import time
 from datetime import datetime, timedelta
 
 
-def parse_date(date_text):
+_MONTHS = {
+    'january': 1, 'jan': 1,
+    'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'may': 5,
+    'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sept': 9, 'sep': 9,
+    'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12,
+}
+
+_RELATIVE_UNITS = {
+    'second': timedelta(seconds=1), 'sec': timedelta(seconds=1),
+    'minute': timedelta(minutes=1), 'min': timedelta(minutes=1),
+    'hour': timedelta(hours=1), 'hr': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1), 'wk': timedelta(weeks=1),
+    # Approximate a month as 30 days and a year as 365 days
+    'month': timedelta(days=30), 'mo': timedelta(days=30),
+    'year': timedelta(days=365), 'yr': timedelta(days=365),
+}
+
+_ISO_PREFIX = re.compile(r'^\d{4}-\d{2}-\d{2}(?:$|[tT ])')
+_WEEKDAY_PREFIX = re.compile(r'^(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?,?\s+')
+
+# Optional trailing time such as "10:30", "at 10:30 am" or "- 10:30:15"
+_TIME = r'(?:[\s,\-]+(?:at\s+)?(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([ap]\.?m\.?)?)?'
+
+_MONTH_DAY_YEAR = re.compile(r'^([a-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})' + _TIME + r'$')
+_DAY_MONTH_YEAR = re.compile(r'^(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]+)\.?,?\s+(\d{4})' + _TIME + r'$')
+_NUMERIC_DATE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})' + _TIME + r'$')
+_RELATIVE = re.compile(r'(\d+|an?)\s+([a-z]+?)s?\s+ago')
+_LOOSE_DATE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})')
+
+
+def _build(year, month, day, hour=None, minute=None, second=None, meridiem=None):
+    """Build a datetime from matched groups, returning None for impossible values."""
+    hour = int(hour) if hour else 0
+    if meridiem:
+        if meridiem[0] == 'p' and hour < 12:
+            hour += 12
+        elif meridiem[0] == 'a' and hour == 12:
+            hour = 0
+    try:
+        return datetime(int(year), int(month), int(day), hour,
+                        int(minute) if minute else 0, int(second) if second else 0)
+    except ValueError:
+        return None
+
+
+def _parse_iso(text, reference_time):
+    if not _ISO_PREFIX.match(text):
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.upper().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # Stored as naive DATETIME: keep the publisher's wall-clock time
+    return parsed.replace(tzinfo=None)
+
+
+def _parse_month_day_year(text, reference_time):
+    match = _MONTH_DAY_YEAR.match(text)
+    if not match:
+        return None
+    month = _MONTHS.get(match.group(1))
+    if not month:
+        return None
+    return _build(match.group(3), month, match.group(2), *match.group(4, 5, 6, 7))
+
+
+def _parse_day_month_year(text, reference_time):
+    match = _DAY_MONTH_YEAR.match(text)
+    if not match:
+        return None
+    month = _MONTHS.get(match.group(2))
+    if not month:
+        return None
+    return _build(match.group(3), month, match.group(1), *match.group(4, 5, 6, 7))
+
+
+def _parse_day_first(text, reference_time):
+    match = _NUMERIC_DATE.match(text)
+    if not match:
+        return None
+    return _build(match.group(3), match.group(2), match.group(1), *match.group(4, 5, 6, 7))
+
+
+def _parse_month_first(text, reference_time):
+    match = _NUMERIC_DATE.match(text)
+    if not match:
+        return None
+    return _build(match.group(3), match.group(1), match.group(2), *match.group(4, 5, 6, 7))
+
+
+def _parse_relative(text, reference_time):
+    if 'ago' in text:
+        match = _RELATIVE.search(text)
+        if match:
+            unit = _RELATIVE_UNITS.get(match.group(2))
+            if unit:
+                amount = match.group(1)
+                num = 1 if amount in ('a', 'an') else int(amount)
+                try:
+                    return reference_time - unit * num
+                except (OverflowError, ValueError):
+                    # Further back than a datetime can go, e.g. "5000 years ago"
+                    return None
+    if 'yesterday' in text:
+        return reference_time - timedelta(days=1)
+    if 'today' in text or 'just now' in text:
+        return reference_time
+    return None
+
+
+def _parse_loose(text, reference_time):
+    # Last resort: pull a day/month/year triple out of surrounding text
+    match = _LOOSE_DATE.search(text)
+    if not match:
+        return None
+    day, month, year = map(int, match.groups())
+    # Fix two-digit years
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    return _build(year, month, day)
+
+
+# Formats in the order they are tried when nothing has been learned yet.
+# Day-first numeric dates win over month-first, as in the original parser.
+FORMATS = {
+    'iso': _parse_iso,
+    'month_day_year': _parse_month_day_year,
+    'day_month_year': _parse_day_month_year,
+    'day_first': _parse_day_first,
+    'month_first': _parse_month_first,
+    'relative': _parse_relative,
+    'loose': _parse_loose,
+}
+
+
+class DateParser:
+    """Date parser for one news source that learns the winning format per selector."""
+
+    def __init__(self, source=None):
+        """
+        Args:
+            source (str): Name of the news source this parser serves (optional)
+        """
+        self.source = source
+        self.format_cache = {}
+
+    def parse(self, date_text, selector=None, reference_time=None):
+        """
+        Parse date text to a datetime object.
+
+        Args:
+            date_text (str): Date text from an article
+            selector (str): CSS selector or field the text came from, used as the cache key
+            reference_time (datetime): Time relative dates are anchored to, normally
+                when the page was fetched (defaults to now)
+
+        Returns:
+            datetime: Parsed datetime object or None if parsing fails
+        """
+        if not date_text:
+            return None
+
+        text = str(date_text).strip()
+        if reference_time is None:
+            reference_time = datetime.now()
+
+        # Without a source or selector there is no key to learn the format under
+        learn = self.source is not None or selector is not None
+
+        # ISO-8601 needs no lowercasing or format search
+        parsed = _parse_iso(text, reference_time)
+        if parsed:
+            if learn:
+                self.format_cache[selector] = 'iso'
+            return parsed
+
+        text = _WEEKDAY_PREFIX.sub('', text.lower())
+
+        cached = self.format_cache.get(selector) if learn else None
+        if cached:
+            parsed = FORMATS[cached](text, reference_time)
+            if parsed:
+                return parsed
+
+        for name, parse_format in FORMATS.items():
+            if name == cached:
+                continue
+            parsed = parse_format(text, reference_time)
+            if parsed:
+                if learn:
+                    self.format_cache[selector] = name
+                return parsed
+
+        return None
+
+    def parse_many(self, date_texts, selector=None, reference_time=None):
+        """
+        Parse a batch of date strings that share a selector.
+
+        Args:
+            date_texts (list): Date strings, e.g. one column of scraped rows
+            selector (str): CSS selector or field the texts came from
+            reference_time (datetime): Time relative dates are anchored to (defaults to now)
+
+        Returns:
+            list: Parsed datetime objects, None where parsing failed
+        """
+        if reference_time is None:
+            reference_time = datetime.now()
+        parse = self.parse
+        return [parse(text, selector, reference_time) for text in date_texts]
+
+
+_parsers = {}
+
+
+def get_parser(source=None):
+    """
+    Get the shared date parser for a news source.
+
+    Args:
+        source (str): Name of the news source (optional)
+
+    Returns:
+        DateParser: Parser whose learned formats persist for the process lifetime
+    """
+    parser = _parsers.get(source)
+    if parser is None:
+        parser = _parsers[source] = DateParser(source)
+    return parser
+
+
+def parse_date(date_text, reference_time=None, source=None, selector=None):
     """
     Parse date text from various formats to a datetime object.
-    
+
     Args:
         date_text (str): Date text from an article
-        
+        reference_time (datetime): Time relative dates are anchored to (defaults to now)
+        source (str): News source, selects which learned format cache to use
+        selector (str): CSS selector or field the text came from
+
     Returns:
         datetime: Parsed datetime object or None if parsing fails
     """
-    if not date_text:
-        return None
-    
+    return get_parser(source).parse(date_text, selector, reference_time)
+
+
+def parse_dates(date_texts, reference_time=None, source=None, selector=None):
+    """
+    Parse a list of date strings.
+
+    Args:
+        date_texts (list): Date strings to parse
+        reference_time (datetime): Time relative dates are anchored to (defaults to now)
+        source (str): News source, selects which learned format cache to use
+        selector (str): CSS selector or field the texts came from
+
+    Returns:
+        list: Parsed datetime objects, None where parsing failed
+    """
+    return get_parser(source).parse_many(date_texts, selector, reference_time)
+
+
+def _strptime_chain(date_text):
+    """Condensed copy of the previous strptime-based parser, used as the benchmark baseline."""
     date_text = date_text.strip().lower()
-    
-    try:
-        # Try common date formats
-        for fmt in ('%B %d, %Y', '%d %B %Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y'):
-            try:
-                return datetime.strptime(date_text, fmt)
-            except ValueError:
-                continue
-        
-        # Handle relative dates like "2 days ago", "yesterday", etc.
-        if 'ago' in date_text:
-            # Extract the number and unit (e.g., "2 days ago")
-            match = re.search(r'(\d+)\s+(\w+)\s+ago', date_text)
-            if match:
-                num = int(match.group(1))
-                unit = match.group(2).rstrip('s')  # Remove plural 's' if present
-                
-                now = datetime.now()
-                if unit in ('second', 'sec'):
-                    return now - timedelta(seconds=num)
-                elif unit in ('minute', 'min'):
-                    return now - timedelta(minutes=num)
-                elif unit in ('hour', 'hr'):
-                    return now - timedelta(hours=num)
-                elif unit in ('day',):
-                    return now - timedelta(days=num)
-                elif unit in ('week', 'wk'):
-                    return now - timedelta(weeks=num)
-                elif unit in ('month', 'mo'):
-                    # Approximate a month as 30 days
-                    return now - timedelta(days=num*30)
-                elif unit in ('year', 'yr'):
-                    # Approximate a year as 365 days
-                    return now - timedelta(days=num*365)
-        
-        # Handle "yesterday", "today"
-        if 'yesterday' in date_text:
-            return datetime.now() - timedelta(days=1)
-        elif 'today' in date_text:
-            return datetime.now()
-        
-        # Last resort: try to extract a date with a regex
-        date_match = re.search(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})', date_text)
-        if date_match:
-            day, month, year = map(int, date_match.groups())
-            # Fix two-digit years
-            if year < 100:
-                year += 2000 if year < 50 else 1900
-            return datetime(year, month, day)
-        
-        return None
-    
-    except Exception as e:
-        print(f"Error parsing date '{date_text}': {e}")
-        return None
\ No newline at end of file
+    for fmt in ('%B %d, %Y', '%d %B %Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y'):
+        try:
+            return datetime.strptime(date_text, fmt)
+        except ValueError:
+            continue
+    match = re.search(r'(\d+)\s+(\w+)\s+ago', date_text)
+    if match:
+        return datetime.now() - timedelta(hours=int(match.group(1)))
+    match = re.search(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})', date_text)
+    if match:
+        day, month, year = map(int, match.groups())
+        return datetime(year if year > 99 else year + 2000, month, day)
+    return None
+
+
+def benchmark(iterations=20000):
+    """
+    Compare the parser against the previous strptime chain on typical scraped dates.
+
+    Args:
+        iterations (int): Number of strings parsed per sample
+
+    Returns:
+        dict: Seconds per sample for both parsers, keyed by sample text
+    """
+    samples = [
+        '2025-04-05T14:30:00+03:00',
+        '2025-04-05',
+        'April 5, 2025',
+        '5 April 2025',
+        '25/04/2025',
+        '04/25/2025',
+        '3 hours ago',
+        # Further back than a datetime reaches: must come back as None, not raise
+        '5000 years ago',
+    ]
+    results = {}
+    for sample in samples:
+        texts = [sample] * iterations
+
+        start = time.perf_counter()
+        for text in texts:
+            _strptime_chain(text)
+        baseline = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parse_dates(texts, source='benchmark', selector=sample)
+        engine = time.perf_counter() - start
+
+        results[sample] = (baseline, engine)
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'sample':<28} {'strptime (s)':>12} {'engine (s)':>10} {'speedup':>8}")
+    for sample, (baseline, engine) in benchmark().items():
+        print(f"{sample:<28} {baseline:>12.3f} {engine:>10.3f} {baseline / engine:>7.1f}x")
@@ -0,0 +1,36 @@
+"""
+Cross-process file locking for the Kenya news scraping project.
+
+State files shared by parallel scrapers (yield stats, variant rules, trend
+sketches) are read, merged and rewritten while holding an exclusive lock, so
+one process's update never overwrites another's.
+"""
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on a lock file while the block runs.
+
+    Without ``fcntl`` (e.g. on Windows) the block runs unlocked.
+
+    Args:
+        path (str): Lock file to create if missing, e.g. ``<state file>.lock``
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
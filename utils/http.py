@@ -0,0 +1,38 @@
+"""
+Plain HTTP fetching for pages that do not need a browser.
+"""
+import gzip
+import zlib
+import urllib.request
+
+from utils.browser import USER_AGENT
+
+
+def fetch_url(url, timeout=15):
+    """
+    Fetch a page without running JavaScript.
+
+    Args:
+        url (str): Page URL
+        timeout (float): Seconds to wait for the server
+
+    Returns:
+        tuple: Decoded HTML and the number of bytes transferred
+    """
+    request = urllib.request.Request(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        encoding = response.headers.get('Content-Encoding', '').lower()
+        charset = response.headers.get_content_charset() or 'utf-8'
+
+    transferred = len(body)
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'deflate':
+        body = zlib.decompress(body)
+    return body.decode(charset, errors='replace'), transferred
@@ -1,67 +1,205 @@
 """
 Logging functionality for the Kenya news scraping project.
+
+Loggers hand records to a queue; a background listener thread does the file
+and console I/O, so logging calls on the scraping thread never block on disk
+or terminal writes. Setting up the same logger twice reuses its handlers
+instead of adding duplicates.
 """
 import os
+import json
+import time
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
 from datetime import datetime
 
+from config.settings import LOGGING_SETTINGS
+
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listeners = {}
+_lock = threading.Lock()
+
 
-def setup_logger(name, log_file=None, level=logging.INFO):
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
     """
-    Set up a logger with file and console handlers.
-    
+    Lets through at most ``rate`` debug records per call site every ``per`` seconds.
+
+    Meant for debug messages inside hot loops; INFO and above always pass.
+    """
+
+    def __init__(self, rate=10, per=60.0):
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self._windows = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        window_start, count = self._windows.get(key, (now, 0))
+        if now - window_start >= self.per:
+            window_start, count = now, 0
+        self._windows[key] = (window_start, count + 1)
+        return count < self.rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that remembers which log file its listener writes to."""
+
+    def __init__(self, log_queue, log_file):
+        super().__init__(log_queue)
+        self.log_file = log_file
+
+
+def stop_listeners():
+    """
+    Flush queued records and stop every listener thread.
+
+    Runs at interpreter exit; worker processes, which exit without running
+    ``atexit`` handlers, call it themselves. Loggers set up again afterwards
+    get a new listener.
+    """
+    with _lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+
+
+def _restart_listeners_in_child():
+    """Give a forked process its own listener threads; the parent's did not survive the fork."""
+    global _lock
+    _lock = threading.Lock()
+    for name, listener in list(_listeners.items()):
+        # Records still queued at fork time belong to the parent
+        try:
+            while True:
+                listener.queue.get_nowait()
+        except queue.Empty:
+            pass
+        restarted = logging.handlers.QueueListener(listener.queue, *listener.handlers, respect_handler_level=True)
+        restarted.start()
+        _listeners[name] = restarted
+
+
+atexit.register(stop_listeners)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listeners_in_child)
+
+
+def setup_logger(name, log_file=None, level=logging.INFO, json_format=False, debug_rate=None):
+    """
+    Set up a logger whose file and console output is written on a background thread.
+
+    Calling this again for the same logger and log file returns it unchanged,
+    so constructing a scraper repeatedly in one process does not duplicate lines.
+
     Args:
         name (str): Logger name
         log_file (str): Path to log file (optional)
         level (int): Logging level
-        
+        json_format (bool): Write the log file as JSON lines instead of plain text
+        debug_rate (tuple): ``(records, seconds)`` limit for debug records per call site (optional)
+
     Returns:
         logging.Logger: Configured logger
     """
-    # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Remove existing handlers if any
-    if logger.handlers:
-        logger.handlers = []
-    
-    # Create formatters
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # Create file handler if log_file is provided
-    if log_file:
-        # Ensure logs directory exists
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+    logger.propagate = False
+
+    with _lock:
+        existing = [h for h in logger.handlers if isinstance(h, _QueueHandler)]
+        if existing and existing[0].log_file == log_file and name in _listeners:
+            return logger
+
+        # New log file (e.g. the date changed): retire the old listener first
+        listener = _listeners.pop(name, None)
+        if listener:
+            listener.stop()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = []
+
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+        if log_file:
+            # Ensure logs directory exists
+            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setLevel(level)
+            file_handler.setFormatter(JsonFormatter() if json_format else formatter)
+            handlers.append(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = _QueueHandler(log_queue, log_file)
+        if debug_rate:
+            queue_handler.addFilter(RateLimitFilter(*debug_rate))
+        logger.addHandler(queue_handler)
+
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+
     return logger
 
 
 def get_scraper_logger(source_name):
     """
     Get a logger for a specific scraper.
-    
+
     Args:
         source_name (str): Name of the news source
-        
+
     Returns:
         logging.Logger: Configured logger for the scraper
     """
     # Ensure logs directory exists
     os.makedirs('logs', exist_ok=True)
-    
+
     # Create log filename with date
-    log_file = f"logs/{source_name}_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    return setup_logger(f"{source_name}_scraper", log_file)
\ No newline at end of file
+    extension = 'jsonl' if LOGGING_SETTINGS.get('json') else 'log'
+    log_file = f"logs/{source_name}_{datetime.now().strftime('%Y%m%d')}.{extension}"
+
+    return setup_logger(
+        f"{source_name}_scraper",
+        log_file,
+        level=getattr(logging, LOGGING_SETTINGS.get('level', 'INFO')),
+        json_format=LOGGING_SETTINGS.get('json', False),
+        debug_rate=LOGGING_SETTINGS.get('debug_rate')
+    )
@@ -0,0 +1,248 @@
+"""
+Metrics collection for the Kenya news scraping project.
+
+Counters, gauges and histograms are kept in memory and rendered in the
+Prometheus text exposition format, either served over a local HTTP endpoint
+or written to a file for node_exporter's textfile collector.
+"""
+import os
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + (list(extra) if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in items) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, lock):
+        self.name = name
+        self.documentation = documentation
+        self._lock = lock
+        self._values = {}
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(labels.items()))
+
+    def _matches(self, key, match):
+        if not match:
+            return True
+        labels = dict(key)
+        return all(labels.get(k) == v for k, v in match.items())
+
+    def render(self, match=None):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                if self._matches(key, match):
+                    lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. pages fetched."""
+
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Return the current count for the given labels."""
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. browser memory."""
+
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        """Set the gauge for the given labels."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels):
+        """Return the current value for the given labels, or None."""
+        return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, e.g. seconds spent in a phase."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, lock, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, lock)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Record one observation for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket counts followed by the running sum and count
+                series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall-clock seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, **match):
+        """Return ``(count, sum)`` over every series whose labels include ``match``."""
+        count = 0
+        total = 0.0
+        with self._lock:
+            for key, series in self._values.items():
+                if self._matches(key, match):
+                    count += series[-1]
+                    total += series[-2]
+        return count, total
+
+    def _render_series(self, key, series):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, series):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(float(bound)))])} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series[-1]}")
+        lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series[-2])}")
+        lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of named metrics rendered together."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, documentation, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, self._lock, **kwargs)
+        return metric
+
+    def counter(self, name, documentation):
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name, documentation):
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, documentation, buckets=buckets)
+
+    def render(self, match=None):
+        """
+        Render all metrics in the Prometheus text format.
+
+        Args:
+            match (dict): Only include series whose labels have these values (optional)
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render(match))
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path, match=None):
+        """
+        Write the metrics for node_exporter's textfile collector, replacing the file atomically.
+
+        Args:
+            path (str): Destination ``.prom`` file
+            match (dict): Only include series whose labels have these values (optional)
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(match))
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+_server = None
+
+
+def start_http_server(port, addr='127.0.0.1', registry=REGISTRY):
+    """
+    Serve ``/metrics`` from a background thread. Calling it again is a no-op.
+
+    Args:
+        port (int): Port to listen on
+        addr (str): Address to bind, local-only by default
+        registry (MetricsRegistry): Registry to expose
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    global _server
+    if _server is not None:
+        return _server
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    _server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    threading.Thread(target=_server.serve_forever, name='metrics-http', daemon=True).start()
+    return _server
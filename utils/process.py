@@ -0,0 +1,103 @@
+"""
+Process inspection helpers for the Kenya news scraping project.
+"""
+import os
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _children_from_proc():
+    """Map each parent pid to its child pids using /proc (Linux only)."""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing parenthesis
+        fields = stat[stat.rfind(b')') + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _rss_from_proc(pid):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def process_tree_rss(pid):
+    """
+    Resident memory of a process and all of its descendants.
+
+    Firefox runs content, GPU and socket processes as children of the main
+    browser process, so the whole tree is counted.
+
+    Args:
+        pid (int): Root process id
+
+    Returns:
+        int: Total resident set size in bytes, or None if it cannot be measured
+    """
+    if not pid:
+        return None
+
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            tree = [process] + process.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for proc in tree:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    if not os.path.isdir('/proc'):
+        return None
+
+    children = _children_from_proc()
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += _rss_from_proc(current)
+        stack.extend(children.get(current, ()))
+    return total or None
+
+
+def process_age():
+    """
+    Seconds since the current process started, including interpreter startup.
+
+    Returns:
+        float: Age of the process, or None if it cannot be measured
+    """
+    if psutil is not None:
+        try:
+            return time.time() - psutil.Process().create_time()
+        except psutil.Error:
+            return None
+
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            stat = f.read()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError):
+        return None
+    # Field 22 of stat is the start time in clock ticks since boot
+    start_ticks = int(stat[stat.rfind(b')') + 2:].split()[19])
+    return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
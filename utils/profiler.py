@@ -0,0 +1,161 @@
+"""
+Profiling helpers for the Kenya news scraping project.
+
+``profile_call`` runs a function under cProfile and, at the same time, a
+sampling profiler that records the calling thread's stack at a fixed interval.
+cProfile gives exact call counts and CPU-bound hot spots; the samples are
+wall-clock, so time spent waiting on Firefox or MySQL shows up in the
+collapsed-stack output used to draw flame graphs
+(``flamegraph.pl profile.collapsed > profile.svg`` or speedscope).
+"""
+import os
+import io
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's call stack at a fixed interval on a background thread.
+
+    Stacks are kept in collapsed form: frame labels from the outermost call to
+    the innermost, joined with ``;``, mapped to the number of samples seen.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[';'.join(reversed(labels))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        """Start sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, path):
+        """
+        Write the samples in the collapsed-stack format read by flame graph tools.
+
+        Args:
+            path (str): Destination file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def top_functions(stats, limit=20):
+    """
+    List the functions with the most time spent in their own code.
+
+    Args:
+        stats (pstats.Stats): Profile statistics
+        limit (int): Number of functions to return
+
+    Returns:
+        list: ``(label, calls, own_seconds, cumulative_seconds)`` tuples, hottest first
+    """
+    rows = []
+    for (filename, lineno, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        label = f"{name} ({os.path.basename(filename)}:{lineno})" if lineno else name
+        rows.append((label, calls, own, cumulative))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:limit]
+
+
+def format_report(name, stats, wall_seconds, samples, limit=20):
+    """
+    Format a short text report of the hottest functions in a profile.
+
+    Args:
+        name (str): Name of the profiled run
+        stats (pstats.Stats): Profile statistics
+        wall_seconds (float): Wall-clock duration of the run
+        samples (int): Number of stack samples taken
+        limit (int): Number of functions to list
+
+    Returns:
+        str: Report text
+    """
+    lines = [
+        f"Profile for {name}: {wall_seconds:.2f}s wall, {stats.total_tt:.2f}s profiled, {samples} stack samples",
+        f"{'own (s)':>9} {'cum (s)':>9} {'calls':>9}  function",
+    ]
+    for label, calls, own, cumulative in top_functions(stats, limit):
+        lines.append(f"{own:>9.3f} {cumulative:>9.3f} {calls:>9}  {label}")
+    return '\n'.join(lines)
+
+
+def profile_call(func, name, output_dir='profiles', top=20, interval=0.005):
+    """
+    Run a function under cProfile and the stack sampler, and write the results.
+
+    Three files are written to ``output_dir``: ``<name>.prof`` (pstats data,
+    e.g. for snakeviz), ``<name>.collapsed`` (flame graph input) and
+    ``<name>.txt`` (the top-N report).
+
+    Args:
+        func (callable): Function to run, called without arguments
+        name (str): Base name of the output files
+        output_dir (str): Directory for the output files
+        top (int): Number of functions in the report
+        interval (float): Seconds between stack samples
+
+    Returns:
+        tuple: Return value of ``func`` and the report text
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base_path = os.path.join(output_dir, name)
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler(interval)
+    start = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        result = func()
+    finally:
+        profiler.disable()
+        sampler.stop()
+        wall_seconds = time.perf_counter() - start
+
+        profiler.dump_stats(f"{base_path}.prof")
+        sampler.write_collapsed(f"{base_path}.collapsed")
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        report = format_report(name, stats, wall_seconds, sum(sampler.stacks.values()), top)
+        with open(f"{base_path}.txt", 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+
+    return result, report
@@ -0,0 +1,141 @@
+"""
+Retry and circuit-breaker helpers for page fetching in the Kenya news scraping project.
+
+Fetch errors are classified so that only failures worth repeating are retried:
+timeouts and network errors are transient, a crashed browser is retried after
+a restart, and malformed URLs are permanent. Each source has a circuit breaker
+that opens after ``failure_threshold`` consecutive failed fetches; while it is
+open fetches fail immediately, and after ``cooldown`` seconds a single probe
+fetch decides whether it closes again.
+"""
+import time
+import random
+
+from selenium.common.exceptions import (
+    InvalidArgumentException,
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from config.settings import RETRY_SETTINGS
+
+
+TRANSIENT = 'transient'
+BROWSER = 'browser'
+PERMANENT = 'permanent'
+
+# Marionette messages seen when Firefox itself has gone away
+_BROWSER_GONE = (
+    'failed to decode response from marionette',
+    'tried to run command without establishing a connection',
+    'browsing context has been discarded',
+    'browser has closed',
+    'connection refused',
+)
+
+
+def classify_error(error):
+    """
+    Decide how a page-load exception should be handled.
+
+    Args:
+        error (Exception): Exception raised while loading a page
+
+    Returns:
+        str: ``'transient'`` to retry, ``'browser'`` to restart the browser and
+        retry, or ``'permanent'`` to give up on the URL
+    """
+    if isinstance(error, InvalidArgumentException):
+        return PERMANENT
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return BROWSER
+    if isinstance(error, TimeoutException):
+        return TRANSIENT
+    if isinstance(error, WebDriverException):
+        message = (error.msg or '').lower()
+        if any(text in message for text in _BROWSER_GONE):
+            return BROWSER
+        return TRANSIENT
+    return TRANSIENT
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """
+    Seconds to wait before a retry, with full jitter.
+
+    Args:
+        attempt (int): Number of failed attempts so far, starting at 1
+        base (float): Delay ceiling after the first failure
+        cap (float): Largest delay ceiling
+
+    Returns:
+        float: Random delay between 0 and ``min(cap, base * 2 ** (attempt - 1))``
+    """
+    base = RETRY_SETTINGS['base_delay'] if base is None else base
+    cap = RETRY_SETTINGS['max_delay'] if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one source."""
+
+    def __init__(self, failure_threshold=None, cooldown=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or RETRY_SETTINGS['failure_threshold']
+        self.cooldown = cooldown or RETRY_SETTINGS['cooldown']
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+
+    @property
+    def state(self):
+        """``'closed'``, ``'open'`` or ``'half-open'`` (cool-down over, next fetch is a probe)."""
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at < self.cooldown:
+            return 'open'
+        return 'half-open'
+
+    def allow(self):
+        """Whether a fetch may be attempted now."""
+        return self.state != 'open'
+
+    def remaining(self):
+        """Seconds left in the cool-down, 0 if the breaker is not open."""
+        if self.state != 'open':
+            return 0
+        return self.cooldown - (self.clock() - self.opened_at)
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        """
+        Count a failed fetch.
+
+        Returns:
+            bool: True if this failure opened the breaker
+        """
+        self.failures += 1
+        if self.state == 'half-open':
+            # The probe failed: start another cool-down
+            self.opened_at = self.clock()
+            return False
+        if self.opened_at is None and self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self.trips += 1
+            return True
+        return False
+
+
+_breakers = {}
+
+
+def get_breaker(source):
+    """Get the circuit breaker shared by all scrapers of a source in this process."""
+    if source not in _breakers:
+        _breakers[source] = CircuitBreaker()
+    return _breakers[source]
@@ -0,0 +1,158 @@
+"""
+Probabilistic counting structures for the Kenya news scraping project.
+"""
+import os
+import hashlib
+from array import array
+
+
+def hash64(text):
+    """
+    Hash a string to a stable 64-bit integer.
+
+    Args:
+        text (str): Text to hash
+
+    Returns:
+        int: 64-bit hash, identical across processes and runs
+    """
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CountMinSketch:
+    """
+    Count-min sketch with conservative updates.
+
+    Estimates never undercount; with conservative updates the overcount stays
+    small as long as the number of distinct keys is well below ``width``.
+    """
+
+    MAX_COUNT = 0xFFFFFFFF
+
+    def __init__(self, width=65536, depth=4):
+        """
+        Args:
+            width (int): Counters per row
+            depth (int): Number of rows (independent hash functions)
+        """
+        self.width = width
+        self.depth = depth
+        self.table = array('I', bytes(4 * width * depth))
+
+    def _indexes(self, key):
+        # Derive all row positions from one 64-bit hash (double hashing)
+        h = key if isinstance(key, int) else hash64(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        """
+        Add occurrences of a key.
+
+        Args:
+            key (str | int): Key, or a precomputed ``hash64`` value
+            count (int): Occurrences to add
+
+        Returns:
+            int: Estimated count of the key after the update
+        """
+        table = self.table
+        indexes = self._indexes(key)
+        estimate = min(table[i] for i in indexes)
+        new_value = min(estimate + count, self.MAX_COUNT)
+        for i in indexes:
+            if table[i] < new_value:
+                table[i] = new_value
+        return new_value
+
+    def add_all(self, keys, counts=None):
+        """
+        Add occurrences of many keys; same result as ``add`` per key, in order.
+
+        Args:
+            keys (list): ``hash64`` values
+            counts (list): Occurrences to add for each key (defaults to 1 each)
+
+        Returns:
+            list: Estimated count of each key after its update
+        """
+        table = self.table
+        width = self.width
+        rows = [row * width for row in range(self.depth)]
+        max_count = self.MAX_COUNT
+        results = []
+        for h, count in zip(keys, counts or [1] * len(keys)):
+            h1 = h & 0xFFFFFFFF
+            h2 = (h >> 32) | 1
+            indexes = [offset + (h1 + row * h2) % width for row, offset in enumerate(rows)]
+            new_value = min([table[i] for i in indexes]) + count
+            if new_value > max_count:
+                new_value = max_count
+            for i in indexes:
+                if table[i] < new_value:
+                    table[i] = new_value
+            results.append(new_value)
+        return results
+
+    def estimate(self, key):
+        """
+        Estimate how many times a key has been added.
+
+        Args:
+            key (str | int): Key, or a precomputed ``hash64`` value
+
+        Returns:
+            int: Estimated count (never lower than the true count)
+        """
+        table = self.table
+        return min(table[i] for i in self._indexes(key))
+
+    def merge(self, other):
+        """
+        Add the counts of another sketch with the same dimensions into this one.
+
+        Args:
+            other (CountMinSketch): Sketch to merge
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches with different dimensions")
+        table = self.table
+        for i, value in enumerate(other.table):
+            if value:
+                table[i] = min(table[i] + value, self.MAX_COUNT)
+
+    def save(self, path):
+        """
+        Write the sketch to a file, replacing it atomically.
+
+        Args:
+            path (str): Destination file path
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(array('I', [self.width, self.depth]).tobytes())
+            self.table.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a sketch written by ``save``.
+
+        Args:
+            path (str): File path
+
+        Returns:
+            CountMinSketch: Loaded sketch
+        """
+        with open(path, 'rb') as f:
+            header = array('I')
+            header.fromfile(f, 2)
+            sketch = cls.__new__(cls)
+            sketch.width, sketch.depth = header
+            sketch.table = array('I')
+            sketch.table.fromfile(f, sketch.width * sketch.depth)
+        return sketch
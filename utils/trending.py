@@ -0,0 +1,455 @@
+"""
+Streaming trending-terms engine for the Kenya news scraping project.
+
+Every saved article is counted into time buckets of its source: one
+count-min sketch per bucket holds how many articles mention each term and
+bigram, and a small heavy-hitters table keeps the most mentioned ones as
+candidates. Counting is per article, so a term repeated in one story counts
+once. Memory per source is bounded by ``buckets`` sketches; older buckets are
+dropped as time moves on.
+
+Buckets are persisted under ``TRENDING_SETTINGS['state_dir']/<source>``.
+Several processes may count the same source (queue workers, a restarted
+scraper): each saves by adding the counts it made since its last save to the
+sketches on disk, under a file lock, so none overwrites another's counts.
+Queries combine the sources on read: a term trends when its article count
+over the last ``window`` hours beats the rate of the preceding ``baseline``
+hours.
+
+Usage:
+    python -m utils.trending [--sources star tuko] [--window 6] [--baseline 24] [--top 20]
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+from collections import Counter
+from datetime import datetime
+
+# Add parent directory to sys.path to allow imports from sibling modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from config.settings import NEWS_SOURCES, TRENDING_SETTINGS
+from utils.file_lock import file_lock
+from utils.sketch import CountMinSketch, hash64
+
+
+# Words too common in English and Swahili news copy to ever be a topic
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how however i if in into is it its itself just last like made
+make many may me more most much must my myself new news no nor not now of off on once one only or other
+our ours ourselves out over own per said same say says she should since so some still such than that the
+their theirs them themselves then there these they this those through to too two under until up upon us
+very was we were what when where which while who whom why will with within without would year years yet
+you your yours yourself yourselves told according added including week day time people first
+na ya wa za la kwa ni katika kuwa huo hiyo hii hizo hao wao yeye sisi wewe mimi kama pia au lakini bila
+hadi tu sana baada kabla ambao ambaye ambayo ambazo alisema amesema kusema kwamba kuhusu zaidi hata
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+_trackers = {}
+
+
+def article_terms(title, content):
+    """
+    List the distinct terms and bigrams of one article.
+
+    Terms are lower-case words of three or more letters that are not
+    stopwords; bigrams are pairs of such terms next to each other.
+
+    Args:
+        title (str): Article title
+        content (str): Article body
+
+    Returns:
+        set: Terms, and bigrams as ``"first second"``
+    """
+    terms = set()
+    previous = None
+    for text in (title, content):
+        for token in _TOKEN_RE.findall(text.lower()) if text else ():
+            if len(token) < 3 or token in STOPWORDS:
+                previous = None
+                continue
+            terms.add(token)
+            if previous:
+                terms.add(f"{previous} {token}")
+            previous = token
+        # A bigram never spans the title and the body
+        previous = None
+    return terms
+
+
+class TrendBucket:
+    """Article counts of one source for one time bucket."""
+
+    def __init__(self, sketch, candidates=None, floor=0, persistent=False):
+        """
+        Args:
+            sketch (CountMinSketch): Article count of every term
+            candidates (dict): Most counted terms and their counts
+            floor (int): Count a term must exceed to become a candidate once
+                the table has been pruned
+            persistent (bool): Keep the counts not saved yet apart, for merging into the saved bucket
+        """
+        self.sketch = sketch
+        self.candidates = candidates or {}
+        self.floor = floor
+        self.persistent = persistent
+        # Counts since the last save; only allocated once something is counted
+        self.unsaved = None
+        # Exact counts not yet in the sketch, so a term is hashed once per flush, not once per article
+        self.pending = Counter()
+        self.dirty = False
+
+    def add(self, terms, capacity, pending_limit):
+        """
+        Count one article's terms.
+
+        Args:
+            terms (iterable): Distinct terms of the article
+            capacity (int): Candidates kept after pruning
+            pending_limit (int): Distinct pending terms that trigger a flush
+        """
+        self.pending.update(terms)
+        self.dirty = True
+        if len(self.pending) >= pending_limit:
+            self.flush(capacity)
+
+    def flush(self, capacity):
+        """
+        Move the pending counts into the sketch and the candidates.
+
+        Args:
+            capacity (int): Candidates kept after pruning
+        """
+        if not self.pending:
+            return
+        terms = list(self.pending)
+        keys = [hash64(term) for term in terms]
+        counts = self.sketch.add_all(keys, list(self.pending.values()))
+        if self.persistent:
+            if self.unsaved is None:
+                self.unsaved = CountMinSketch(self.sketch.width, self.sketch.depth)
+            self.unsaved.add_all(keys, list(self.pending.values()))
+        self.pending = Counter()
+
+        candidates = self.candidates
+        floor = self.floor
+        for term, count in zip(terms, counts):
+            if count > floor or term in candidates:
+                candidates[term] = count
+        self.prune(capacity)
+
+    def prune(self, capacity):
+        """
+        Keep the ``capacity`` most counted candidates once the table has doubled.
+
+        Pruning in batches makes each term cost amortized constant work.
+
+        Args:
+            capacity (int): Candidates kept after pruning
+        """
+        if len(self.candidates) > 2 * capacity:
+            kept = sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)[:capacity]
+            self.candidates = dict(kept)
+            self.floor = kept[-1][1]
+
+    def merge_saved(self, sketch, candidates, floor, capacity):
+        """
+        Add the saved state of this bucket, as another process left it, to the unsaved counts.
+
+        Afterwards the bucket holds the combined counts, ready to be written
+        back, and no unsaved counts (nor their sketch's memory).
+
+        Args:
+            sketch (CountMinSketch): Saved sketch of the same dimensions
+            candidates (dict): Saved candidates
+            floor (int): Saved candidate floor
+            capacity (int): Candidates kept after pruning
+        """
+        if self.unsaved is not None:
+            sketch.merge(self.unsaved)
+        self.sketch = sketch
+        self.floor = max(self.floor, floor)
+        self.candidates = {term: sketch.estimate(hash64(term)) for term in set(self.candidates) | set(candidates)}
+        self.prune(capacity)
+        self.unsaved = None
+
+    def count(self, term, key=None):
+        """
+        Estimate how many articles in this bucket mention a term.
+
+        Args:
+            term (str): Term or bigram
+            key (int): ``hash64(term)``, if already computed
+
+        Returns:
+            int: Estimated article count (never lower than the true count)
+        """
+        count = self.candidates.get(term)
+        if count is None:
+            count = self.sketch.estimate(key if key is not None else hash64(term))
+        return count + self.pending.get(term, 0)
+
+
+class TrendTracker:
+    """Ring of time-bucketed term counts for one news source."""
+
+    def __init__(self, source, bucket_minutes=60, buckets=48, width=16384, depth=4, candidates=500,
+                 pending_terms=20000, state_dir=None):
+        """
+        Args:
+            source (str): Name of the news source
+            bucket_minutes (int): Length of each time bucket
+            buckets (int): Buckets kept; older ones are dropped
+            width (int): Sketch counters per row
+            depth (int): Sketch rows
+            candidates (int): Heavy-hitter terms kept per bucket
+            pending_terms (int): Distinct terms counted exactly before they are flushed to the sketch
+            state_dir (str): Directory the buckets are persisted in (optional)
+        """
+        self.source = source
+        self.bucket_seconds = bucket_minutes * 60
+        self.max_buckets = buckets
+        self.width = width
+        self.depth = depth
+        self.capacity = candidates
+        self.pending_terms = pending_terms
+        self.state_path = os.path.join(state_dir, source) if state_dir else None
+        self.buckets = {}
+        self._open = None
+        if self.state_path:
+            self._load()
+
+    def bucket_of(self, when):
+        """
+        Index of the time bucket a moment falls in.
+
+        Args:
+            when (datetime | float): Local datetime or Unix timestamp
+
+        Returns:
+            int: Bucket index; consecutive buckets have consecutive indexes
+        """
+        timestamp = when.timestamp() if isinstance(when, datetime) else when
+        return int(timestamp // self.bucket_seconds)
+
+    def add_article(self, title, content, published=None, now=None):
+        """
+        Count one saved article.
+
+        Args:
+            title (str): Article title
+            content (str): Article body
+            published (datetime): Publication time; articles without one, or
+                dated in the future, count at ``now``
+            now (datetime | float): Current time (defaults to the clock)
+
+        Returns:
+            bool: False if the article is older than every kept bucket
+        """
+        current = self.bucket_of(now if now is not None else time.time())
+        index = min(self.bucket_of(published), current) if published else current
+        oldest = current - self.max_buckets + 1
+        if index < oldest:
+            return False
+
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            bucket = self.buckets[index] = TrendBucket(CountMinSketch(self.width, self.depth),
+                                                       persistent=bool(self.state_path))
+            for stale in [i for i in self.buckets if i < oldest]:
+                del self.buckets[stale]
+        if index != self._open and self._open in self.buckets:
+            # Only the bucket being written holds pending counts, which bounds their memory
+            self.buckets[self._open].flush(self.capacity)
+        self._open = index
+        bucket.add(article_terms(title, content), self.capacity, self.pending_terms)
+        return True
+
+    def window(self, last, count):
+        """
+        Buckets of a window of consecutive bucket indexes.
+
+        Args:
+            last (int): Index of the newest bucket in the window
+            count (int): Number of buckets in the window
+
+        Returns:
+            list: Buckets that exist in the window
+        """
+        return [self.buckets[i] for i in range(last - count + 1, last + 1) if i in self.buckets]
+
+    def save(self, now=None):
+        """
+        Add the counts made since the last save to the saved buckets, and remove expired bucket files.
+
+        Other processes may have saved counts of the same source in the
+        meantime; they are read back and kept, so this tracker also sees them
+        afterwards. Only buckets older than every kept one are removed, never
+        one another process is still writing.
+
+        Args:
+            now (datetime | float): Current time (defaults to the clock)
+        """
+        if not self.state_path:
+            return
+        os.makedirs(self.state_path, exist_ok=True)
+        with file_lock(os.path.join(self.state_path, 'lock')):
+            for index, bucket in self.buckets.items():
+                if not bucket.dirty:
+                    continue
+                bucket.flush(self.capacity)
+                base = os.path.join(self.state_path, str(index))
+                saved = self._read_bucket(base)
+                if saved:
+                    bucket.merge_saved(saved.sketch, saved.candidates, saved.floor, self.capacity)
+                else:
+                    bucket.unsaved = None
+                bucket.sketch.save(f"{base}.cms")
+                tmp_path = f"{base}.json.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'floor': bucket.floor, 'candidates': bucket.candidates}, f)
+                os.replace(tmp_path, f"{base}.json")
+                bucket.dirty = False
+            oldest = self.bucket_of(now if now is not None else time.time()) - self.max_buckets + 1
+            for filename in os.listdir(self.state_path):
+                index = filename.split('.')[0]
+                if index.isdigit() and int(index) < oldest:
+                    os.remove(os.path.join(self.state_path, filename))
+
+    def _read_bucket(self, base):
+        """The bucket saved under a path without its extension, or None if missing or of other dimensions."""
+        try:
+            sketch = CountMinSketch.load(f"{base}.cms")
+        except (OSError, EOFError):
+            return None
+        if (sketch.width, sketch.depth) != (self.width, self.depth):
+            # Sketch dimensions changed in the settings; counts cannot be carried over
+            return None
+        try:
+            with open(f"{base}.json", encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        return TrendBucket(sketch, state.get('candidates'), state.get('floor', 0), persistent=True)
+
+    def _load(self):
+        if not os.path.isdir(self.state_path):
+            return
+        indexes = sorted(int(f[:-4]) for f in os.listdir(self.state_path) if f.endswith('.cms') and f[:-4].isdigit())
+        for index in indexes[-self.max_buckets:]:
+            bucket = self._read_bucket(os.path.join(self.state_path, str(index)))
+            if bucket:
+                self.buckets[index] = bucket
+
+
+def _tracker_options():
+    return {
+        'bucket_minutes': TRENDING_SETTINGS['bucket_minutes'],
+        'buckets': TRENDING_SETTINGS['buckets'],
+        'width': TRENDING_SETTINGS['width'],
+        'depth': TRENDING_SETTINGS['depth'],
+        'candidates': TRENDING_SETTINGS['candidates'],
+        'pending_terms': TRENDING_SETTINGS['pending_terms'],
+        'state_dir': TRENDING_SETTINGS['state_dir'],
+    }
+
+
+def get_trend_tracker(source):
+    """
+    Get the shared trend tracker for a news source.
+
+    Args:
+        source (str): Name of the news source
+
+    Returns:
+        TrendTracker: Tracker configured from TRENDING_SETTINGS, or None if disabled
+    """
+    if not TRENDING_SETTINGS.get('enabled'):
+        return None
+    if source not in _trackers:
+        _trackers[source] = TrendTracker(source, **_tracker_options())
+    return _trackers[source]
+
+
+def trending(trackers, window_hours=6, baseline_hours=24, top=20, bigrams=None, min_articles=3, now=None):
+    """
+    Rank the terms whose article counts rose the most in the latest window.
+
+    The score compares the articles mentioning a term in the window with the
+    number expected from its rate over the baseline before it, scaled like a
+    Poisson z-score so rare terms need a larger jump than common ones.
+
+    Args:
+        trackers (list): Trackers of the sources to combine
+        window_hours (float): Length of the window, in hours
+        baseline_hours (float): Length of the baseline before the window, in hours
+        top (int): Number of terms to return
+        bigrams (bool): Only bigrams if True, only single terms if False, both if None
+        min_articles (int): Fewest articles in the window for a term to be ranked
+        now (datetime | float): End of the window (defaults to the clock)
+
+    Returns:
+        list: ``(term, articles in window, expected articles, score)`` tuples, best first
+    """
+    if not trackers:
+        return []
+    bucket_seconds = trackers[0].bucket_seconds
+    window = max(1, round(window_hours * 3600 / bucket_seconds))
+    baseline = max(0, round(baseline_hours * 3600 / bucket_seconds))
+    last = trackers[0].bucket_of(now if now is not None else time.time())
+
+    recent_buckets = [b for t in trackers for b in t.window(last, window)]
+    baseline_buckets = [b for t in trackers for b in t.window(last - window, baseline)]
+    for tracker in trackers:
+        # Pending terms become candidates only once counted into the sketch
+        for bucket in tracker.window(last, window):
+            bucket.flush(tracker.capacity)
+    terms = {term for bucket in recent_buckets for term in bucket.candidates}
+    if bigrams is not None:
+        terms = {term for term in terms if (' ' in term) == bigrams}
+
+    ranked = []
+    for term in terms:
+        key = hash64(term)
+        recent = sum(bucket.count(term, key) for bucket in recent_buckets)
+        if recent < min_articles:
+            continue
+        expected = sum(bucket.count(term, key) for bucket in baseline_buckets) * window / baseline if baseline else 0.0
+        score = (recent - expected) / math.sqrt(expected + 1)
+        ranked.append((term, recent, round(expected, 1), round(score, 2)))
+    ranked.sort(key=lambda row: row[3], reverse=True)
+    return ranked[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show trending terms across the scraped sources')
+    parser.add_argument('--sources', nargs='+', default=NEWS_SOURCES, help='Sources to combine (default: all)')
+    parser.add_argument('--window', type=float, default=6, help='Hours in the trending window')
+    parser.add_argument('--baseline', type=float, default=24, help='Hours before the window to compare against')
+    parser.add_argument('--top', type=int, default=20, help='Terms and bigrams to show')
+    parser.add_argument('--min-articles', type=int, default=3, help='Fewest articles mentioning a term in the window')
+    args = parser.parse_args()
+
+    trackers = [TrendTracker(source, **_tracker_options()) for source in args.sources]
+    for title, bigrams in (('Terms', False), ('Bigrams', True)):
+        print(f"{title:<30} {'articles':>8} {'expected':>8} {'score':>7}")
+        for term, recent, expected, score in trending(trackers, args.window, args.baseline, args.top,
+                                                      bigrams, args.min_articles):
+            print(f"{term:<30} {recent:>8} {expected:>8} {score:>7}")
+        print()
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,127 @@
+"""
+Lightweight article variants (AMP or print pages) for the Kenya news scraping project.
+
+A variant URL is derived from the article URL with a template in which
+``{path}`` stands for the article path without its trailing slash, e.g.
+``https://www.example.co.ke{path}/amp``. Templates are given per source or
+learned from the ``<link rel="amphtml">`` of a fully loaded article page, and
+kept on disk for later runs. Parallel workers share the rules file; each
+merges only the sources it changed into it, under a lock.
+"""
+import os
+import json
+from urllib.parse import urljoin, urlparse
+
+from config.settings import VARIANT_SETTINGS
+from utils.file_lock import file_lock
+
+
+PATH_FIELD = '{path}'
+
+
+def find_variant_link(soup, url):
+    """
+    Find the AMP version advertised by an article page.
+
+    Args:
+        soup (BeautifulSoup): Parsed article page
+        url (str): URL of the article page
+
+    Returns:
+        str: Absolute variant URL, or None if the page does not advertise one
+    """
+    link = soup.find('link', rel='amphtml', href=True)
+    if not link:
+        return None
+    return urljoin(url, link['href'].strip())
+
+
+def learn_template(url, variant_url):
+    """
+    Turn an article URL and its variant URL into a template for other articles.
+
+    Args:
+        url (str): Article URL
+        variant_url (str): Variant URL of the same article
+
+    Returns:
+        str: Template containing ``{path}``, or None if the two URLs share no path
+    """
+    path = urlparse(url).path.rstrip('/')
+    if not path or path not in variant_url:
+        return None
+    template = variant_url.replace(path, PATH_FIELD, 1)
+    # The variant must be derivable from the article URL alone
+    if apply_template(template, url) != variant_url:
+        return None
+    return template
+
+
+def apply_template(template, url):
+    """Build the variant URL of an article from a template."""
+    return template.replace(PATH_FIELD, urlparse(url).path.rstrip('/'))
+
+
+class VariantRules:
+    """Learned variant URL templates per source, stored as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or VARIANT_SETTINGS['rules_file']
+        self.templates = self._read()
+        # Sources learned or forgotten since the last save
+        self.changed = set()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, source):
+        """Learned template for a source, or None."""
+        return self.templates.get(source)
+
+    def learn(self, source, url, variant_url):
+        """
+        Learn a source's template from one article and its variant.
+
+        Returns:
+            bool: True if the template is new or changed
+        """
+        template = learn_template(url, variant_url)
+        if not template or self.templates.get(source) == template:
+            return False
+        self.templates[source] = template
+        self.changed.add(source)
+        return True
+
+    def forget(self, source):
+        """Drop a source's learned template, e.g. after it stops producing usable pages."""
+        if self.templates.pop(source, None) is None:
+            return False
+        self.changed.add(source)
+        return True
+
+    def save(self):
+        """
+        Merge the changed sources into the file, replacing it atomically.
+
+        The file is re-read under a lock, so templates saved meanwhile by
+        workers scraping other sources are kept.
+        """
+        with file_lock(f"{self.path}.lock"):
+            templates = self._read()
+            for source in self.changed:
+                if source in self.templates:
+                    templates[source] = self.templates[source]
+                else:
+                    templates.pop(source, None)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(templates, f, indent=2)
+            os.replace(tmp_path, self.path)
+        self.templates = templates
+        self.changed = set()